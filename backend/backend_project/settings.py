@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,6 +44,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the whole stack (see core.request_metrics)
+    'core.request_metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware', 
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -88,6 +91,68 @@ DATABASES = {
 }
 
 
+# Cache
+# Local-memory by default; set REDIS_URL (e.g. redis://localhost:6379/0)
+# to share the cache between processes (requires the `redis` package).
+# 'metrics' holds the request / operation counters (see core.metrics): its
+# keys never expire and must never be culled. On the local-memory cache
+# every process keeps its own counts, so /metrics only reports the process
+# answering it; use REDIS_URL to add up all workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'gemach',
+    },
+    'metrics': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'gemach-metrics',
+        # ~18 keys per route
+        'OPTIONS': {'MAX_ENTRIES': 100_000},
+    },
+}
+
+if os.environ.get('REDIS_URL'):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['REDIS_URL'],
+    }
+    CACHES['metrics'] = dict(CACHES['default'])
+
+# Seconds before the cached dashboard summary expires even without a write
+DASHBOARD_CACHE_TIMEOUT = 300
+
+# Days a PENDING payment may be late before its loan counts as overdue
+OVERDUE_GRACE_DAYS = 7
+
+# Requests slower than this (ms) are logged to the "core.requests" logger
+SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS', 500))
+
+# Request / cache counters are buffered in each process and written to the
+# cache at most this often (seconds), see core.metrics.buffer_incr
+METRICS_FLUSH_SECONDS = int(os.environ.get('METRICS_FLUSH_SECONDS', 10))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.requests': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+    },
+}
+
+
+# Django REST framework
+# List endpoints of the CRUD ViewSets are paginated (?page= / ?page_size=)
+
+REST_FRAMEWORK = {
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.StandardPagination',
+    'PAGE_SIZE': 50,
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -11,10 +11,14 @@ from core.views import (
     RoleViewSet,
     UserProfileViewSet,
     DashboardLoanSummaryView,
+    PortfolioStatisticsView,
+    RequestMetricsView,
 )
 
 # Import Sprint 2 loan views
-from core.loans_views import LoanListView, LoanDetailView
+from core.loans_views import LoanListView, LoanBatchCreateView, LoanDetailView
+from core.exports_views import LoanExportView, PaymentLedgerExportView
+from core.metrics_views import metrics_view
 
 from django.conf import settings
 from django.conf.urls.static import static
@@ -44,6 +48,13 @@ urlpatterns = [
     # Unified loan list endpoint
     path('api/loans/', LoanListView.as_view(), name='loan-list'),
 
+    # Batch loan creation endpoint
+    path('api/loans/batch/', LoanBatchCreateView.as_view(), name='loan-batch-create'),
+
+    # CSV exports (streamed)
+    path('api/loans/export.csv', LoanExportView.as_view(), name='loan-export'),
+    path('api/payments/export.csv', PaymentLedgerExportView.as_view(), name='payment-ledger-export'),
+
     # Full loan detail endpoint
     path('api/loans/<uuid:loan_id>/', LoanDetailView.as_view(), name='loan-detail'),
 
@@ -54,6 +65,13 @@ urlpatterns = [
         name='dashboard-loan-summary'
     ),
 
+    # Portfolio statistics (summary table, see refresh_portfolio_stats)
+    path(
+        'api/dashboard/portfolio/',
+        PortfolioStatisticsView.as_view(),
+        name='dashboard-portfolio'
+    ),
+
     # Loan payments endpoint
     path(
     "api/loans/<uuid:loan_id>/payments",
@@ -61,6 +79,16 @@ urlpatterns = [
     name="loan-payments"
     ),
 
+    # Per-route request metrics (staff only, see core.request_metrics)
+    path(
+        'api/admin/request-metrics/',
+        RequestMetricsView.as_view(),
+        name='request-metrics'
+    ),
+
+    # Prometheus scrape endpoint (see core.metrics_views)
+    path('metrics', metrics_view, name='metrics'),
+
 ]
 
 
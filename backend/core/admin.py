@@ -1,9 +1,10 @@
 from django.contrib import admin
-from .models import Trustee, Borrower, LoanChecks, LoanStandingOrder, Role, UserProfile
+from .models import Trustee, Borrower, LoanChecks, LoanStandingOrder, LoanRegistry, Role, UserProfile
 
 admin.site.register(Role)
 admin.site.register(UserProfile)
 admin.site.register(Trustee)
 admin.site.register(Borrower)
 admin.site.register(LoanChecks)
-admin.site.register(LoanStandingOrder)
\ No newline at end of file
+admin.site.register(LoanStandingOrder)
+admin.site.register(LoanRegistry)
\ No newline at end of file
@@ -0,0 +1,128 @@
+from decimal import Decimal
+
+from django.db.models import Case, Count, DecimalField, F, Min, Q, Sum, Value, When, Window
+from django.db.models.functions import Coalesce
+
+from core.models import Borrower
+from core.overdue import days_overdue, is_overdue
+
+
+# ------------------------------------
+#   Borrower exposure
+#   Every loan of a borrower (both types) with its balance, plus the
+#   borrower's totals, read from LoanRegistry in a single query: the
+#   borrower row is LEFT JOINed to its registry rows and the totals are
+#   window aggregates over the joined rows.
+# ------------------------------------
+
+MONEY = DecimalField(max_digits=12, decimal_places=2)
+
+LOAN_FIELDS = {
+    "loan_id": "registry_loans__loan_id",
+    "loan_type": "registry_loans__loan_type",
+    "status": "registry_loans__status",
+    "amount": "registry_loans__amount",
+    "start_date": "registry_loans__start_date",
+    "paid_amount": "registry_loans__paid_amount",
+    "outstanding_amount": "registry_loans__outstanding_amount",
+    "next_due_date": "registry_loans__next_due_date",
+    "payments_remaining": "registry_loans__payments_remaining",
+    "overdue_since": "registry_loans__overdue_since",
+}
+
+
+def _total(expression, condition=None):
+    """
+    Borrower-wide SUM of `expression` (over the rows matching `condition`),
+    repeated on every joined row.
+    """
+    if condition is not None:
+        expression = Case(When(condition, then=expression), default=Value(Decimal("0")), output_field=MONEY)
+    return Coalesce(Window(Sum(expression)), Value(Decimal("0")), output_field=MONEY)
+
+
+def _exposure_rows(borrower_id):
+    active = Q(registry_loans__status="ACTIVE")
+    pending = Q(registry_loans__status="PENDING")
+    overdue = active & Q(registry_loans__overdue_since__isnull=False)
+
+    return (
+        Borrower.objects
+        .filter(borrower_id=borrower_id)
+        .values("borrower_id", "id_number", "first_name", "last_name", **{
+            alias: F(lookup) for alias, lookup in LOAN_FIELDS.items()
+        })
+        .annotate(
+            total_loans_count=Window(Count("registry_loans__loan_id")),
+            total_active_loans=Window(Count("registry_loans__loan_id", filter=active)),
+            total_overdue_loans=Window(Count("registry_loans__loan_id", filter=overdue)),
+            total_principal=_total(F("registry_loans__amount"), active),
+            total_paid=_total(F("registry_loans__paid_amount"), active),
+            total_outstanding=_total(F("registry_loans__outstanding_amount"), active),
+            total_pending=_total(F("registry_loans__amount"), pending),
+            total_next_due_date=Window(Min(
+                Case(When(active, then=F("registry_loans__next_due_date")))
+            )),
+        )
+        .order_by("registry_loans__start_date", "registry_loans__loan_id")
+    )
+
+
+def borrower_exposure(borrower_id):
+    """
+    Returns the exposure of a borrower, or None when the borrower does not
+    exist:
+
+    - loans: every loan of the borrower with its paid / outstanding balance,
+      next due date and overdue state
+    - totals: loan counts, the principal / paid / outstanding balance of
+      ACTIVE loans, the amount of PENDING loans and the next due date across
+      ACTIVE loans
+    - exposure: what the borrower owes or is about to owe - the outstanding
+      balance of ACTIVE loans plus the full amount of PENDING loans
+
+    One query, whatever the number of loans - cheap enough to be called
+    while a new loan is being taken in.
+    """
+    rows = list(_exposure_rows(borrower_id))
+    if not rows:
+        return None
+
+    first = rows[0]
+    loans = []
+    for row in rows:
+        # A borrower without loans still yields one (empty) joined row
+        if row["loan_id"] is None:
+            continue
+
+        overdue = is_overdue(row["status"], row["overdue_since"])
+        loans.append({
+            "loan_id": row["loan_id"],
+            "loan_type": row["loan_type"],
+            "status": "OVERDUE" if overdue else row["status"],
+            "amount": row["amount"],
+            "start_date": row["start_date"],
+            "paid_amount": row["paid_amount"],
+            "outstanding_amount": row["outstanding_amount"],
+            "next_due_date": row["next_due_date"],
+            "payments_remaining": row["payments_remaining"],
+            "days_overdue": days_overdue(row["overdue_since"]) if overdue else 0,
+        })
+
+    return {
+        "borrower_id": first["borrower_id"],
+        "id_number": first["id_number"],
+        "name": f"{(first['first_name'] or '').strip()} {(first['last_name'] or '').strip()}".strip(),
+        "totals": {
+            "loans_count": first["total_loans_count"],
+            "active_loans_count": first["total_active_loans"],
+            "overdue_loans_count": first["total_overdue_loans"],
+            "principal_amount": first["total_principal"],
+            "paid_amount": first["total_paid"],
+            "outstanding_amount": first["total_outstanding"],
+            "pending_amount": first["total_pending"],
+            "exposure": first["total_outstanding"] + first["total_pending"],
+            "next_due_date": first["total_next_due_date"],
+        },
+        "loans": loans,
+    }
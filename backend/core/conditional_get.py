@@ -0,0 +1,170 @@
+import hashlib
+from functools import wraps
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+from core.loan_queries import DEFAULT_PAGE_SIZE, InvalidCursor, loans_page_queryset, page_size_param
+from core.loan_registry import LOAN_MODELS
+from core.models import LoanRegistry, Payment
+from core.serializers import LoanListFiltersSerializer
+
+
+# ------------------------------------
+#   Conditional GET (ETag / Last-Modified) for the loan endpoints
+#   Each response is versioned by the updated_at columns of the rows it is
+#   built from, read with one cheap query. A request whose
+#   If-None-Match / If-Modified-Since still matches gets a 304 before
+#   anything is serialized.
+#   Collections (the list, a loan's payments) only get an ETag: rows
+#   leaving them leave no newer updated_at behind for Last-Modified.
+# ------------------------------------
+
+def _etag(request, *parts):
+    """
+    Strong ETag over the full request URI (filters, cursor, ?include=), the
+    negotiated media type (JSON vs browsable API) and the version `parts`.
+    """
+    media_type = getattr(request, "accepted_media_type", "")
+    raw = "|".join(str(part) for part in (request.build_absolute_uri(), media_type, *parts))
+    return '"%s"' % hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _latest(*timestamps):
+    timestamps = [ts for ts in timestamps if ts is not None]
+    return max(timestamps) if timestamps else None
+
+
+def _payments_version(loan_type, loan_id):
+    return (
+        Payment.objects
+        .filter(content_type=ContentType.objects.get_for_model(LOAN_MODELS[loan_type]), object_id=loan_id)
+        .aggregate(updated_at=Max("updated_at"), count=Count("id"))
+    )
+
+
+def loan_list_validators(request):
+    """
+    (etag, None) of a GET /api/loans/ page: the ids and updated_at of the
+    page's loans, their borrowers and trustees.
+
+    The page's rows are loaded here (the same cursor-filtered, ordered
+    page_size + 1 slice) and kept on the request for the view, so a 200
+    costs no extra query. No Last-Modified: a loan leaving the page (closed,
+    deleted, filtered out) does not make any remaining row newer.
+    Invalid parameters -> (None, None): the view answers 400.
+    """
+    filters_serializer = LoanListFiltersSerializer(data=request.GET)
+    if not filters_serializer.is_valid():
+        return None, None
+    filters = dict(filters_serializer.validated_data)
+    ordering = filters.pop("ordering")
+
+    try:
+        page_size = page_size_param(request.GET.get("page_size", DEFAULT_PAGE_SIZE))
+        entries = list(loans_page_queryset(
+            request.GET.get("type", None),
+            request.GET.get("search", "").strip(),
+            filters,
+            ordering,
+            request.GET.get("cursor") or None,
+            page_size,
+        ))
+    except (ValueError, InvalidCursor):
+        return None, None
+    request.loans_page_entries = entries
+
+    # The extra row only tells whether there is a next page
+    rows = [
+        (
+            entry.loan_id,
+            entry.updated_at,
+            entry.borrower.updated_at,
+            entry.trustee.updated_at if entry.trustee else None,
+        )
+        for entry in entries[:page_size]
+    ]
+
+    # days_overdue changes with the date, not with the rows
+    return _etag(request, timezone.localdate(), len(entries) > page_size, *rows), None
+
+
+def loan_detail_validators(request, loan_id):
+    """
+    (etag, last_modified) of GET /api/loans/{loan_id}/: the registry row
+    (bumped by every loan / balance / overdue write), the borrower and the
+    trustee - plus the payments with ?include=payments, which then leave
+    out Last-Modified (see loan_payments_validators).
+    Unknown loan -> (None, None): the view answers 404.
+    """
+    entry = (
+        LoanRegistry.objects
+        .filter(loan_id=loan_id)
+        .values("loan_type", "updated_at", "borrower__updated_at", "trustee__updated_at")
+        .first()
+    )
+    if entry is None:
+        return None, None
+
+    parts = [entry["updated_at"], entry["borrower__updated_at"], entry["trustee__updated_at"]]
+    if "payments" in request.GET.get("include", "").split(","):
+        payments = _payments_version(entry["loan_type"], loan_id)
+        return _etag(request, *parts, payments["updated_at"], payments["count"]), None
+
+    return _etag(request, *parts), _latest(*parts)
+
+
+def loan_payments_validators(request, loan_id):
+    """
+    (etag, None) of GET /api/loans/{loan_id}/payments: the latest updated_at
+    and the number of the loan's payments. No Last-Modified: deleting a
+    payment does not make the remaining ones newer.
+    Unknown loan -> (None, None): the view answers 404.
+    """
+    loan_type = LoanRegistry.objects.filter(loan_id=loan_id).values_list("loan_type", flat=True).first()
+    if loan_type is None:
+        return None, None
+
+    payments = _payments_version(loan_type, loan_id)
+    return _etag(request, payments["updated_at"], payments["count"]), None
+
+
+def conditional_get(validators):
+    """
+    Method decorator for APIView.get: answers 304 when the client's cached
+    copy is still current (see django.views.decorators.http.condition) and
+    adds ETag / Last-Modified / Cache-Control: no-cache to fresh responses,
+    so browsers always revalidate instead of re-downloading.
+
+    `validators(request, **kwargs)` returns (etag, last_modified); it runs
+    once per request.
+    """
+    def cached(request, *args, **kwargs):
+        if not hasattr(request, "_conditional_validators"):
+            request._conditional_validators = validators(request, *args, **kwargs)
+        return request._conditional_validators
+
+    conditional = condition(
+        etag_func=lambda request, *args, **kwargs: cached(request, *args, **kwargs)[0],
+        last_modified_func=lambda request, *args, **kwargs: cached(request, *args, **kwargs)[1],
+    )
+
+    def decorator(view):
+        view = conditional(view)
+
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            if response.has_header("ETag"):
+                patch_cache_control(response, private=True, no_cache=True)
+                # The ETag depends on the negotiated renderer
+                patch_vary_headers(response, ["Accept"])
+            return response
+
+        return inner
+
+    return method_decorator(decorator)
@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from core.metrics import buffer_incr, flush_metrics, metrics_cache
+from core.models import LoanRegistry
+
+
+# ------------------------------------
+#   Cached dashboard aggregates
+# ------------------------------------
+
+DASHBOARD_SUMMARY_KEY = "dashboard:loan-summary"
+CACHE_HITS_KEY = "dashboard:loan-summary:hits"
+CACHE_MISSES_KEY = "dashboard:loan-summary:misses"
+
+
+def compute_dashboard_summary():
+    """
+    Active loan count and total amount, plus the overdue loan count (from the
+    registry's overdue flag), both loan types in one aggregate over the loan
+    registry.
+    """
+    summary = LoanRegistry.objects.filter(status="ACTIVE").aggregate(
+        active_loans_count=Count("loan_id"),
+        total_active_loans_amount=Sum("amount"),
+        overdue_loans_count=Count("loan_id", filter=Q(overdue_since__isnull=False)),
+    )
+    summary["total_active_loans_amount"] = summary["total_active_loans_amount"] or 0
+    return summary
+
+
+def get_dashboard_summary():
+    """
+    Returns the dashboard summary from the cache, computing and storing it on a miss.
+    A hit is a single cache read: the hit / miss counters are buffered in
+    the process (see core.metrics.buffer_incr).
+    """
+    summary = cache.get(DASHBOARD_SUMMARY_KEY)
+    if summary is not None:
+        buffer_incr(CACHE_HITS_KEY)
+        return summary
+
+    buffer_incr(CACHE_MISSES_KEY)
+    summary = compute_dashboard_summary()
+    cache.set(DASHBOARD_SUMMARY_KEY, summary, timeout=settings.DASHBOARD_CACHE_TIMEOUT)
+    return summary
+
+
+def invalidate_dashboard_summary():
+    """
+    Drops the cached summary once the current transaction commits, so a
+    concurrent request cannot re-cache pre-commit data.
+    """
+    transaction.on_commit(lambda: cache.delete(DASHBOARD_SUMMARY_KEY))
+
+
+def dashboard_cache_stats():
+    """
+    Returns {"hits": n, "misses": n} for the dashboard summary cache.
+    """
+    flush_metrics()
+    counters = metrics_cache.get_many([CACHE_HITS_KEY, CACHE_MISSES_KEY])
+    return {
+        "hits": counters.get(CACHE_HITS_KEY, 0),
+        "misses": counters.get(CACHE_MISSES_KEY, 0),
+    }
@@ -0,0 +1,238 @@
+import csv
+
+from django.contrib.contenttypes.models import ContentType
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_date
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.renderers import JSONRenderer
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from core.models import Payment
+from core.loan_registry import LOAN_MODELS
+from core.loan_queries import (
+    LOAN_LIST_RELATED,
+    CHECKS_TYPE_PARAMS,
+    STANDING_ORDER_TYPE_PARAMS,
+    model_statuses,
+    resolve_borrower_fields,
+)
+from core.serializers import LoanListFiltersSerializer
+
+
+# ------------------------------------
+#   CSV exports (streamed)
+#   Rows are read with .iterator(chunk_size=...) - a server-side cursor on
+#   PostgreSQL - and written to the response as they are produced, so memory
+#   use does not grow with the size of the export.
+# ------------------------------------
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Excel only detects UTF-8 (Hebrew names) when the file starts with a BOM
+UTF8_BOM = "\ufeff"
+
+LOAN_EXPORT_COLUMNS = [
+    "loan_id",
+    "loan_type",
+    "status",
+    "amount",
+    "start_date",
+    "num_payments",
+    "monthly_amount",
+    "charge_day",
+    "borrower_id_number",
+    "borrower_name",
+    "borrower_phone",
+    "borrower_email",
+    "trustee_name",
+    "community",
+    "created_at",
+]
+
+PAYMENT_EXPORT_COLUMNS = [
+    "payment_id",
+    "loan_id",
+    "loan_type",
+    "due_date",
+    "amount",
+    "amount_paid",
+    "status",
+    "paid_at",
+    "check_number",
+]
+
+
+class Echo:
+    """
+    File-like object whose write() returns the value instead of buffering it,
+    so csv.writer rows can be yielded straight into a StreamingHttpResponse.
+    """
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(filename, header, rows):
+    """
+    Returns a StreamingHttpResponse writing `header` and then every row of
+    the `rows` iterable as CSV.
+    """
+    writer = csv.writer(Echo())
+
+    def content():
+        yield UTF8_BOM + writer.writerow(header)
+        for row in rows:
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(content(), content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def iter_loan_rows(type_param=None, statuses=None):
+    """
+    Yields one export row per loan, checks loans first, each table in
+    (start_date, loan_id) order. `statuses`: only loans in these statuses.
+    """
+    for loan_type, model in LOAN_MODELS.items():
+        type_params = CHECKS_TYPE_PARAMS if loan_type == "checks" else STANDING_ORDER_TYPE_PARAMS
+        if type_param and type_param not in type_params:
+            continue
+
+        queryset = model.objects.select_related(*LOAN_LIST_RELATED).order_by("start_date", "loan_id")
+        if statuses is not None:
+            queryset = queryset.filter(status__in=statuses)
+
+        for loan in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            name, phone, email = resolve_borrower_fields(loan.borrower)
+            yield [
+                loan.loan_id,
+                loan_type,
+                loan.status,
+                loan.amount,
+                loan.start_date,
+                getattr(loan, "num_payments", ""),
+                getattr(loan, "monthly_amount", ""),
+                getattr(loan, "charge_day", ""),
+                loan.borrower.id_number,
+                name,
+                phone,
+                email,
+                loan.trustee.user.first_name if loan.trustee else "",
+                loan.trustee.community if loan.trustee else "",
+                loan.created_at.isoformat(),
+            ]
+
+
+def iter_payment_rows(status_param=None, due_from=None, due_to=None):
+    """
+    Yields one export row per payment, grouped by loan and ordered by due
+    date (the order of the payment_loan_due_idx index).
+    """
+    loan_types = {
+        ContentType.objects.get_for_model(model).id: loan_type
+        for loan_type, model in LOAN_MODELS.items()
+    }
+
+    queryset = Payment.objects.order_by("content_type_id", "object_id", "due_date")
+    if status_param:
+        queryset = queryset.filter(status=status_param)
+    if due_from:
+        queryset = queryset.filter(due_date__gte=due_from)
+    if due_to:
+        queryset = queryset.filter(due_date__lte=due_to)
+
+    rows = queryset.values_list(
+        "id", "object_id", "content_type_id", "due_date",
+        "amount", "amount_paid", "status", "paid_at", "check_number",
+    )
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        (payment_id, loan_id, content_type_id, due_date,
+         amount, amount_paid, payment_status, paid_at, check_number) = row
+        yield [
+            payment_id,
+            loan_id,
+            loan_types.get(content_type_id, ""),
+            due_date,
+            amount,
+            amount_paid,
+            payment_status,
+            paid_at.isoformat() if paid_at else "",
+            check_number or "",
+        ]
+
+
+class CSVExportNegotiation(BaseContentNegotiation):
+    """
+    The exports answer text/csv whatever the Accept header says (the CSV is
+    streamed, not rendered); errors are rendered as JSON.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0] if parsers else None
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class CSVExportView(APIView):
+    renderer_classes = [JSONRenderer]
+    content_negotiation_class = CSVExportNegotiation
+
+
+class LoanExportView(CSVExportView):
+    """
+    GET /api/loans/export.csv
+
+    Streams all loans (both types, any status) as CSV.
+    Optional filters: ?type=checks / standing_orders, ?status= as in the
+    loan list (ACTIVE / PENDING / PAID or CLOSED / REJECTED, comma-separated,
+    or all)
+    """
+
+    def get(self, request):
+        statuses = None
+        if request.GET.get("status"):
+            filters_serializer = LoanListFiltersSerializer(data={"status": request.GET["status"]})
+            if not filters_serializer.is_valid():
+                return Response(filters_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            statuses = model_statuses(filters_serializer.validated_data["status"])
+
+        rows = iter_loan_rows(
+            type_param=request.GET.get("type") or None,
+            statuses=statuses,
+        )
+        return stream_csv("loans.csv", LOAN_EXPORT_COLUMNS, rows)
+
+
+class PaymentLedgerExportView(CSVExportView):
+    """
+    GET /api/payments/export.csv
+
+    Streams the payment ledger (every payment of every loan) as CSV.
+    Optional filters: ?status=PENDING / PAID, ?due_from=YYYY-MM-DD, ?due_to=YYYY-MM-DD
+    """
+
+    def get(self, request):
+        dates = {}
+        for param in ("due_from", "due_to"):
+            value = request.GET.get(param)
+            if not value:
+                continue
+            try:
+                dates[param] = parse_date(value)
+            except ValueError:
+                dates[param] = None
+            if dates[param] is None:
+                return Response(
+                    {param: ["Date has wrong format. Use YYYY-MM-DD."]},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        rows = iter_payment_rows(
+            status_param=request.GET.get("status") or None,
+            **dates,
+        )
+        return stream_csv("payments.csv", PAYMENT_EXPORT_COLUMNS, rows)
@@ -0,0 +1,116 @@
+from decimal import Decimal
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, DecimalField, F, Min, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.models import Loan, LoanChecks, LoanStandingOrder, LoanRegistry, Payment
+
+
+# ------------------------------------
+#   Denormalized loan balances
+#   paid_amount / outstanding_amount / next_due_date / payments_remaining
+#   are stored on the loan tables (and copied to the registry) so lists and
+#   the detail panel never read the payments table. Every code path that
+#   writes payments calls one of the refresh functions below.
+# ------------------------------------
+
+BALANCE_FIELDS = list(Loan.BALANCE_FIELDS)
+
+LOAN_TYPES = {
+    LoanChecks: LoanRegistry.LOAN_TYPE_CHECKS,
+    LoanStandingOrder: LoanRegistry.LOAN_TYPE_STANDING_ORDER,
+}
+
+MONEY = DecimalField(max_digits=10, decimal_places=2)
+
+
+def balance_expressions(content_type):
+    """
+    UPDATE expressions computing the balance columns of a row with a
+    `loan_id` and an `amount` (loan table or registry) from its payments.
+    Each is a correlated subquery answered from payment_loan_due_idx.
+    """
+    payments = (
+        Payment.objects
+        .filter(content_type=content_type, object_id=OuterRef("loan_id"))
+        .order_by()
+        .values("object_id")
+    )
+    # Still owed: PENDING and BOUNCED payments
+    pending = payments.filter(status__in=Payment.UNPAID_STATUSES)
+
+    paid = Coalesce(
+        Subquery(payments.annotate(total=Sum("amount_paid")).values("total")),
+        Value(Decimal("0")),
+        output_field=MONEY,
+    )
+    return {
+        "paid_amount": paid,
+        "outstanding_amount": F("amount") - paid,
+        "next_due_date": Subquery(pending.annotate(first_due=Min("due_date")).values("first_due")),
+        "payments_remaining": Coalesce(
+            Subquery(pending.annotate(remaining=Count("id")).values("remaining")),
+            Value(0),
+        ),
+    }
+
+
+def refresh_model_balances(model, loan_ids=None):
+    """
+    Recomputes the balance columns of `model` loans (all of them, or only
+    `loan_ids` - a list or a values() subquery) and of their registry rows:
+    two set-based UPDATEs.
+
+    Returns the number of loans updated.
+    """
+    expressions = balance_expressions(ContentType.objects.get_for_model(model))
+
+    loans = model.objects.all()
+    registry = LoanRegistry.objects.filter(loan_type=LOAN_TYPES[model])
+    if loan_ids is not None:
+        loans = loans.filter(loan_id__in=loan_ids)
+        registry = registry.filter(loan_id__in=loan_ids)
+
+    # QuerySet.update() skips auto_now
+    updated_at = timezone.now()
+    updated = loans.update(updated_at=updated_at, **expressions)
+    registry.update(updated_at=updated_at, **expressions)
+    return updated
+
+
+def refresh_loan_balances(loans):
+    """
+    Recomputes the balance columns of the given loan instances, e.g. after
+    their payments were created or changed (one pair of UPDATEs per loan
+    type). The instances themselves are not reloaded.
+    """
+    by_model = {}
+    for loan in loans:
+        by_model.setdefault(type(loan), []).append(loan.loan_id)
+
+    for model, loan_ids in by_model.items():
+        refresh_model_balances(model, loan_ids)
+
+
+def refresh_balances_for_payments(payments):
+    """
+    Recomputes the balances of every loan having a payment in the
+    `payments` queryset (e.g. the payments a bulk UPDATE just changed),
+    without loading the payments.
+    """
+    for model in LOAN_TYPES:
+        content_type = ContentType.objects.get_for_model(model)
+        refresh_model_balances(
+            model,
+            payments.filter(content_type=content_type).values("object_id"),
+        )
+
+
+def reconcile_loan_balances():
+    """
+    Rebuilds the balance columns of every loan from the payments table.
+    Returns the number of loans updated.
+    """
+    return sum(refresh_model_balances(model) for model in LOAN_TYPES)
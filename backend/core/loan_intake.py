@@ -0,0 +1,136 @@
+from collections import Counter
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.loan_registry import loan_type_of, register_loans
+from core.metrics import count_loans_created
+from core.models import Borrower, Trustee, LoanChecks, LoanStandingOrder
+from core.payment_schedule import installment_amount
+from core.schedule_service import create_payment_schedules
+
+
+# ------------------------------------
+#   Bulk loan intake
+#   (same rules as LoanListView.post, for many loans at once)
+# ------------------------------------
+
+BORROWER_FIELDS = ["first_name", "last_name", "phone", "email", "address"]
+
+
+def _upsert_borrowers(items):
+    """
+    Locates or creates the borrowers of all items by id_number with one
+    SELECT, one bulk INSERT and one bulk UPDATE. When an id_number appears
+    several times, the last item's details win (as with sequential POSTs).
+
+    Returns {id_number: Borrower}.
+    """
+    latest = {}
+    for item in items:
+        latest[item["borrower"]["id_number"]] = item
+
+    existing = {
+        borrower.id_number: borrower
+        for borrower in Borrower.objects.filter(id_number__in=latest.keys())
+    }
+
+    to_create = []
+    for id_number, item in latest.items():
+        borrower = existing.get(id_number) or Borrower(id_number=id_number)
+        for field in BORROWER_FIELDS:
+            setattr(borrower, field, item["borrower"].get(field))
+        # Latest trustee
+        borrower.trustee_id = item["trustee_id"]
+
+        if id_number not in existing:
+            to_create.append(borrower)
+
+    Borrower.objects.bulk_create(to_create)
+    if existing:
+        # bulk_update() skips auto_now
+        updated_at = timezone.now()
+        for borrower in existing.values():
+            borrower.updated_at = updated_at
+        Borrower.objects.bulk_update(existing.values(), BORROWER_FIELDS + ["trustee", "updated_at"])
+
+    return {**existing, **{borrower.id_number: borrower for borrower in to_create}}
+
+
+def _build_loan(item, borrower):
+    loan_data = item["loan"]
+    common = dict(
+        borrower=borrower,
+        trustee_id=item["trustee_id"],
+        amount=loan_data["amount"],
+        start_date=loan_data["start_date"],
+        status="ACTIVE",
+    )
+
+    if item["loan_type"] == "checks":
+        return LoanChecks(num_payments=loan_data["num_payments"], **common)
+
+    return LoanStandingOrder(
+        monthly_amount=installment_amount(loan_data["amount"], loan_data["num_payments"]),
+        charge_day=loan_data["start_date"].day,
+        **common,
+    )
+
+
+def create_loans(items, all_or_nothing=False):
+    """
+    Creates many loans from validated CreateLoanRequestSerializer data.
+
+    Trustees are resolved in one query, borrowers are upserted in bulk,
+    loans of each type and all their payment schedules are bulk-created,
+    and the loan registry is updated - all in one transaction.
+
+    Items referencing an unknown trustee are rejected; with all_or_nothing,
+    any rejected item means nothing is created.
+
+    Returns (loans, errors): `loans` is aligned with `items` (None where the
+    item was not created), `errors` maps item index -> field errors.
+    """
+    trustee_ids = {item["trustee_id"] for item in items}
+    known_trustees = set(
+        Trustee.objects.filter(trustee_id__in=trustee_ids).values_list("trustee_id", flat=True)
+    )
+
+    errors = {}
+    accepted = []
+    for index, item in enumerate(items):
+        if item["trustee_id"] not in known_trustees:
+            errors[index] = {"trustee_id": ["Trustee not found"]}
+        else:
+            accepted.append(index)
+
+    loans = [None] * len(items)
+    if not accepted or (errors and all_or_nothing):
+        return loans, errors
+
+    with transaction.atomic():
+        borrowers = _upsert_borrowers([items[index] for index in accepted])
+
+        for index in accepted:
+            loans[index] = _build_loan(items[index], borrowers[items[index]["borrower"]["id_number"]])
+
+        for model in (LoanChecks, LoanStandingOrder):
+            model.objects.bulk_create([loan for loan in loans if isinstance(loan, model)])
+
+        created = [loans[index] for index in accepted]
+        # bulk_create does not send post_save: sync the registry explicitly
+        register_loans(created)
+        create_payment_schedules(
+            (loans[index], items[index]["loan"]["num_payments"]) for index in accepted
+        )
+
+        # Counted by core.signals for single saves (no post_save here either)
+        created_per_type = Counter(loan_type_of(loan) for loan in created)
+
+        def count_created():
+            for loan_type, count in created_per_type.items():
+                count_loans_created(loan_type, count)
+
+        transaction.on_commit(count_created)
+
+    return loans, errors
@@ -0,0 +1,375 @@
+import base64
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db.models import Q, Value
+from django.db.models.functions import Coalesce, Concat, Trim
+
+from .models import Borrower, Trustee, LoanRegistry, UserProfile
+from .overdue import days_overdue, is_overdue
+
+
+# ------------------------------------
+#   Unified loan list loader
+# ------------------------------------
+
+# Relations read while building a list item. Fetching them with the registry
+# row keeps each page at a single query, regardless of the number of rows.
+LOAN_LIST_RELATED = (
+    "borrower__user__profile",
+    "trustee__user",
+)
+
+# ?type= values accepted for each loan type
+CHECKS_TYPE_PARAMS = ("all", "checks")
+STANDING_ORDER_TYPE_PARAMS = ("all", "standing_orders", "standing_order")
+
+# ?status= values: "CLOSED" is how PAID loans are shown in the list
+STATUS_ALIASES = {"CLOSED": "PAID"}
+DEFAULT_STATUS = "ACTIVE"
+
+# ?ordering= values -> registry column used as the keyset key
+ORDERING_FIELDS = {
+    "start_date": "start_date",
+    "amount": "amount",
+}
+DEFAULT_ORDERING = "start_date"
+
+# Keyset pagination (?page_size= is capped at MAX_PAGE_SIZE)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def _full_name(first_field, last_field):
+    """
+    SQL equivalent of f"{first.strip()} {last.strip()}".strip().
+    """
+    return Trim(Concat(
+        Trim(Coalesce(first_field, Value(""))),
+        Value(" "),
+        Trim(Coalesce(last_field, Value(""))),
+    ))
+
+
+def _user_ids_matching_name(term):
+    match = Q(first_name__icontains=term) | Q(last_name__icontains=term)
+    if " " in term:
+        match |= Q(search_name__icontains=term)
+    return (
+        User.objects
+        .alias(search_name=_full_name("first_name", "last_name"))
+        .filter(match)
+        .values("id")
+    )
+
+
+def borrower_search_q(term):
+    """
+    Q over LoanRegistry (or a loan table) matching `term` (case-insensitive
+    substring) against the same borrower name / phone / email values
+    resolve_borrower_fields() displays, including the fallbacks to the linked
+    user and user profile.
+
+    Every table is searched in its own borrower_id subquery: an OR spanning
+    joined tables cannot be answered from the per-table trigram indexes
+    (PostgreSQL falls back to a sequential scan), while an OR over the
+    columns of one table becomes a BitmapOr of its indexes.
+
+    A term without spaces can only match "first last" inside one of the two
+    parts, so the per-column lookups are enough; the concatenated name is
+    only compared when the term contains a space.
+    """
+    own_match = (
+        Q(first_name__icontains=term)
+        | Q(last_name__icontains=term)
+        | Q(phone__icontains=term)
+        | Q(email__icontains=term)
+    )
+    if " " in term:
+        own_match |= Q(search_own_name__icontains=term)
+
+    borrowers = Borrower.objects.alias(search_own_name=_full_name("first_name", "last_name"))
+
+    # Fallbacks apply only when the borrower's own value is empty
+    no_own_phone = Q(phone__isnull=True) | Q(phone="")
+    no_own_email = Q(email__isnull=True) | Q(email="")
+
+    own = borrowers.filter(own_match)
+    user_name = borrowers.filter(search_own_name="", user_id__in=_user_ids_matching_name(term))
+    profile_phone = borrowers.filter(
+        no_own_phone,
+        user_id__in=UserProfile.objects.filter(phone__icontains=term).values("user_id"),
+    )
+    user_email = borrowers.filter(
+        no_own_email,
+        user_id__in=User.objects.filter(email__icontains=term).values("id"),
+    )
+
+    return (
+        Q(borrower_id__in=own.values("borrower_id"))
+        | Q(borrower_id__in=user_name.values("borrower_id"))
+        | Q(borrower_id__in=profile_phone.values("borrower_id"))
+        | Q(borrower_id__in=user_email.values("borrower_id"))
+    )
+
+
+def loan_search_q(term):
+    """
+    Q over LoanRegistry (or a loan table) matching `term` against the borrower name / phone /
+    email, the trustee name and the trustee community.
+
+    Like borrowers (see borrower_search_q), trustees are matched in one
+    subquery per table so each one is answered from its trigram indexes.
+    """
+    trustees_by_community = Trustee.objects.filter(community__icontains=term)
+    trustees_by_name = Trustee.objects.filter(
+        user_id__in=User.objects.filter(first_name__icontains=term).values("id")
+    )
+    return (
+        borrower_search_q(term)
+        | Q(trustee_id__in=trustees_by_community.values("trustee_id"))
+        | Q(trustee_id__in=trustees_by_name.values("trustee_id"))
+    )
+
+
+def model_statuses(statuses):
+    """
+    Loan statuses for validated ?status= values (see LoanListFiltersSerializer):
+    CLOSED means PAID; None when "all" was asked for.
+    """
+    if "ALL" in statuses:
+        return None
+    return [STATUS_ALIASES.get(s, s) for s in statuses]
+
+
+def loans_queryset(type_param=None, search=None, filters=None):
+    """
+    Returns the LoanRegistry queryset of the loans of the types selected by
+    the optional ?type= value, with the borrower / trustee relations
+    already joined in.
+
+    When `search` is given, only loans matching it (see loan_search_q) are kept.
+    `filters` holds the validated list filters (see LoanListFiltersSerializer):
+    status (default ACTIVE), min_amount / max_amount, start_date_from /
+    start_date_to, trustee, community and overdue.
+    """
+    filters = filters or {}
+
+    loan_types = []
+    if not type_param or type_param in CHECKS_TYPE_PARAMS:
+        loan_types.append(LoanRegistry.LOAN_TYPE_CHECKS)
+    if not type_param or type_param in STANDING_ORDER_TYPE_PARAMS:
+        loan_types.append(LoanRegistry.LOAN_TYPE_STANDING_ORDER)
+
+    queryset = (
+        LoanRegistry.objects
+        .filter(loan_type__in=loan_types)
+        .select_related(*LOAN_LIST_RELATED)
+    )
+
+    statuses = model_statuses(filters.get("status") or [DEFAULT_STATUS])
+    if statuses is not None:
+        queryset = queryset.filter(status__in=statuses)
+
+    if filters.get("min_amount") is not None:
+        queryset = queryset.filter(amount__gte=filters["min_amount"])
+    if filters.get("max_amount") is not None:
+        queryset = queryset.filter(amount__lte=filters["max_amount"])
+    if filters.get("start_date_from"):
+        queryset = queryset.filter(start_date__gte=filters["start_date_from"])
+    if filters.get("start_date_to"):
+        queryset = queryset.filter(start_date__lte=filters["start_date_to"])
+    if filters.get("trustee"):
+        queryset = queryset.filter(trustee_id=filters["trustee"])
+    if filters.get("community"):
+        queryset = queryset.filter(trustee__community=filters["community"])
+
+    if filters.get("overdue"):
+        # Flag maintained by core.overdue (partial index on overdue loans)
+        queryset = queryset.filter(status="ACTIVE", overdue_since__isnull=False)
+
+    if search:
+        queryset = queryset.filter(loan_search_q(search))
+
+    return queryset
+
+
+def resolve_borrower_fields(borrower):
+    """
+    Returns (name, phone, email) for a borrower, falling back to the linked
+    user / user profile when the borrower record itself is empty.
+    """
+    user = borrower.user if borrower else None
+
+    # name
+    first = (borrower.first_name or "").strip() if borrower else ""
+    last = (borrower.last_name or "").strip() if borrower else ""
+    name_from_borrower = f"{first} {last}".strip()
+    if name_from_borrower:
+        name = name_from_borrower
+    elif user:
+        name = (user.get_full_name() or "").strip()
+    else:
+        name = ""
+
+    # phone
+    if borrower and borrower.phone:
+        phone = borrower.phone
+    elif user and hasattr(user, "profile") and getattr(user.profile, "phone", None):
+        phone = user.profile.phone
+    else:
+        phone = ""
+
+    # email
+    if borrower and borrower.email:
+        email = borrower.email
+    elif user and user.email:
+        email = user.email
+    else:
+        email = ""
+
+    return name, phone, email
+
+
+def build_loan_list_item(loan, loan_type):
+    """
+    Converts a loan (or LoanRegistry row) into the dict shape expected by
+    LoanListSerializer.
+    """
+    b_name, b_phone, b_email = resolve_borrower_fields(loan.borrower)
+
+    overdue_since = getattr(loan, "overdue_since", None)
+    if loan.status == "PAID":
+        list_status = "CLOSED"
+    elif is_overdue(loan.status, overdue_since):
+        list_status = "OVERDUE"
+    else:
+        list_status = loan.status
+
+    return {
+        "loan_id": loan.loan_id,
+        "loan_type": loan_type,
+        "amount": loan.amount,
+        "start_date": loan.start_date,
+        "status": list_status,
+        "days_overdue": days_overdue(overdue_since) if list_status == "OVERDUE" else 0,
+        "outstanding_amount": loan.outstanding_amount,
+        "next_due_date": loan.next_due_date,
+        "borrower": {
+            "name": b_name,
+            "phone": b_phone,
+            "email": b_email,
+        },
+        "trustee": {
+            "name": loan.trustee.user.first_name if loan.trustee else None,
+            "community": loan.trustee.community if loan.trustee else None,
+        },
+    }
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _ordering_parts(ordering):
+    """
+    Returns (field, descending) for an ?ordering= value such as "-amount".
+    """
+    descending = ordering.startswith("-")
+    return ORDERING_FIELDS[ordering.lstrip("-")], descending
+
+
+def encode_cursor(ordering, value, loan_id):
+    """
+    Opaque cursor pointing at the (ordering value, loan_id) of the last row
+    of a page.
+    """
+    raw = f"{ordering}|{value.isoformat() if isinstance(value, date) else value}|{loan_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor, ordering):
+    """
+    Returns (value, loan_id) for a cursor produced by encode_cursor() with
+    the same ordering. Raises InvalidCursor for anything else.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        cursor_ordering, value, loan_id = raw.split("|")
+        if cursor_ordering != ordering:
+            raise ValueError("Cursor belongs to another ordering")
+
+        field, _ = _ordering_parts(ordering)
+        value = date.fromisoformat(value) if field == "start_date" else Decimal(value)
+        return value, uuid.UUID(loan_id)
+    except (ValueError, UnicodeError, ArithmeticError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+def page_size_param(value):
+    """
+    ?page_size= as an int between 1 and MAX_PAGE_SIZE. Raises ValueError.
+    """
+    return max(1, min(int(value), MAX_PAGE_SIZE))
+
+
+def loans_page_queryset(
+    type_param=None,
+    search=None,
+    filters=None,
+    ordering=DEFAULT_ORDERING,
+    cursor=None,
+    page_size=DEFAULT_PAGE_SIZE,
+):
+    """
+    The registry rows of one page of the loan list, plus the first row of
+    the next page (if any): filtered to rows after the cursor, ordered by
+    (ordering field, loan_id) and sliced to page_size + 1.
+    Raises InvalidCursor.
+    """
+    field, descending = _ordering_parts(ordering)
+    queryset = loans_queryset(type_param, search, filters)
+
+    if cursor:
+        after_value, after_id = decode_cursor(cursor, ordering)
+        beyond = "lt" if descending else "gt"
+        queryset = queryset.filter(
+            Q(**{f"{field}__{beyond}": after_value})
+            | Q(**{field: after_value, f"loan_id__{beyond}": after_id})
+        )
+
+    prefix = "-" if descending else ""
+    return queryset.order_by(f"{prefix}{field}", f"{prefix}loan_id")[:page_size + 1]
+
+
+def load_loans_page(
+    type_param=None,
+    search=None,
+    filters=None,
+    ordering=DEFAULT_ORDERING,
+    cursor=None,
+    page_size=DEFAULT_PAGE_SIZE,
+    entries=None,
+):
+    """
+    Returns (items, next_cursor) for one page of the unified loan list,
+    ordered by (ordering field, loan_id) across both loan types.
+
+    Both loan types live in LoanRegistry, so a page is a single indexed query
+    filtered to rows after the cursor: page N costs the same as page 1.
+    `entries` are the rows of loans_page_queryset() when already loaded.
+    next_cursor is None on the last page.
+    """
+    field, _ = _ordering_parts(ordering)
+    if entries is None:
+        entries = list(loans_page_queryset(type_param, search, filters, ordering, cursor, page_size))
+
+    next_cursor = None
+    if len(entries) > page_size:
+        entries = entries[:page_size]
+        next_cursor = encode_cursor(ordering, getattr(entries[-1], field), entries[-1].loan_id)
+
+    items = [build_loan_list_item(entry, entry.loan_type) for entry in entries]
+    return items, next_cursor
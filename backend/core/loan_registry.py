@@ -0,0 +1,158 @@
+from core.dashboard_cache import invalidate_dashboard_summary
+from core.models import LoanChecks, LoanStandingOrder, LoanRegistry
+
+
+# ------------------------------------
+#   Loan registry (loan_id -> loan type + list fields)
+#   Every registry write also invalidates the cached dashboard summary.
+# ------------------------------------
+
+LOAN_MODELS = {
+    LoanRegistry.LOAN_TYPE_CHECKS: LoanChecks,
+    LoanRegistry.LOAN_TYPE_STANDING_ORDER: LoanStandingOrder,
+}
+
+# Registry columns copied from the loan row
+REGISTRY_FIELDS = ["loan_type", "status", "amount", "start_date", "borrower", "trustee"]
+
+# loan_ids checked for collisions per query
+COLLISION_CHECK_BATCH = 2000
+
+
+class LoanIdCollision(ValueError):
+    """
+    A loan_id used by a LoanChecks and a LoanStandingOrder row: the registry
+    (and every /api/loans/{loan_id}/ URL) needs loan_ids unique across types.
+    """
+
+
+def loan_type_of(loan):
+    """
+    Returns "checks" / "standing_order" for a loan instance.
+    """
+    if isinstance(loan, LoanChecks):
+        return LoanRegistry.LOAN_TYPE_CHECKS
+    if isinstance(loan, LoanStandingOrder):
+        return LoanRegistry.LOAN_TYPE_STANDING_ORDER
+    raise TypeError(f"Not a loan: {loan!r}")
+
+
+def registry_entry_for(loan):
+    """
+    Returns the (unsaved) LoanRegistry row mirroring `loan`.
+
+    The balance columns are only used when the row is inserted; existing rows
+    get them from core.loan_balances, like the loan itself.
+    """
+    return LoanRegistry(
+        loan_id=loan.loan_id,
+        loan_type=loan_type_of(loan),
+        status=loan.status,
+        amount=loan.amount,
+        start_date=loan.start_date,
+        borrower_id=loan.borrower_id,
+        trustee_id=loan.trustee_id,
+        paid_amount=loan.paid_amount,
+        outstanding_amount=loan.outstanding_amount,
+        next_due_date=loan.next_due_date,
+        payments_remaining=loan.payments_remaining,
+    )
+
+
+def register_loan(loan):
+    """
+    Creates or updates the registry row of a single loan with one upsert.
+    Only REGISTRY_FIELDS are written, so the overdue flag is kept.
+    """
+    register_loans([loan])
+
+
+def register_loans(loans, batch_size=None):
+    """
+    Creates or updates the registry rows of many loans with bulk upserts.
+    Use after bulk_create / QuerySet.update on loan tables, which do not
+    send the model signals that keep the registry in sync.
+    """
+    entries = [registry_entry_for(loan) for loan in loans]
+    if not entries:
+        return []
+    _check_loan_id_collisions(entries)
+
+    invalidate_dashboard_summary()
+    return LoanRegistry.objects.bulk_create(
+        entries,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["loan_id"],
+        # updated_at: auto_now value of the upserted row
+        update_fields=REGISTRY_FIELDS + ["updated_at"],
+    )
+
+
+def _check_loan_id_collisions(entries):
+    """
+    Raises LoanIdCollision when a loan_id of `entries` is registered (or
+    listed in `entries`) for the other loan type, instead of letting the
+    upsert silently re-type the registry row.
+    """
+    loan_types = {}
+    for entry in entries:
+        if loan_types.setdefault(entry.loan_id, entry.loan_type) != entry.loan_type:
+            raise LoanIdCollision(f"loan_id {entry.loan_id} is used by loans of both types")
+
+    loan_ids = list(loan_types)
+    for start in range(0, len(loan_ids), COLLISION_CHECK_BATCH):
+        registered = (
+            LoanRegistry.objects
+            .filter(loan_id__in=loan_ids[start:start + COLLISION_CHECK_BATCH])
+            .values_list("loan_id", "loan_type")
+        )
+        for loan_id, loan_type in registered:
+            if loan_type != loan_types[loan_id]:
+                raise LoanIdCollision(f"loan_id {loan_id} is already registered as a {loan_type} loan")
+
+
+def unregister_loan(loan_id):
+    LoanRegistry.objects.filter(loan_id=loan_id).delete()
+    invalidate_dashboard_summary()
+
+
+def rebuild_registry(batch_size=2000):
+    """
+    Re-creates the registry from both loan tables.
+    Returns the number of registry rows written.
+    """
+    LoanRegistry.objects.all().delete()
+    invalidate_dashboard_summary()
+
+    total = 0
+    for model in LOAN_MODELS.values():
+        total += len(register_loans(model.objects.iterator(chunk_size=batch_size), batch_size=batch_size))
+    return total
+
+
+def resolve_loan(loan_id, select_related=()):
+    """
+    Returns the LoanChecks / LoanStandingOrder instance for `loan_id`, or None.
+
+    The loan type is read from the registry (one primary-key lookup), so only
+    the right loan table is queried - no probing of both tables. The
+    registry's overdue_since is attached to the returned loan.
+    """
+    entry = (
+        LoanRegistry.objects
+        .filter(loan_id=loan_id)
+        .values_list("loan_type", "overdue_since")
+        .first()
+    )
+    if entry is None:
+        return None
+    loan_type, overdue_since = entry
+
+    queryset = LOAN_MODELS[loan_type].objects.all()
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    loan = queryset.filter(loan_id=loan_id).first()
+    if loan is not None:
+        loan.overdue_since = overdue_since
+    return loan
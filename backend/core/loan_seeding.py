@@ -0,0 +1,194 @@
+import uuid
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from core.loan_balances import refresh_model_balances
+from core.loan_registry import register_loans
+from core.models import Borrower, Trustee, LoanChecks, LoanStandingOrder, Payment
+from core.overdue import refresh_overdue_flags
+from core.payment_schedule import installment_amount
+from core.schedule_service import build_payment_schedule
+
+
+# ------------------------------------
+#   Synthetic data for load tests and benchmarks (manage.py seed_loans)
+#   Everything is bulk-created in chunks; loans get a payment schedule whose
+#   past installments are mostly paid, so balances, overdue flags and the
+#   dashboards look like production data.
+#   Every random choice and identifier comes from the caller's rng, so a
+#   given seed always produces the same data set.
+# ------------------------------------
+
+FIRST_NAMES = [
+    "אברהם", "יצחק", "יעקב", "משה", "אהרן", "דוד", "שלמה", "יוסף", "חיים", "מרדכי",
+    "שרה", "רבקה", "רחל", "לאה", "מרים", "חנה", "אסתר", "דבורה", "רות", "יעל",
+]
+LAST_NAMES = [
+    "כהן", "לוי", "מזרחי", "פרץ", "ביטון", "דהן", "אברהמי", "פרידמן", "שפירא", "גולדברג",
+    "רוזנברג", "קליין", "וייס", "אדלר", "ברגר", "חדד", "אזולאי", "עמר", "גבאי", "אוחיון",
+]
+COMMUNITIES = ["רמות", "הר נוף", "פסגת זאב", "גילה", "בית וגן", "קרית משה", "גאולה", "הר חומה"]
+STREETS = ["יפו", "חב״ד", "הר חומה", "בר אילן", "שמגר", "מלכי ישראל", "הנביאים", "עזרא"]
+
+# Weighted loan statuses: most loans are being repaid
+STATUS_WEIGHTS = {"ACTIVE": 80, "PAID": 12, "PENDING": 5, "REJECTED": 3}
+
+# Share of past-due installments left unpaid (-> overdue loans)
+LATE_PAYMENT_RATE = 0.03
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def _uuid(rng):
+    """
+    A random (version 4) UUID drawn from `rng` instead of os.urandom.
+    """
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _phone(rng):
+    return f"05{rng.randint(0, 8)}{rng.randint(0, 9_999_999):07d}"
+
+
+def _address(rng):
+    return f"רח׳ {rng.choice(STREETS)} {rng.randint(1, 120)}, ירושלים"
+
+
+def seed_trustees(count, rng):
+    """
+    Creates `count` trustees (each with its user). Returns them.
+    """
+    users = [
+        User(
+            username=f"seed-trustee-{_uuid(rng).hex[:12]}",
+            first_name=rng.choice(FIRST_NAMES),
+            last_name=rng.choice(LAST_NAMES),
+        )
+        for _ in range(count)
+    ]
+    # Re-read the users (in creation order): not every backend returns the
+    # pks of bulk_create()
+    User.objects.bulk_create(users)
+    users = list(User.objects.filter(username__in=[user.username for user in users]).order_by("pk"))
+
+    return Trustee.objects.bulk_create([
+        Trustee(trustee_id=_uuid(rng), user=user, community=rng.choice(COMMUNITIES)) for user in users
+    ])
+
+
+def seed_borrowers(count, trustees, rng, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Creates `count` borrowers spread over `trustees`, with unique 9-digit
+    id numbers. Returns them.
+    """
+    borrowers = []
+    for start in range(0, count, chunk_size):
+        size = min(chunk_size, count - start)
+        id_numbers = set()
+        while len(id_numbers) < size:
+            candidates = {f"{rng.randint(100_000_000, 999_999_999)}" for _ in range(size - len(id_numbers))}
+            id_numbers |= candidates - set(
+                Borrower.objects.filter(id_number__in=candidates).values_list("id_number", flat=True)
+            )
+
+        borrowers += Borrower.objects.bulk_create([
+            Borrower(
+                borrower_id=_uuid(rng),
+                trustee=rng.choice(trustees),
+                id_number=id_number,
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES),
+                phone=_phone(rng),
+                email=f"borrower{id_number}@example.com" if rng.random() < 0.6 else None,
+                address=_address(rng),
+            )
+            # sorted: set order varies between runs, the data must not
+            for id_number in sorted(id_numbers)
+        ])
+    return borrowers
+
+
+def _build_loan(borrower, rng, today):
+    num_payments = rng.choice([6, 10, 12, 18, 24, 36])
+    amount = Decimal(rng.randrange(1_000, 50_000, 500))
+    start_date = today - timedelta(days=rng.randint(-60, 3 * 365))
+    common = dict(
+        loan_id=_uuid(rng),
+        borrower=borrower,
+        trustee_id=borrower.trustee_id,
+        amount=amount,
+        start_date=start_date,
+        status=rng.choices(list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()))[0],
+    )
+
+    if rng.random() < 0.5:
+        return LoanChecks(num_payments=num_payments, **common), num_payments
+
+    return LoanStandingOrder(
+        monthly_amount=installment_amount(amount, num_payments),
+        charge_day=start_date.day if start_date.day <= 28 else 28,
+        **common,
+    ), num_payments
+
+
+def _settle_history(loan, payments, rng, today):
+    """
+    Marks the past installments of the generated schedule as paid, leaving a
+    few ACTIVE loans behind on their payments.
+    """
+    for payment in payments:
+        if loan.status == "PAID":
+            paid = True
+        elif loan.status == "ACTIVE" and payment.due_date <= today:
+            paid = rng.random() >= LATE_PAYMENT_RATE
+        else:
+            paid = False
+
+        if paid:
+            payment.status = Payment.STATUS_PAID
+            payment.amount_paid = payment.amount
+            payment.paid_at = timezone.make_aware(datetime.combine(min(payment.due_date, today), time(9)))
+
+
+def seed_loans(borrowers, count, rng, chunk_size=DEFAULT_CHUNK_SIZE, today=None, stdout=None):
+    """
+    Creates `count` loans of both types for random `borrowers`, with their
+    registry rows, payment schedules, balances and overdue flags - one
+    transaction per chunk of `chunk_size` loans.
+    Returns the number of payments created.
+    """
+    today = today or date.today()
+    payments_created = 0
+
+    for start in range(0, count, chunk_size):
+        size = min(chunk_size, count - start)
+        built = [_build_loan(rng.choice(borrowers), rng, today) for _ in range(size)]
+
+        with transaction.atomic():
+            for model in (LoanChecks, LoanStandingOrder):
+                model.objects.bulk_create([loan for loan, _ in built if isinstance(loan, model)])
+            loans = [loan for loan, _ in built]
+            register_loans(loans)
+
+            payments = []
+            for loan, num_payments in built:
+                schedule = build_payment_schedule(loan, num_payments)
+                for payment in schedule:
+                    payment.id = _uuid(rng)
+                _settle_history(loan, schedule, rng, today)
+                payments += schedule
+            Payment.objects.bulk_create(payments, batch_size=chunk_size)
+            payments_created += len(payments)
+
+            for model in (LoanChecks, LoanStandingOrder):
+                refresh_model_balances(model, [loan.loan_id for loan in loans if isinstance(loan, model)])
+            refresh_overdue_flags(as_of=today, loan_ids=[loan.loan_id for loan in loans])
+
+        if stdout:
+            stdout.write(f"  {start + size:,} / {count:,} loans")
+
+    return payments_created
@@ -2,15 +2,28 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.utils.urls import replace_query_param
 from django.db import transaction
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 
-from .models import Borrower, Trustee, LoanChecks, LoanStandingOrder,Payment
+from .models import Borrower, Trustee, LoanChecks, LoanStandingOrder
 from .serializers import LoanListSerializer, LoanDetailSerializer, LoanUpdateSerializer,CreateLoanRequestSerializer
-
-from core.payment_schedule import calculate_payment_dates
-from django.contrib.contenttypes.models import ContentType
+from .serializers import LoanListFiltersSerializer, PaymentSerializer
+
+from core.schedule_service import create_payment_schedule
+from core.payment_schedule import installment_amount
+from core.loan_registry import resolve_loan
+from core.payments_views import loan_payments, summarize_payment_rows
+from core.loan_intake import create_loans
+from core.loan_balances import BALANCE_FIELDS
+from core.conditional_get import conditional_get, loan_list_validators, loan_detail_validators
+from core.loan_queries import (
+    DEFAULT_PAGE_SIZE,
+    InvalidCursor,
+    load_loans_page,
+    page_size_param,
+)
 
 
 # ------------------------------------
@@ -20,144 +33,87 @@ class LoanListView(APIView):
     """
     GET /loans
 
-    Returns ONLY ACTIVE loans (for the main loan list screen).
-    Supports optional filtering by loan type and **text search**.
+    Returns the loans of the main loan list screen (ACTIVE by default).
+    Supports optional filtering by loan type and **text search**, plus
+    database-level filters:
+      ?status=           ACTIVE / PENDING / PAID (or CLOSED) / REJECTED, comma-separated, or all
+      ?min_amount= / ?max_amount=
+      ?start_date_from= / ?start_date_to=
+      ?trustee=          trustee_id
+      ?community=        trustee community
+      ?overdue=true      only loans with a PENDING payment past its due date
+      ?ordering=         start_date (default), -start_date, amount, -amount
+
+    Results are cursor-paginated by (ordering field, loan_id):
+      ?page_size=  rows per page (default 50, capped at 200)
+      ?cursor=     value taken from the previous page's `next` link
+
+    Response: { "results": [...], "next": <url or null> }
+
+    Responses carry an ETag / Last-Modified (see core.conditional_get):
+    a request with a still-valid If-None-Match gets a 304.
     """
 
+    @conditional_get(loan_list_validators)
     def get(self, request):
 
         # Optional type filter (?type=checks / standing_orders / all)
         type_param = request.GET.get("type", None)
 
         # Optional search text (?search=yael / 050 / trustee name ...)
-        search_param = request.GET.get("search", "").strip().lower()
-
-        unified_loans = []  # final combined loan list
-
-        def resolve_borrower_fields(borrower):
-            user = borrower.user if borrower else None
-
-            # name
-            first = (borrower.first_name or "").strip() if borrower else ""
-            last = (borrower.last_name or "").strip() if borrower else ""
-            name_from_borrower = f"{first} {last}".strip()
-            if name_from_borrower:
-                name = name_from_borrower
-            elif user:
-                name = (user.get_full_name() or "").strip()
-            else:
-                name = ""
+        search_param = request.GET.get("search", "").strip()
 
-            # phone
-            if borrower and borrower.phone:
-                phone = borrower.phone
-            elif user and hasattr(user, "profile") and getattr(user.profile, "phone", None):
-                phone = user.profile.phone
-            else:
-                phone = ""
+        # Pagination (?cursor= / ?page_size=)
+        cursor = request.GET.get("cursor") or None
+        try:
+            page_size = page_size_param(request.GET.get("page_size", DEFAULT_PAGE_SIZE))
+        except ValueError:
+            return Response(
+                {"page_size": ["Must be an integer"]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-            # email
-            if borrower and borrower.email:
-                email = borrower.email
-            elif user and user.email:
-                email = user.email
-            else:
-                email = ""
-
-            return name, phone, email
-        
-        # -----------------------------
-        #   1. Fetch ACTIVE LoanChecks
-        # -----------------------------
-        checks_qs = LoanChecks.objects.filter(status="ACTIVE")
-
-        # Apply type filter: include only checks OR all
-        if type_param and type_param not in ["all", "checks"]:
-            checks_qs = []
-
-        for loan in checks_qs:
-            b_name, b_phone, b_email = resolve_borrower_fields(loan.borrower)
-            unified_loans.append({
-                "loan_id": loan.loan_id,
-                "loan_type": "checks",
-                "amount": loan.amount,
-                "start_date": loan.start_date,
-                "status": "CLOSED" if loan.status == "PAID" else "ACTIVE",
-                "borrower": {
-                    "name": b_name,
-                    "phone": b_phone,
-                    "email": b_email,
-                },
-
-                "trustee": {
-                    "name": loan.trustee.user.first_name if loan.trustee else None,
-                    "community": loan.trustee.community if loan.trustee else None,
-                }
-            })
-
-        # ---------------------------------------
-        #   2. Fetch ACTIVE LoanStandingOrder
-        # ---------------------------------------
-        standing_qs = LoanStandingOrder.objects.filter(status="ACTIVE")
-
-        # Apply type filter: include only standing orders OR all
-        if type_param and type_param not in ["all", "standing_orders", "standing_order"]:
-            standing_qs = []
-
-        for loan in standing_qs:
-            b_name, b_phone, b_email = resolve_borrower_fields(loan.borrower)
-            unified_loans.append({
-                "loan_id": loan.loan_id,
-                "loan_type": "standing_order",
-                "amount": loan.amount,
-                "start_date": loan.start_date,
-                "status": "CLOSED" if loan.status == "PAID" else "ACTIVE",
-                "borrower": {
-                    "name": b_name, 
-                    "phone": b_phone,
-                    "email": b_email,
-                },
-                    "trustee": {
-                    "name": loan.trustee.user.first_name if loan.trustee else None,
-                    "community": loan.trustee.community if loan.trustee else None,
-                }
-            })
+        # Filters + ordering (?status= / ?min_amount= / ... / ?ordering=)
+        filters_serializer = LoanListFiltersSerializer(data=request.GET)
+        if not filters_serializer.is_valid():
+            return Response(filters_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        filters = dict(filters_serializer.validated_data)
+        ordering = filters.pop("ordering")
+
+        # ------------------------------------------------------------
+        #   1-3. Fetch one page of LoanChecks + LoanStandingOrder
+        #        (from LoanRegistry, borrower / trustee relations joined in,
+        #         filters and free-text search applied in SQL)
+        # ------------------------------------------------------------
+        try:
+            unified_loans, next_cursor = load_loans_page(
+                type_param,
+                search_param,
+                filters=filters,
+                ordering=ordering,
+                cursor=cursor,
+                page_size=page_size,
+                # Already loaded for the ETag (see loan_list_validators)
+                entries=getattr(request, "loans_page_entries", None),
+            )
+        except InvalidCursor:
+            return Response(
+                {"cursor": ["Invalid cursor"]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        # ----------------------------------------------------
-        #   3. Apply free-text search (if ?search= was given)
-        # ----------------------------------------------------
-        if search_param:
-            def matches(loan):
-                """
-                Returns True if the search query appears in:
-                - borrower name
-                - borrower phone
-                - borrower email
-                - trustee name
-                - trustee community
-                """
-                borrower = loan.get("borrower", {})
-                trustee = loan.get("trustee", {})
-
-                fields = [
-                    borrower.get("name") or "",
-                    borrower.get("phone") or "",
-                    borrower.get("email") or "",
-                    trustee.get("name") or "",
-                    trustee.get("community") or "",
-                ]
-
-                # Case-insensitive substring match
-                return any(search_param in str(value).lower() for value in fields)
-
-            # keep only loans that match the search
-            unified_loans = [loan for loan in unified_loans if matches(loan)]
+        next_url = None
+        if next_cursor:
+            next_url = replace_query_param(request.build_absolute_uri(), "cursor", next_cursor)
 
         # ------------------------
         #   4. Serialize + Return
         # ------------------------
         serializer = LoanListSerializer(unified_loans, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(
+            {"results": serializer.data, "next": next_url},
+            status=status.HTTP_200_OK
+        )
     
     """
     POST /api/loans/
@@ -249,7 +205,7 @@ class LoanListView(APIView):
                 )
 
             elif loan_type == "standing_order":
-                monthly_amount = loan_data["amount"] / loan_data["num_payments"]
+                monthly_amount = installment_amount(loan_data["amount"], loan_data["num_payments"])
                 charge_day = loan_data["start_date"].day
 
                 loan = LoanStandingOrder.objects.create(
@@ -267,31 +223,8 @@ class LoanListView(APIView):
             # ------------------------------------------------
             
 
-            num_payments = loan_data["num_payments"]
-
-            # Calculate due dates
-            due_dates = calculate_payment_dates(
-                loan.start_date,
-                num_payments
-            )
-
-            # Calculate amount per payment
-            amount_per_payment = loan.amount / num_payments
-
-            # Prepare GenericForeignKey data
-            content_type = ContentType.objects.get_for_model(loan)
-
-            # Create Payment records
-            for due_date in due_dates:
-                Payment.objects.create(
-                    content_type=content_type,
-                    object_id=loan.loan_id,
-                    due_date=due_date,
-                    amount=amount_per_payment,
-                    amount_paid=0,
-                    status=Payment.STATUS_PENDING,
-                )
-
+            # Built in memory and written with a single bulk INSERT
+            create_payment_schedule(loan, loan_data["num_payments"])
 
 
         # ----------------------------------------------------
@@ -309,47 +242,179 @@ class LoanListView(APIView):
 
 
 
+# ------------------------------------
+#   Batch Loan Creation View
+# ------------------------------------
+MAX_BATCH_SIZE = 500
+BATCH_MODES = ("all_or_nothing", "best_effort")
+
+
+class LoanBatchCreateView(APIView):
+    """
+    POST /api/loans/batch/
+
+    Creates many loans in one request (e.g. a monthly intake session).
+
+    Body: { "mode": "all_or_nothing" | "best_effort", "loans": [ <POST /api/loans/ payload>, ... ] }
+
+    - all_or_nothing (default): if any item is invalid nothing is created
+      and the response is 400 with the errors by item index
+    - best_effort: valid items are created, invalid ones are reported
+
+    Trustees and borrowers are resolved with a few bulk queries and all
+    loans and payment schedules are written in a single transaction.
+
+    Response: { "created": n, "failed": n, "results": [ {index, loan_id, loan_type, status} | {index, errors} ] }
+    """
+
+    def post(self, request):
+        # ----------------------------------------------------
+        # Step 1: Validate the envelope (a bare list is also accepted)
+        # ----------------------------------------------------
+        data = request.data
+        if isinstance(data, list):
+            data = {"loans": data}
+        if not isinstance(data, dict):
+            return Response(
+                {"detail": "Expected an object or a list of loans"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        mode = data.get("mode", "all_or_nothing")
+        if mode not in BATCH_MODES:
+            return Response(
+                {"mode": [f"Must be one of: {', '.join(BATCH_MODES)}"]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        items = data.get("loans")
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"loans": ["Must be a non-empty list"]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > MAX_BATCH_SIZE:
+            return Response(
+                {"loans": [f"At most {MAX_BATCH_SIZE} loans per batch"]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # ----------------------------------------------------
+        # Step 2: Validate every item (same rules as POST /api/loans/)
+        # ----------------------------------------------------
+        errors = {}
+        valid = []
+        for index, item in enumerate(items):
+            serializer = CreateLoanRequestSerializer(data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                errors[index] = serializer.errors
+
+        all_or_nothing = mode == "all_or_nothing"
+
+        # ----------------------------------------------------
+        # Step 3: Bulk create (trustees checked inside)
+        # ----------------------------------------------------
+        loans = {}
+        if valid and not (errors and all_or_nothing):
+            created, create_errors = create_loans(
+                [data for _, data in valid],
+                all_or_nothing=all_or_nothing,
+            )
+            for (index, data), loan in zip(valid, created):
+                if loan is not None:
+                    loans[index] = (loan, data["loan_type"])
+            for position, item_errors in create_errors.items():
+                errors[valid[position][0]] = item_errors
+
+        # ----------------------------------------------------
+        # Step 4: Per-item results
+        # ----------------------------------------------------
+        results = []
+        for index in range(len(items)):
+            if index in loans:
+                loan, loan_type = loans[index]
+                results.append({
+                    "index": index,
+                    "loan_id": str(loan.loan_id),
+                    "loan_type": loan_type,
+                    "status": loan.status,
+                })
+            elif index in errors:
+                results.append({"index": index, "errors": errors[index]})
+
+        body = {"created": len(loans), "failed": len(errors), "results": results}
+
+        if errors and all_or_nothing:
+            return Response(body, status=status.HTTP_400_BAD_REQUEST)
+        return Response(body, status=status.HTTP_201_CREATED if loans else status.HTTP_400_BAD_REQUEST)
+
+
 # ------------------------------------
 #   Loan Detail View (unchanged)
 # ------------------------------------
+# Relations read by LoanDetailSerializer (borrower / trustee sections),
+# fetched in the same query as the loan itself
+LOAN_DETAIL_RELATED = (
+    "borrower__user__profile",
+    "trustee__user__profile",
+)
+
+# ?include= values of the loan detail endpoint
+DETAIL_INCLUDES = ("payments",)
+
+
 @method_decorator(csrf_exempt, name="dispatch")
 class LoanDetailView(APIView):
     """
     GET  /api/loans/{loan_id}
     Returns full loan details for a given loan_id.
     Supports both LoanChecks and LoanStandingOrder.
+
+    ?include=payments also embeds the payment schedule and its summary
+    (same shape as /api/loans/{loan_id}/payments) - one request instead of two.
+
+    Responses carry an ETag / Last-Modified (see core.conditional_get).
     """
 
+    @conditional_get(loan_detail_validators)
     def get(self, request, loan_id):
 
-        loan = None
-        loan_type = None  # Set default
-
-        # Try LoanChecks first
-        try:
-            loan = LoanChecks.objects.get(loan_id=loan_id)
-            loan_type = "checks"
-        except LoanChecks.DoesNotExist:
-            pass
+        # 1. Validate ?include=
+        includes = [value for value in request.GET.get("include", "").split(",") if value]
+        unknown = [value for value in includes if value not in DETAIL_INCLUDES]
+        if unknown:
+            return Response(
+                {"include": [f"Unknown value(s): {', '.join(unknown)}"]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        # Try StandingOrder next
+        # 2. Resolve loan type from the registry, then fetch the loan with its
+        #    borrower / trustee / users / profiles in one joined query
+        loan = resolve_loan(loan_id, select_related=LOAN_DETAIL_RELATED)
         if loan is None:
-            try:
-                loan = LoanStandingOrder.objects.get(loan_id=loan_id)
-                loan_type = "standing_order"
-            except LoanStandingOrder.DoesNotExist:
-                return Response(
-                    {"detail": "Loan not found"},
-                    status=status.HTTP_404_NOT_FOUND
-                )
+            return Response(
+                {"detail": "Loan not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
 
-        # Serialize full details
+        # 3. Serialize full details
         serializer = LoanDetailSerializer(
             loan,
             context={"request": request}
         )
+        data = serializer.data
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # 4. Payment schedule: one more query, summary computed from the rows
+        if "payments" in includes:
+            payments = list(loan_payments(loan))
+            data["schedule"] = {
+                "summary": summarize_payment_rows(payments),
+                "payments": PaymentSerializer(payments, many=True).data,
+            }
+
+        return Response(data, status=status.HTTP_200_OK)
     
 
 
@@ -364,13 +429,9 @@ class LoanDetailView(APIView):
 
     def put(self, request, loan_id):
         # Find loan
-        try:
-            loan = LoanChecks.objects.get(loan_id=loan_id)
-        except LoanChecks.DoesNotExist:
-            try:
-                loan = LoanStandingOrder.objects.get(loan_id=loan_id)
-            except LoanStandingOrder.DoesNotExist:
-                return Response({"detail": "Loan not found"}, status=status.HTTP_404_NOT_FOUND)
+        loan = resolve_loan(loan_id, select_related=LOAN_DETAIL_RELATED)
+        if loan is None:
+            return Response({"detail": "Loan not found"}, status=status.HTTP_404_NOT_FOUND)
         serializer = LoanUpdateSerializer(
             instance=loan,
             data=request.data,
@@ -380,5 +441,7 @@ class LoanDetailView(APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
         serializer.save()
+        # Balance columns were recomputed in SQL by the schedule sync
+        loan.refresh_from_db(fields=BALANCE_FIELDS)
         serializer = LoanDetailSerializer(loan, context={"request": request})
         return Response(serializer.data, status=status.HTTP_200_OK)
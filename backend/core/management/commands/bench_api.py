@@ -0,0 +1,355 @@
+import json
+import random
+import time
+import uuid
+from urllib.parse import quote
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.loan_seeding import seed_borrowers, seed_loans, seed_trustees
+from core.models import Borrower, LoanRegistry, Payment, Role, Trustee, UserProfile
+from core.portfolio_stats import refresh_portfolio_statistics
+
+
+# ------------------------------------
+#   Endpoints of backend_project/urls.py
+#   (name, method, path, body, heavy) - the path template and the body
+#   function are filled from the sample rows of the data set. Heavy
+#   endpoints (full exports, metrics scrape) run --heavy-requests times only.
+# ------------------------------------
+
+def _loan_payload(ctx, loan_type="checks"):
+    return {
+        "loan_type": loan_type,
+        "trustee_id": ctx["trustee_id"],
+        "borrower": {
+            "id_number": f"{random.randint(100_000_000, 999_999_999)}",
+            "first_name": "בנצ׳מרק",
+            "address": "רח׳ יפו 35, ירושלים",
+        },
+        "loan": {"amount": "12000.00", "num_payments": 12, "start_date": "2026-01-01"},
+    }
+
+
+def _update_payload(ctx):
+    return {
+        "amount": "12000.00",
+        "start_date": "2026-01-01",
+        # The sample loan's schedule length: paid installments are never dropped
+        "number_of_payments": ctx["num_payments"],
+        "trustee_id": ctx["trustee_id"],
+        "status": "ACTIVE",
+    }
+
+
+ENDPOINTS = [
+    # Unified loan list / detail / payments
+    ("loans.list", "GET", "/api/loans/", None, False),
+    ("loans.list.filtered", "GET", "/api/loans/?type=checks&status=all&community={community}&ordering=-amount", None, False),
+    ("loans.list.search", "GET", "/api/loans/?search={search}", None, False),
+    ("loans.list.overdue", "GET", "/api/loans/?overdue=true", None, False),
+    ("loans.list.not_modified", "GET", "/api/loans/", None, False),
+    ("loans.create", "POST", "/api/loans/", _loan_payload, False),
+    ("loans.batch", "POST", "/api/loans/batch/", lambda ctx: {
+        "mode": "best_effort",
+        "loans": [_loan_payload(ctx, loan_type) for loan_type in ["checks", "standing_order"] * 5],
+    }, False),
+    ("loans.detail", "GET", "/api/loans/{loan_id}/", None, False),
+    ("loans.detail.payments", "GET", "/api/loans/{loan_id}/?include=payments", None, False),
+    ("loans.update", "PUT", "/api/loans/{loan_id}/", _update_payload, False),
+    ("loans.payments", "GET", "/api/loans/{loan_id}/payments", None, False),
+    ("loans.payments.summary", "GET", "/api/loans/{loan_id}/payments?summary_only=true", None, False),
+
+    # CSV exports (streamed)
+    ("exports.loans", "GET", "/api/loans/export.csv", None, True),
+    ("exports.payments", "GET", "/api/payments/export.csv", None, True),
+
+    # Dashboards
+    ("dashboard.loan_summary", "GET", "/api/dashboard/loan-summary/", None, False),
+    ("dashboard.portfolio", "GET", "/api/dashboard/portfolio/", None, False),
+
+    # Router CRUD endpoints
+    ("roles.list", "GET", "/api/roles/", None, False),
+    ("roles.detail", "GET", "/api/roles/{role_id}/", None, False),
+    ("user_profiles.list", "GET", "/api/user-profiles/", None, False),
+    ("user_profiles.detail", "GET", "/api/user-profiles/{profile_id}/", None, False),
+    ("borrowers.list", "GET", "/api/borrowers/", None, False),
+    ("borrowers.detail", "GET", "/api/borrowers/{borrower_id}/", None, False),
+    ("borrowers.exposure", "GET", "/api/borrowers/{borrower_id}/exposure/", None, False),
+    ("trustees.list", "GET", "/api/trustees/", None, False),
+    ("trustees.detail", "GET", "/api/trustees/{trustee_id}/", None, False),
+    ("loan_checks.list", "GET", "/api/loans/checks/", None, False),
+    ("loan_checks.detail", "GET", "/api/loans/checks/{checks_loan_id}/", None, False),
+    ("loan_standing_orders.list", "GET", "/api/loans/standing-order/", None, False),
+    ("loan_standing_orders.detail", "GET", "/api/loans/standing-order/{standing_order_loan_id}/", None, False),
+
+    # Monitoring
+    ("admin.request_metrics", "GET", "/api/admin/request-metrics/", None, False),
+    ("metrics", "GET", "/metrics", None, True),
+]
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(sorted_values, p):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[rank - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every endpoint of backend_project/urls.py at growing data set sizes "
+        "(loans seeded with core.loan_seeding, 1k / 10k / 100k by default): latency "
+        "percentiles and query count per endpoint, written as a JSON report that can be "
+        "diffed between commits. With --baseline, endpoints that got slower or run more "
+        "queries than in a previous report fail the command. "
+        "Seeded rows are created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+            help="Data set sizes (number of loans) to benchmark at (default: 1000 10000 100000)",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=50,
+            help="Timed requests per endpoint and size (after one warm-up request)",
+        )
+        parser.add_argument(
+            "--heavy-requests", type=int, default=5,
+            help="Timed requests for the full exports and the metrics scrape",
+        )
+        parser.add_argument(
+            "--endpoints", nargs="+", default=None,
+            help="Only run the endpoints whose name starts with one of these prefixes (e.g. loans. dashboard.)",
+        )
+        parser.add_argument(
+            "--loans-per-borrower", type=int, default=5,
+            help="Seeded borrowers = loans / this",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed of the seeded data")
+        parser.add_argument(
+            "--output", default=None,
+            help="Write the JSON report to this file (default: stdout)",
+        )
+        parser.add_argument(
+            "--baseline", default=None,
+            help="Previous JSON report to compare against",
+        )
+        parser.add_argument(
+            "--tolerance", type=float, default=25.0,
+            help="Allowed p50 latency increase over the baseline, in percent (default: 25)",
+        )
+
+    def handle(self, *args, **options):
+        endpoints = [
+            endpoint for endpoint in ENDPOINTS
+            if not options["endpoints"] or endpoint[0].startswith(tuple(options["endpoints"]))
+        ]
+        if not endpoints:
+            raise CommandError("No endpoint matches --endpoints")
+
+        rng = random.Random(options["seed"])
+        random.seed(options["seed"])
+        report = {
+            "database": connection.vendor,
+            "requests": options["requests"],
+            "heavy_requests": options["heavy_requests"],
+            "seed": options["seed"],
+            "sizes": {},
+        }
+
+        # The test client talks to "testserver"
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]), transaction.atomic():
+            client = self._client()
+            borrowers = list(Borrower.objects.only("borrower_id", "trustee_id"))
+            trustees = list(Trustee.objects.all())
+
+            for size in sorted(set(options["sizes"])):
+                existing = LoanRegistry.objects.count()
+                if existing > size:
+                    self.stderr.write(f"Skipping {size:,} loans: the database already holds {existing:,}")
+                    continue
+
+                self.stdout.write(self.style.MIGRATE_HEADING(f"\n=== {size:,} loans ==="))
+                borrowers, trustees = self._grow(
+                    size - existing, borrowers, trustees, rng, options["loans_per_borrower"]
+                )
+                report["sizes"][str(size)] = self._run(client, endpoints, self._context(), options)
+
+            # Discard seeded rows and benchmark writes
+            transaction.set_rollback(True)
+
+        self._write(report, options["output"])
+
+        if options["baseline"]:
+            self._compare(report, options["baseline"], options["tolerance"])
+
+    # ------------------------------------
+    #   Data set
+    # ------------------------------------
+
+    def _client(self):
+        user = User.objects.create(username=f"bench-{uuid.uuid4().hex[:12]}", is_staff=True)
+        UserProfile.objects.create(user=user, role=Role.objects.create(name=f"bench-{uuid.uuid4().hex[:8]}"))
+        client = Client()
+        client.force_login(user)
+        return client
+
+    def _grow(self, loans, borrowers, trustees, rng, loans_per_borrower):
+        """
+        Seeds `loans` more loans, with one new borrower per `loans_per_borrower`
+        loans and one new trustee per 50 new borrowers.
+        """
+        if not loans:
+            return borrowers, trustees
+
+        started = time.perf_counter()
+        new_borrowers = max(1, loans // loans_per_borrower)
+        trustees = trustees + seed_trustees(max(1, new_borrowers // 50), rng)
+        borrowers = borrowers + seed_borrowers(new_borrowers, trustees, rng)
+        seed_loans(borrowers, loans, rng)
+        refresh_portfolio_statistics()
+        self.stdout.write(f"Seeded {loans:,} loans in {time.perf_counter() - started:.1f}s")
+        return borrowers, trustees
+
+    def _context(self):
+        """
+        Sample rows the endpoint paths and bodies are built from: an ACTIVE
+        loan of each type, a borrower with loans, a trustee...
+        """
+        active = LoanRegistry.objects.filter(status="ACTIVE", trustee__isnull=False).order_by("loan_id")
+        checks = active.filter(loan_type=LoanRegistry.LOAN_TYPE_CHECKS).select_related("borrower", "trustee").first()
+        standing_order = active.filter(loan_type=LoanRegistry.LOAN_TYPE_STANDING_ORDER).first()
+        if checks is None or standing_order is None:
+            raise CommandError("The data set has no ACTIVE loan of each type")
+
+        return {
+            "loan_id": checks.loan_id,
+            "checks_loan_id": checks.loan_id,
+            "standing_order_loan_id": standing_order.loan_id,
+            "borrower_id": checks.borrower_id,
+            "trustee_id": str(checks.trustee_id),
+            "num_payments": Payment.objects.filter(object_id=checks.loan_id).count(),
+            "community": quote(checks.trustee.community),
+            "search": quote(checks.borrower.last_name or checks.borrower.id_number),
+            "role_id": Role.objects.values_list("role_id", flat=True).first(),
+            "profile_id": UserProfile.objects.values_list("id", flat=True).first(),
+        }
+
+    # ------------------------------------
+    #   Measurements
+    # ------------------------------------
+
+    def _run(self, client, endpoints, ctx, options):
+        # Start every size with cold caches (dashboard summary, ...)
+        cache.clear()
+        results = {}
+
+        for name, method, path, body, heavy in endpoints:
+            url = path.format(**ctx)
+            repeat = options["heavy_requests"] if heavy else options["requests"]
+
+            headers = {}
+            if name.endswith(".not_modified"):
+                # Revalidation of a cached copy: answered 304
+                headers["HTTP_IF_NONE_MATCH"] = client.get(url)["ETag"]
+
+            # Warm-up request (ContentType cache, first-query overhead)
+            self._request(client, method, url, body, ctx, headers)
+
+            timings = []
+            queries = []
+            for _ in range(repeat):
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    response = self._request(client, method, url, body, ctx, headers)
+                    timings.append((time.perf_counter() - started) * 1000)
+                queries.append(len(captured))
+            timings.sort()
+
+            results[name] = {
+                "method": method,
+                "path": path,
+                "status": response.status_code,
+                "requests": repeat,
+                **{f"p{p}_ms": round(percentile(timings, p), 2) for p in PERCENTILES},
+                "mean_ms": round(sum(timings) / len(timings), 2),
+                "max_ms": round(timings[-1], 2),
+                "queries": max(queries),
+            }
+            self.stdout.write(
+                f"{name:<30} {response.status_code}  p50 {results[name]['p50_ms']:>8.2f} ms  "
+                f"p95 {results[name]['p95_ms']:>8.2f} ms  {results[name]['queries']:>3} queries"
+            )
+
+        return results
+
+    def _request(self, client, method, url, body, ctx, headers):
+        data = body(ctx) if body else None
+        if method == "GET":
+            response = client.get(url, **headers)
+        else:
+            response = getattr(client, method.lower())(url, data=data, content_type="application/json", **headers)
+
+        if response.status_code >= 400:
+            raise CommandError(f"{method} {url} answered {response.status_code}")
+        if response.streaming:
+            # Exports are generated while the body is consumed
+            for _ in response.streaming_content:
+                pass
+        return response
+
+    # ------------------------------------
+    #   Report
+    # ------------------------------------
+
+    def _write(self, report, output):
+        content = json.dumps(report, indent=2, sort_keys=True, ensure_ascii=False)
+        if output:
+            with open(output, "w", encoding="utf-8") as report_file:
+                report_file.write(content + "\n")
+            self.stdout.write(self.style.SUCCESS(f"\nReport written to {output}"))
+        else:
+            self.stdout.write(content)
+
+    def _compare(self, report, baseline_path, tolerance):
+        """
+        Fails on endpoints running more queries than in the baseline, or
+        whose p50 grew by more than `tolerance` percent (and at least 1 ms,
+        to ignore noise on very fast endpoints).
+        """
+        try:
+            with open(baseline_path, encoding="utf-8") as baseline_file:
+                baseline = json.load(baseline_file)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot read baseline {baseline_path}: {exc}")
+
+        regressions = []
+        for size, endpoints in report["sizes"].items():
+            for name, current in endpoints.items():
+                previous = baseline.get("sizes", {}).get(size, {}).get(name)
+                if previous is None:
+                    continue
+                if current["queries"] > previous["queries"]:
+                    regressions.append(
+                        f"{size} loans, {name}: {previous['queries']} -> {current['queries']} queries"
+                    )
+                limit = previous["p50_ms"] * (1 + tolerance / 100)
+                if current["p50_ms"] > limit and current["p50_ms"] - previous["p50_ms"] >= 1:
+                    regressions.append(
+                        f"{size} loans, {name}: p50 {previous['p50_ms']} -> {current['p50_ms']} ms"
+                    )
+
+        if regressions:
+            raise CommandError("Regressions against the baseline:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regression against the baseline"))
@@ -0,0 +1,141 @@
+import random
+import time
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.models import LoanChecks, LoanStandingOrder, Payment
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark Payment lookups (one loan's schedule, due PENDING payments) "
+        "with and without the payment indexes: query plan and latency. "
+        "Seeds synthetic payments inside a transaction that is rolled back."
+    )
+
+    # Indexes added by migration 0007_payment_lookup_indexes
+    INDEX_NAMES = ["payment_loan_due_idx", "payment_pending_due_idx"]
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--payments", type=int, default=1_000_000,
+            help="Number of synthetic payments to seed (default: 1,000,000)",
+        )
+        parser.add_argument(
+            "--payments-per-loan", type=int, default=12,
+            help="Schedule length of each synthetic loan",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=20,
+            help="Runs per query; the median latency is reported",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=10_000,
+            help="bulk_create batch size used while seeding",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.stdout.write(f"Seeding {options['payments']:,} payments ...")
+            loan_ids = self._seed(
+                options["payments"], options["payments_per_loan"], options["batch_size"]
+            )
+            content_type = ContentType.objects.get_for_model(LoanChecks)
+            queries = self._queries(content_type, random.choice(loan_ids))
+
+            self._analyze()
+            self._report("with indexes", queries, options["repeat"])
+
+            self._drop_indexes()
+            self._analyze()
+            self._report("without indexes", queries, options["repeat"])
+
+            # Discard seeded rows and restore the dropped indexes
+            transaction.set_rollback(True)
+
+    def _seed(self, total, per_loan, batch_size):
+        """
+        Synthetic payment schedules spread over both loan content types.
+        Loans themselves are not needed: the GenericForeignKey has no DB constraint.
+        """
+        content_types = [
+            ContentType.objects.get_for_model(LoanChecks),
+            ContentType.objects.get_for_model(LoanStandingOrder),
+        ]
+        start = date(2020, 1, 1)
+        loan_ids = []
+        batch = []
+
+        for i in range(total):
+            if i % per_loan == 0:
+                loan_id = uuid.uuid4()
+                content_type = content_types[len(loan_ids) % 2]
+                loan_start = start + relativedelta(days=random.randint(0, 6 * 365))
+                loan_ids.append(loan_id)
+
+            due_date = loan_start + relativedelta(months=i % per_loan)
+            is_paid = due_date < date(2025, 1, 1)
+            batch.append(Payment(
+                content_type=content_type,
+                object_id=loan_id,
+                due_date=due_date,
+                amount=Decimal("100.00"),
+                amount_paid=Decimal("100.00") if is_paid else 0,
+                status=Payment.STATUS_PAID if is_paid else Payment.STATUS_PENDING,
+            ))
+
+            if len(batch) >= batch_size:
+                Payment.objects.bulk_create(batch)
+                batch = []
+
+        if batch:
+            Payment.objects.bulk_create(batch)
+
+        # Only checks loans are looked up below
+        return loan_ids[::2]
+
+    def _queries(self, content_type, loan_id):
+        return [
+            (
+                "loan schedule (LoanPaymentsView)",
+                Payment.objects.filter(content_type=content_type, object_id=loan_id).order_by("due_date"),
+            ),
+            (
+                "due PENDING payments (settle_due_payments)",
+                Payment.objects.filter(status=Payment.STATUS_PENDING, due_date__lte=date(2025, 1, 31)),
+            ),
+        ]
+
+    def _report(self, label, queries, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n=== {label} ==="))
+
+        for name, queryset in queries:
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append(time.perf_counter() - started)
+            timings.sort()
+
+            self.stdout.write(f"\n-- {name}: median {timings[len(timings) // 2] * 1000:.2f} ms")
+            self.stdout.write(self._explain(queryset))
+
+    def _explain(self, queryset):
+        if connection.vendor == "postgresql":
+            return queryset.explain(analyze=True, buffers=True)
+        return queryset.explain()
+
+    def _analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(Payment._meta.db_table)}")
+
+    def _drop_indexes(self):
+        with connection.cursor() as cursor:
+            for name in self.INDEX_NAMES:
+                cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
@@ -0,0 +1,104 @@
+import time
+import uuid
+from decimal import Decimal
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Trustee, Borrower, LoanChecks, Payment
+from core.payment_schedule import calculate_payment_dates
+from core.schedule_service import create_payment_schedule
+
+
+def create_row_by_row(loan, num_payments):
+    """
+    Previous LoanListView.post behaviour: one Payment.objects.create per due date.
+    """
+    content_type = ContentType.objects.get_for_model(loan)
+    amount_per_payment = loan.amount / num_payments
+    for due_date in calculate_payment_dates(loan.start_date, num_payments):
+        Payment.objects.create(
+            content_type=content_type,
+            object_id=loan.loan_id,
+            due_date=due_date,
+            amount=amount_per_payment,
+            amount_paid=0,
+            status=Payment.STATUS_PENDING,
+        )
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark payment schedule generation: INSERT count and wall-clock "
+        "for row-by-row creates vs. the bulk schedule service. "
+        "All writes are rolled back."
+    )
+
+    STRATEGIES = [
+        ("row_by_row", create_row_by_row),
+        ("bulk_create", create_payment_schedule),
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", type=int, nargs="+", default=[1, 12, 120, 360],
+            help="Numbers of payments per loan to benchmark",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5,
+            help="Runs per (strategy, size); the best wall-clock is reported",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'payments':>8}  {'strategy':<12}  {'INSERTs':>7}  {'best ms':>9}")
+
+        for size in options["sizes"]:
+            for name, strategy in self.STRATEGIES:
+                inserts, best = self._run(strategy, size, options["repeat"])
+                self.stdout.write(f"{size:>8}  {name:<12}  {inserts:>7}  {best * 1000:>9.2f}")
+
+    def _run(self, strategy, num_payments, repeat):
+        inserts = 0
+        best = None
+
+        for _ in range(repeat):
+            with transaction.atomic():
+                loan = self._create_loan(num_payments)
+                ContentType.objects.get_for_model(loan)  # warm the cache
+
+                with CaptureQueriesContext(connection) as ctx:
+                    started = time.perf_counter()
+                    strategy(loan, num_payments)
+                    elapsed = time.perf_counter() - started
+
+                inserts = sum(
+                    1 for q in ctx.captured_queries if q["sql"].lstrip().upper().startswith("INSERT")
+                )
+                best = elapsed if best is None else min(best, elapsed)
+
+                # Discard everything written by this run
+                transaction.set_rollback(True)
+
+        return inserts, best
+
+    def _create_loan(self, num_payments):
+        suffix = uuid.uuid4().hex[:12]
+        user = User.objects.create(username=f"bench-trustee-{suffix}")
+        trustee = Trustee.objects.create(user=user, community="Benchmark")
+        borrower = Borrower.objects.create(
+            trustee=trustee,
+            id_number=suffix,
+            address="Benchmark",
+        )
+        return LoanChecks.objects.create(
+            borrower=borrower,
+            trustee=trustee,
+            amount=Decimal("36000.00"),
+            start_date=date(2025, 1, 1),
+            num_payments=num_payments,
+            status="ACTIVE",
+        )
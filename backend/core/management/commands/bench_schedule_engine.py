@@ -0,0 +1,79 @@
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
+from django.core.management.base import BaseCommand
+
+from core.payment_schedule import _cached_amounts, _cached_dates, calculate_schedules
+
+
+def legacy_schedule(start_date, num_payments, amount, charge_day):
+    """
+    Previous approach: one relativedelta per month, amount / num_payments per row.
+    """
+    due_dates = []
+    current_date = start_date
+    for _ in range(num_payments):
+        due_dates.append(current_date)
+        current_date = current_date + relativedelta(months=1)
+
+    amount_per_payment = amount / num_payments
+    return [(due_date, amount_per_payment) for due_date in due_dates]
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark of payment schedule computation for many loans: "
+        "legacy relativedelta loop vs. the schedule engine (cold and warm cache)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schedules", type=int, default=100_000,
+            help="Number of loan schedules to compute (default: 100,000)",
+        )
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        loans = self._loans(options["schedules"], options["seed"])
+        distinct = len(set(loans))
+        self.stdout.write(
+            f"{len(loans):,} schedules ({distinct:,} distinct), "
+            f"{sum(loan[1] for loan in loans):,} installments"
+        )
+
+        self._time("legacy loop", lambda: [legacy_schedule(*loan) for loan in loans])
+
+        _cached_dates.cache_clear()
+        _cached_amounts.cache_clear()
+        self._time("engine (cold cache)", lambda: calculate_schedules(loans))
+        self._time("engine (warm cache)", lambda: calculate_schedules(loans))
+
+        for name, cached in [("dates", _cached_dates), ("amounts", _cached_amounts)]:
+            info = cached.cache_info()
+            self.stdout.write(
+                f"{name} cache: {info.hits:,} hits, {info.misses:,} misses, {info.currsize:,} entries"
+            )
+
+    def _time(self, label, fn):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"{label:<22} {elapsed * 1000:>10.1f} ms")
+
+    def _loans(self, count, seed):
+        """
+        Realistic intake: start dates over two years, common terms and round amounts.
+        """
+        rng = random.Random(seed)
+        first_day = date(2024, 1, 1)
+        loans = []
+        for _ in range(count):
+            start_date = first_day + timedelta(days=rng.randint(0, 730))
+            num_payments = rng.choice([6, 10, 12, 18, 24, 36])
+            amount = Decimal(rng.randint(1, 60) * 500)
+            charge_day = rng.choice([None, start_date.day, 1, 10, 15])
+            loans.append((start_date, num_payments, amount, charge_day))
+        return loans
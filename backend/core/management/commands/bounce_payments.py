@@ -0,0 +1,25 @@
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.payment_settlement import bounce_payments
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark payments whose collection failed (returned check, refused standing-order "
+        "charge) as BOUNCED, even if settle_due_payments already settled them. Their "
+        "amount is owed again and their loans are flagged overdue."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("payment_ids", nargs="+", help="IDs of the bounced payments")
+
+    def handle(self, *args, **options):
+        try:
+            payment_ids = [uuid.UUID(value) for value in options["payment_ids"]]
+        except ValueError:
+            raise CommandError("Payment IDs must be UUIDs")
+
+        bounced = bounce_payments(payment_ids)
+        self.stdout.write(f"Bounced {bounced} payment(s)")
@@ -0,0 +1,157 @@
+import csv
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from core.loan_intake import create_loans
+from core.serializers import CreateLoanRequestSerializer
+
+
+# CSV header -> (section, field) of the CreateLoanRequestSerializer payload
+COLUMNS = {
+    "loan_type": (None, "loan_type"),
+    "trustee_id": (None, "trustee_id"),
+    "id_number": ("borrower", "id_number"),
+    "first_name": ("borrower", "first_name"),
+    "last_name": ("borrower", "last_name"),
+    "phone": ("borrower", "phone"),
+    "email": ("borrower", "email"),
+    "address": ("borrower", "address"),
+    "amount": ("loan", "amount"),
+    "num_payments": ("loan", "num_payments"),
+    "start_date": ("loan", "start_date"),
+}
+
+REQUIRED_COLUMNS = {
+    "loan_type", "trustee_id", "id_number", "address",
+    "amount", "num_payments", "start_date",
+}
+
+
+def row_to_payload(row):
+    """
+    Converts a flat CSV row into the nested POST /api/loans/ payload.
+    Missing optional columns are left out.
+    """
+    payload = {"borrower": {}, "loan": {}}
+    for column, (section, field) in COLUMNS.items():
+        if column not in row:
+            continue
+        value = (row[column] or "").strip()
+        if section:
+            payload[section][field] = value
+        else:
+            payload[field] = value
+    return payload
+
+
+def numbered_rows(reader):
+    """
+    Yields (line, row) for a csv.DictReader: `line` is the file line the
+    row starts on (quoted fields may span several lines).
+    """
+    start = reader.line_num + 1
+    for row in reader:
+        yield start, row
+        start = reader.line_num + 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Import historical loans from a CSV file (UTF-8, optional BOM as written by Excel). "
+        "Rows are streamed in chunks, validated like POST /api/loans/, and created in bulk "
+        "with their payment schedules. Invalid rows are reported and skipped.\n"
+        "Columns: " + ", ".join(COLUMNS)
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file to import")
+        parser.add_argument(
+            "--chunk-size", type=int, default=500,
+            help="Rows validated and written per transaction (default: 500)",
+        )
+        parser.add_argument("--delimiter", default=",")
+
+    def handle(self, *args, **options):
+        try:
+            csv_file = open(options["path"], newline="", encoding="utf-8-sig")
+        except OSError as exc:
+            raise CommandError(f"Cannot open {options['path']}: {exc}")
+
+        started = time.perf_counter()
+        rows_read = 0
+        created = 0
+        failed = 0
+
+        with csv_file:
+            reader = csv.DictReader(csv_file, delimiter=options["delimiter"])
+            missing = REQUIRED_COLUMNS - set(reader.fieldnames or [])
+            if missing:
+                raise CommandError(f"Missing required column(s): {', '.join(sorted(missing))}")
+
+            rows = numbered_rows(reader)
+            while True:
+                chunk = list(islice(rows, options["chunk_size"]))
+                if not chunk:
+                    break
+                rows_read += len(chunk)
+
+                chunk_created, chunk_errors = self._import_chunk(chunk)
+                created += chunk_created
+                failed += len(chunk_errors)
+                for line, errors in chunk_errors:
+                    self.stderr.write(f"line {line}: {errors}")
+
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{rows_read:,} rows read, {created:,} loans created, {failed:,} errors "
+                    f"({rows_read / elapsed:,.0f} rows/s)"
+                )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {created:,} loans created, {failed:,} rows rejected, "
+            f"{rows_read:,} rows in {elapsed:.1f}s"
+        ))
+
+    def _import_chunk(self, chunk):
+        """
+        Returns (loans created, [(line, errors), ...]) for one chunk of rows.
+        """
+        errors = []
+        valid = []
+        for line, row in chunk:
+            serializer = CreateLoanRequestSerializer(data=row_to_payload(row))
+            if serializer.is_valid():
+                valid.append((line, serializer.validated_data))
+            else:
+                errors.append((line, serializer.errors))
+
+        if not valid:
+            return 0, errors
+
+        try:
+            loans, item_errors = create_loans([data for _, data in valid])
+        except DatabaseError:
+            # The chunk's transaction was rolled back: retry its rows one by
+            # one, so only the rows the database rejects are reported
+            loans = []
+            item_errors = {}
+            for index, (_, data) in enumerate(valid):
+                try:
+                    row_loans, row_errors = create_loans([data])
+                except DatabaseError as exc:
+                    loans.append(None)
+                    item_errors[index] = {"detail": [str(exc)]}
+                else:
+                    loans += row_loans
+                    if row_errors:
+                        item_errors[index] = row_errors[0]
+
+        for index, item_error in item_errors.items():
+            errors.append((valid[index][0], item_error))
+        errors.sort(key=lambda error: error[0])
+
+        return sum(1 for loan in loans if loan is not None), errors
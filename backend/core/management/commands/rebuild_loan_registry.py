@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.loan_registry import LoanIdCollision, rebuild_registry
+
+
+class Command(BaseCommand):
+    help = "Re-create the LoanRegistry rows from the LoanChecks and LoanStandingOrder tables."
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                total = rebuild_registry()
+        except LoanIdCollision as exc:
+            raise CommandError(f"{exc}: give one of the two loans a new loan_id")
+        self.stdout.write(f"Registered {total} loan(s)")
@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.loan_balances import reconcile_loan_balances
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the denormalized balance columns (paid_amount, outstanding_amount, "
+        "next_due_date, payments_remaining) of every loan and registry row from the "
+        "payments table. Safe to run at any time."
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        updated = reconcile_loan_balances()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"Reconciled balances of {updated} loan(s) in {elapsed:.2f}s")
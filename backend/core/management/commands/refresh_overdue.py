@@ -0,0 +1,48 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import LoanRegistry
+from core.overdue import overdue_cutoff, refresh_overdue_flags
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute which ACTIVE loans are overdue: loans with a BOUNCED payment, or a "
+        "PENDING payment due more than OVERDUE_GRACE_DAYS before the given date "
+        "(default: today). "
+        "One set-based UPDATE; intended to run daily from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            dest="as_of",
+            help="Evaluate overdue payments as of this date (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--grace-days",
+            type=int,
+            default=None,
+            help=f"Grace period in days (default: OVERDUE_GRACE_DAYS = {settings.OVERDUE_GRACE_DAYS})",
+        )
+
+    def handle(self, *args, **options):
+        as_of = date.today()
+        if options["as_of"]:
+            try:
+                as_of = date.fromisoformat(options["as_of"])
+            except ValueError:
+                raise CommandError("--date must be in YYYY-MM-DD format")
+        if options["grace_days"] is not None and options["grace_days"] < 0:
+            raise CommandError("--grace-days must not be negative")
+
+        written = refresh_overdue_flags(as_of, options["grace_days"])
+        overdue = LoanRegistry.objects.filter(status="ACTIVE", overdue_since__isnull=False).count()
+        cutoff = overdue_cutoff(as_of, options["grace_days"])
+
+        self.stdout.write(
+            f"{overdue} overdue loan(s) with payments due before {cutoff.isoformat()} "
+            f"({written} registry row(s) updated)"
+        )
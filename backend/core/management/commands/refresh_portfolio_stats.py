@@ -0,0 +1,30 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.portfolio_stats import refresh_portfolio_statistics
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the portfolio statistics summary table served by "
+        "/api/dashboard/portfolio/. Intended to run periodically from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            dest="today",
+            help="Compute due / overdue figures as of this date (YYYY-MM-DD)",
+        )
+
+    def handle(self, *args, **options):
+        today = None
+        if options["today"]:
+            try:
+                today = date.fromisoformat(options["today"])
+            except ValueError:
+                raise CommandError("--date must be in YYYY-MM-DD format")
+
+        rows = refresh_portfolio_statistics(today)
+        self.stdout.write(f"Wrote {rows} portfolio statistic row(s)")
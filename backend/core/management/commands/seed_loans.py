@@ -0,0 +1,65 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.loan_seeding import DEFAULT_CHUNK_SIZE, seed_borrowers, seed_loans, seed_trustees
+from core.models import Borrower
+from core.portfolio_stats import refresh_portfolio_statistics
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate realistic synthetic data for load tests and benchmarks: trustees, "
+        "borrowers and loans of both types with their payment schedules (past "
+        "installments mostly paid, a few loans overdue). Everything is bulk-created; "
+        "the portfolio statistics are refreshed at the end. "
+        "Example: manage.py seed_loans --borrowers 2000 --loans 10000"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--borrowers", type=int, default=100,
+            help="Number of borrowers to create (0: spread the loans over the existing borrowers)",
+        )
+        parser.add_argument("--loans", type=int, default=1000, help="Number of loans to create")
+        parser.add_argument(
+            "--trustees", type=int, default=None,
+            help="Number of trustees to create (default: one per 50 borrowers)",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=None,
+            help="Random seed, for reproducible data sets",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=DEFAULT_CHUNK_SIZE,
+            help="Loans (and borrowers) written per transaction",
+        )
+
+    def handle(self, *args, **options):
+        if options["borrowers"] < 0 or options["loans"] < 0:
+            raise CommandError("--borrowers and --loans must not be negative")
+
+        rng = random.Random(options["seed"])
+        started = time.perf_counter()
+
+        if options["borrowers"]:
+            trustees_count = options["trustees"] or max(1, options["borrowers"] // 50)
+            trustees = seed_trustees(trustees_count, rng)
+            borrowers = seed_borrowers(options["borrowers"], trustees, rng, options["batch_size"])
+            self.stdout.write(f"Created {len(trustees):,} trustees and {len(borrowers):,} borrowers")
+        else:
+            borrowers = list(Borrower.objects.only("borrower_id", "trustee_id"))
+            if not borrowers and options["loans"]:
+                raise CommandError("No borrowers to attach the loans to: use --borrowers N")
+
+        if options["loans"]:
+            self.stdout.write(f"Creating {options['loans']:,} loans ...")
+            payments = seed_loans(
+                borrowers, options["loans"], rng,
+                chunk_size=options["batch_size"], stdout=self.stdout,
+            )
+            refresh_portfolio_statistics()
+            self.stdout.write(f"Created {options['loans']:,} loans and {payments:,} payments")
+
+        self.stdout.write(self.style.SUCCESS(f"Done in {time.perf_counter() - started:.1f}s"))
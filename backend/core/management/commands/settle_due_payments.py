@@ -0,0 +1,31 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.payment_settlement import settle_due_payments
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark all PENDING payments due on or before the given date (default: today) "
+        "as PAID. Idempotent; intended to run daily from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            dest="as_of",
+            help="Settle payments due on or before this date (YYYY-MM-DD)",
+        )
+
+    def handle(self, *args, **options):
+        as_of = timezone.localdate()
+        if options["as_of"]:
+            try:
+                as_of = date.fromisoformat(options["as_of"])
+            except ValueError:
+                raise CommandError("--date must be in YYYY-MM-DD format")
+
+        settled = settle_due_payments(as_of)
+        self.stdout.write(f"Settled {settled} payment(s) due on or before {as_of.isoformat()}")
@@ -0,0 +1,152 @@
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+
+
+# ------------------------------------
+#   Operation counters (exported by GET /metrics, see core.metrics_views)
+#   Kept in the "metrics" cache (settings.CACHES), like the request and
+#   dashboard cache counters: on Redis the counts of all web processes and
+#   cron jobs add up; on the local-memory cache each process only sees its
+#   own.
+# ------------------------------------
+
+metrics_cache = ConnectionProxy(caches, "metrics")
+
+METRICS_PREFIX = "metrics"
+
+LOANS_CREATED_KEY = f"{METRICS_PREFIX}:loans-created"
+PAYMENTS_GENERATED_KEY = f"{METRICS_PREFIX}:payments-generated"
+PAYMENTS_SETTLED_KEY = f"{METRICS_PREFIX}:payments-settled"
+JOB_KEY = f"{METRICS_PREFIX}:job"
+
+# Timed background jobs (see time_job)
+JOBS = ("settle_due_payments", "refresh_overdue_flags", "refresh_portfolio_stats")
+
+# Upper bounds (seconds) of the job duration histogram buckets; the last bucket is +Inf
+JOB_BUCKETS_SECONDS = (0.1, 0.5, 1, 5, 10, 30, 60, 300)
+JOB_BUCKET_NAMES = [str(bound) for bound in JOB_BUCKETS_SECONDS] + ["inf"]
+
+
+def incr(key, delta=1):
+    """
+    Adds `delta` to the counter `key` and returns its new value.
+    """
+    # incr() is atomic on shared backends (Redis); the key is created on first use
+    try:
+        return metrics_cache.incr(key, delta)
+    except ValueError:
+        if metrics_cache.add(key, delta, timeout=None):
+            return delta
+        return metrics_cache.incr(key, delta)
+
+
+# ------------------------------------
+#   Buffered counters
+#   Hot paths (every request, every dashboard read) only add to an
+#   in-process buffer; it is written to the cache by flush_metrics(), at
+#   most every METRICS_FLUSH_SECONDS, with one incr() per touched key.
+#   Readers flush first, so a process always sees its own counts.
+# ------------------------------------
+
+_buffer = Counter()
+_buffer_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def buffer_incr(key, delta=1):
+    with _buffer_lock:
+        _buffer[key] += delta
+
+
+def flush_due():
+    return time.monotonic() - _last_flush >= settings.METRICS_FLUSH_SECONDS
+
+
+def flush_metrics():
+    """
+    Writes the buffered counters to the cache and empties the buffer.
+    """
+    global _buffer, _last_flush
+    with _buffer_lock:
+        pending, _buffer = _buffer, Counter()
+        _last_flush = time.monotonic()
+
+    for key, delta in pending.items():
+        if delta:
+            incr(key, delta)
+
+
+def count_loans_created(loan_type, count=1):
+    incr(f"{LOANS_CREATED_KEY}:{loan_type}", count)
+
+
+def count_payments_generated(count):
+    if count:
+        incr(PAYMENTS_GENERATED_KEY, count)
+
+
+def count_payments_settled(count):
+    if count:
+        incr(PAYMENTS_SETTLED_KEY, count)
+
+
+@contextmanager
+def time_job(job):
+    """
+    Records the duration of one run of `job` (one of JOBS) in its histogram.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        bucket = next(
+            (name for bound, name in zip(JOB_BUCKETS_SECONDS, JOB_BUCKET_NAMES) if duration <= bound),
+            JOB_BUCKET_NAMES[-1],
+        )
+        incr(f"{JOB_KEY}:{job}:runs")
+        incr(f"{JOB_KEY}:{job}:duration_us", int(duration * 1_000_000))
+        incr(f"{JOB_KEY}:{job}:bucket:{bucket}")
+
+
+def operation_counters(loan_types):
+    """
+    Returns the current counters: loans created per type, payments generated
+    and settled, and per job the number of runs, their total duration
+    (seconds) and the cumulative duration histogram [(upper bound, count)].
+    """
+    keys = (
+        [f"{LOANS_CREATED_KEY}:{loan_type}" for loan_type in loan_types]
+        + [PAYMENTS_GENERATED_KEY, PAYMENTS_SETTLED_KEY]
+        + [f"{JOB_KEY}:{job}:{name}" for job in JOBS for name in ("runs", "duration_us")]
+        + [f"{JOB_KEY}:{job}:bucket:{name}" for job in JOBS for name in JOB_BUCKET_NAMES]
+    )
+    values = metrics_cache.get_many(keys)
+
+    jobs = {}
+    for job in JOBS:
+        histogram = []
+        cumulative = 0
+        for bound, name in zip(list(JOB_BUCKETS_SECONDS) + ["+Inf"], JOB_BUCKET_NAMES):
+            cumulative += values.get(f"{JOB_KEY}:{job}:bucket:{name}", 0)
+            histogram.append((bound, cumulative))
+        jobs[job] = {
+            "runs": values.get(f"{JOB_KEY}:{job}:runs", 0),
+            "duration_seconds": values.get(f"{JOB_KEY}:{job}:duration_us", 0) / 1_000_000,
+            "histogram": histogram,
+        }
+
+    return {
+        "loans_created": {
+            loan_type: values.get(f"{LOANS_CREATED_KEY}:{loan_type}", 0) for loan_type in loan_types
+        },
+        "payments_generated": values.get(PAYMENTS_GENERATED_KEY, 0),
+        "payments_settled": values.get(PAYMENTS_SETTLED_KEY, 0),
+        "jobs": jobs,
+    }
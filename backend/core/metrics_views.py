@@ -0,0 +1,136 @@
+from django.db.models import Count
+from django.http import HttpResponse
+
+from core.dashboard_cache import dashboard_cache_stats
+from core.metrics import operation_counters
+from core.models import LoanRegistry
+from core.request_metrics import route_counters
+
+
+# ------------------------------------
+#   GET /metrics - Prometheus text exposition format
+#   Request metrics come from RequestMetricsMiddleware, operation counters
+#   from core.metrics, loan gauges from one GROUP BY over the registry.
+# ------------------------------------
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LOAN_TYPES = [loan_type for loan_type, _ in LoanRegistry.LOAN_TYPE_CHOICES]
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class Exposition:
+    """
+    Builds the text body: one HELP / TYPE header per metric family, then
+    its samples.
+    """
+
+    def __init__(self):
+        self.lines = []
+
+    def family(self, name, metric_type, help_text):
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {metric_type}")
+
+    def sample(self, name, value, **labels):
+        self.lines.append(f"{name}{_labels(**labels)} {value}")
+
+    def histogram(self, name, buckets, total, count, **labels):
+        for bound, cumulative in buckets:
+            self.sample(f"{name}_bucket", cumulative, le=bound, **labels)
+        self.sample(f"{name}_sum", total, **labels)
+        self.sample(f"{name}_count", count, **labels)
+
+    def render(self):
+        return "\n".join(self.lines) + "\n"
+
+
+def _request_metrics(out):
+    routes = route_counters()
+
+    def labels(row):
+        method, _, route = row["route"].partition(" ")
+        return {"view": row["view"], "method": method, "route": route}
+
+    out.family("gemach_http_request_duration_seconds", "histogram", "Request wall time per view.")
+    for row in routes:
+        out.histogram(
+            "gemach_http_request_duration_seconds",
+            [("+Inf" if bound == "+Inf" else bound / 1000, count) for bound, count in row["histogram"]],
+            row["counters"]["duration_us"] / 1_000_000,
+            row["counters"]["requests"],
+            **labels(row),
+        )
+
+    out.family("gemach_http_request_errors_total", "counter", "Requests answered with a 5xx status.")
+    for row in routes:
+        out.sample("gemach_http_request_errors_total", row["counters"]["errors"], **labels(row))
+
+    out.family("gemach_db_queries_total", "counter", "SQL queries run by requests.")
+    for row in routes:
+        out.sample("gemach_db_queries_total", row["counters"]["queries"], **labels(row))
+
+    out.family("gemach_db_query_duration_seconds_total", "counter", "Time spent in SQL by requests.")
+    for row in routes:
+        out.sample("gemach_db_query_duration_seconds_total", row["counters"]["sql_us"] / 1_000_000, **labels(row))
+
+    out.family("gemach_http_render_duration_seconds_total", "counter", "Time spent serializing responses.")
+    for row in routes:
+        out.sample("gemach_http_render_duration_seconds_total", row["counters"]["render_us"] / 1_000_000, **labels(row))
+
+
+def _operation_metrics(out):
+    counters = operation_counters(LOAN_TYPES)
+
+    out.family("gemach_loans_created_total", "counter", "Loans created, per loan type.")
+    for loan_type, count in counters["loans_created"].items():
+        out.sample("gemach_loans_created_total", count, loan_type=loan_type)
+
+    out.family("gemach_payments_generated_total", "counter", "Payments created by payment schedules.")
+    out.sample("gemach_payments_generated_total", counters["payments_generated"])
+
+    out.family("gemach_payments_settled_total", "counter", "Payments settled by settle_due_payments.")
+    out.sample("gemach_payments_settled_total", counters["payments_settled"])
+
+    out.family("gemach_job_duration_seconds", "histogram", "Background job run time.")
+    for job, stats in counters["jobs"].items():
+        out.histogram("gemach_job_duration_seconds", stats["histogram"], stats["duration_seconds"], stats["runs"], job=job)
+
+    stats = dashboard_cache_stats()
+    lookups = stats["hits"] + stats["misses"]
+    out.family("gemach_dashboard_cache_hits_total", "counter", "Dashboard summary cache hits.")
+    out.sample("gemach_dashboard_cache_hits_total", stats["hits"])
+    out.family("gemach_dashboard_cache_misses_total", "counter", "Dashboard summary cache misses.")
+    out.sample("gemach_dashboard_cache_misses_total", stats["misses"])
+    out.family("gemach_dashboard_cache_hit_ratio", "gauge", "Dashboard summary cache hit ratio.")
+    out.sample("gemach_dashboard_cache_hit_ratio", round(stats["hits"] / lookups, 4) if lookups else 0)
+
+
+def _loan_metrics(out):
+    rows = LoanRegistry.objects.values("loan_type", "status").annotate(count=Count("loan_id")).order_by()
+
+    out.family("gemach_loans", "gauge", "Loans per type and status.")
+    for row in rows:
+        out.sample("gemach_loans", row["count"], loan_type=row["loan_type"], status=row["status"])
+
+
+def metrics_view(request):
+    """
+    GET /metrics
+    Scraped by Prometheus; nothing is computed per scrape except the loan
+    gauges (one aggregate query).
+    """
+    out = Exposition()
+    _request_metrics(out)
+    _operation_metrics(out)
+    _loan_metrics(out)
+    return HttpResponse(out.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,50 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+# (index name, table, column) for every column searched by ?search= on /api/loans/.
+# Indexed as UPPER(column::text) to match the SQL Django emits for __icontains.
+SEARCH_TRIGRAM_INDEXES = [
+    ("core_borrower_first_name_trgm", "core_borrower", "first_name"),
+    ("core_borrower_last_name_trgm", "core_borrower", "last_name"),
+    ("core_borrower_phone_trgm", "core_borrower", "phone"),
+    ("core_borrower_email_trgm", "core_borrower", "email"),
+    ("core_trustee_community_trgm", "core_trustee", "community"),
+    ("core_userprofile_phone_trgm", "core_userprofile", "phone"),
+    ("core_auth_user_first_name_trgm", "auth_user", "first_name"),
+    ("core_auth_user_last_name_trgm", "auth_user", "last_name"),
+    ("core_auth_user_email_trgm", "auth_user", "email"),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # GIN trigram indexes are PostgreSQL-only
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for index_name, table, column in SEARCH_TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{index_name}" '
+            f'ON "{table}" USING gin (UPPER("{column}"::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for index_name, _table, _column in SEARCH_TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{index_name}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0004_payment'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
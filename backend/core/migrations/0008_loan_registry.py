@@ -0,0 +1,82 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_registry(apps, schema_editor):
+    LoanRegistry = apps.get_model('core', 'LoanRegistry')
+    loan_models = [
+        ('checks', apps.get_model('core', 'LoanChecks')),
+        ('standing_order', apps.get_model('core', 'LoanStandingOrder')),
+    ]
+
+    # The registry has one row per loan_id: ids shared by both loan tables
+    # must be fixed by hand before migrating
+    shared = list(
+        loan_models[0][1].objects
+        .filter(loan_id__in=loan_models[1][1].objects.values('loan_id'))
+        .values_list('loan_id', flat=True)[:10]
+    )
+    if shared:
+        raise RuntimeError(
+            'Cannot build the loan registry: these loan_ids are used by both a LoanChecks and '
+            'a LoanStandingOrder row (give one of each pair a new loan_id): '
+            + ', '.join(str(loan_id) for loan_id in shared)
+        )
+
+    for loan_type, model in loan_models:
+        LoanRegistry.objects.bulk_create(
+            [
+                LoanRegistry(
+                    loan_id=loan.loan_id,
+                    loan_type=loan_type,
+                    status=loan.status,
+                    amount=loan.amount,
+                    start_date=loan.start_date,
+                    borrower_id=loan.borrower_id,
+                    trustee_id=loan.trustee_id,
+                )
+                for loan in model.objects.iterator(chunk_size=2000)
+            ],
+            batch_size=2000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_payment_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoanRegistry',
+            fields=[
+                ('loan_id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('loan_type', models.CharField(choices=[('checks', "צ'קים"), ('standing_order', 'הוראת קבע')], max_length=20, verbose_name='סוג הלוואה')),
+                ('status', models.CharField(choices=[('PENDING', 'ממתין לאישור'), ('ACTIVE', 'פעיל'), ('PAID', 'שולם'), ('REJECTED', 'נדחה')], max_length=20, verbose_name='סטטוס')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='סכום ההלוואה')),
+                ('start_date', models.DateField(verbose_name='תאריך התחלה')),
+            ],
+            options={
+                'verbose_name': 'רשומת הלוואה',
+                'verbose_name_plural': 'מרשם הלוואות',
+            },
+        ),
+        migrations.AddField(
+            model_name='loanregistry',
+            name='borrower',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='registry_loans', to='core.borrower', verbose_name='לווה'),
+        ),
+        migrations.AddField(
+            model_name='loanregistry',
+            name='trustee',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='registry_loans', to='core.trustee', verbose_name='נאמן מפקח'),
+        ),
+        migrations.AddIndex(
+            model_name='loanregistry',
+            index=models.Index(fields=['status', 'start_date', 'loan_id'], name='loanregistry_keyset_idx'),
+        ),
+        migrations.RunPython(backfill_registry, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_loan_registry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('total', 'Total'), ('loan_type', 'Loan type'), ('trustee', 'Trustee'), ('community', 'Community')], max_length=20)),
+                ('key', models.CharField(blank=True, max_length=100)),
+                ('label', models.CharField(blank=True, max_length=255)),
+                ('loans_count', models.IntegerField(default=0)),
+                ('principal_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('collected_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('outstanding_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('due_next_30_days_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('overdue_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('overdue_payments_count', models.IntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'key'), name='portfolio_statistic_unique_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_portfolio_statistics'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='loanregistry',
+            index=models.Index(fields=['status', 'amount', 'loan_id'], name='loanregistry_amount_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loanregistry',
+            index=models.Index(fields=['trustee', 'status', 'start_date', 'loan_id'], name='loanregistry_trustee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trustee',
+            index=models.Index(fields=['community'], name='trustee_community_idx'),
+        ),
+    ]
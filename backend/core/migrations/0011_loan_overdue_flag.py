@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_loan_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loanregistry',
+            name='overdue_since',
+            field=models.DateField(blank=True, null=True, verbose_name='באיחור מאז'),
+        ),
+        migrations.AddIndex(
+            model_name='loanregistry',
+            index=models.Index(condition=models.Q(('overdue_since__isnull', False)), fields=['status', 'start_date', 'loan_id'], name='loanregistry_overdue_idx'),
+        ),
+    ]
@@ -0,0 +1,115 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:14
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, F, Min, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_balances(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    Payment = apps.get_model('core', 'Payment')
+    LoanRegistry = apps.get_model('core', 'LoanRegistry')
+    loan_models = [
+        ('checks', apps.get_model('core', 'LoanChecks')),
+        ('standing_order', apps.get_model('core', 'LoanStandingOrder')),
+    ]
+
+    for loan_type, model in loan_models:
+        content_type = ContentType.objects.get_for_model(model)
+        payments = (
+            Payment.objects
+            .filter(content_type=content_type, object_id=OuterRef('loan_id'))
+            .order_by()
+            .values('object_id')
+        )
+        pending = payments.filter(status='PENDING')
+        paid = Coalesce(
+            Subquery(payments.annotate(total=Sum('amount_paid')).values('total')),
+            Value(Decimal('0')),
+            output_field=models.DecimalField(max_digits=10, decimal_places=2),
+        )
+        expressions = {
+            'paid_amount': paid,
+            'outstanding_amount': F('amount') - paid,
+            'next_due_date': Subquery(pending.annotate(first_due=Min('due_date')).values('first_due')),
+            'payments_remaining': Coalesce(
+                Subquery(pending.annotate(remaining=Count('id')).values('remaining')),
+                Value(0),
+            ),
+        }
+        model.objects.update(**expressions)
+        LoanRegistry.objects.filter(loan_type=loan_type).update(**expressions)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('core', '0011_loan_overdue_flag'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loanchecks',
+            name='next_due_date',
+            field=models.DateField(blank=True, editable=False, null=True, verbose_name='מועד התשלום הבא'),
+        ),
+        migrations.AddField(
+            model_name='loanchecks',
+            name='outstanding_amount',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=10, verbose_name='יתרה לתשלום'),
+        ),
+        migrations.AddField(
+            model_name='loanchecks',
+            name='paid_amount',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=10, verbose_name='סכום ששולם'),
+        ),
+        migrations.AddField(
+            model_name='loanchecks',
+            name='payments_remaining',
+            field=models.IntegerField(default=0, editable=False, verbose_name='תשלומים שנותרו'),
+        ),
+        migrations.AddField(
+            model_name='loanregistry',
+            name='next_due_date',
+            field=models.DateField(blank=True, editable=False, null=True, verbose_name='מועד התשלום הבא'),
+        ),
+        migrations.AddField(
+            model_name='loanregistry',
+            name='outstanding_amount',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=10, verbose_name='יתרה לתשלום'),
+        ),
+        migrations.AddField(
+            model_name='loanregistry',
+            name='paid_amount',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=10, verbose_name='סכום ששולם'),
+        ),
+        migrations.AddField(
+            model_name='loanregistry',
+            name='payments_remaining',
+            field=models.IntegerField(default=0, editable=False, verbose_name='תשלומים שנותרו'),
+        ),
+        migrations.AddField(
+            model_name='loanstandingorder',
+            name='next_due_date',
+            field=models.DateField(blank=True, editable=False, null=True, verbose_name='מועד התשלום הבא'),
+        ),
+        migrations.AddField(
+            model_name='loanstandingorder',
+            name='outstanding_amount',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=10, verbose_name='יתרה לתשלום'),
+        ),
+        migrations.AddField(
+            model_name='loanstandingorder',
+            name='paid_amount',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=10, verbose_name='סכום ששולם'),
+        ),
+        migrations.AddField(
+            model_name='loanstandingorder',
+            name='payments_remaining',
+            field=models.IntegerField(default=0, editable=False, verbose_name='תשלומים שנותרו'),
+        ),
+        migrations.RunPython(backfill_balances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_loan_balance_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='borrower',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='עודכן לאחרונה'),
+        ),
+        migrations.AddField(
+            model_name='loanchecks',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='עודכן לאחרונה'),
+        ),
+        migrations.AddField(
+            model_name='loanregistry',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='עודכן לאחרונה'),
+        ),
+        migrations.AddField(
+            model_name='loanstandingorder',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='עודכן לאחרונה'),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='trustee',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='עודכן לאחרונה'),
+        ),
+    ]
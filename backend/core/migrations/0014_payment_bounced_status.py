@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_updated_at_columns'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='payment',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('PAID', 'Paid'), ('BOUNCED', 'Bounced')], default='PENDING', max_length=10),
+        ),
+    ]
@@ -35,6 +35,8 @@ class Trustee(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='trustee_profile', verbose_name="משתמש מקושר")
     community = models.CharField(max_length=100, verbose_name="קהילה")
     notes = models.TextField(blank=True, null=True, verbose_name="הערות")
+    # Version of the row for conditional GETs (see core.conditional_get)
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="עודכן לאחרונה")
 
     def __str__(self):
         return f"Trustee: {self.user.username} - {self.community}"
@@ -42,6 +44,10 @@ class Trustee(models.Model):
     class Meta:
         verbose_name = "נאמן"
         verbose_name_plural = "נאמנים"
+        indexes = [
+            # ?community= filter of the unified loan list
+            models.Index(fields=["community"], name="trustee_community_idx"),
+        ]
 
 # --- 4. borrower Model ---
 class Borrower(models.Model):
@@ -55,6 +61,8 @@ class Borrower(models.Model):
     email = models.EmailField(null=True, blank=True)
     address = models.CharField(max_length=255, verbose_name="כתובת")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="תאריך יצירה")
+    # Version of the row for conditional GETs (see core.conditional_get)
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="עודכן לאחרונה")
 
     def __str__(self):
         return f"Borrower: {self.id_number}"
@@ -80,6 +88,28 @@ class Loan(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING', verbose_name="סטטוס")
     form_file = models.FileField(upload_to='loan_forms/', blank=True, null=True, verbose_name="קובץ טופס חתום")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="תאריך יצירה")
+    # Version of the row for conditional GETs (see core.conditional_get);
+    # set explicitly by bulk UPDATEs, which skip auto_now
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="עודכן לאחרונה")
+
+    # Balance derived from the loan's payments, kept up to date by every
+    # payment write (see core.loan_balances); never edited directly
+    paid_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0, editable=False, verbose_name="סכום ששולם")
+    outstanding_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0, editable=False, verbose_name="יתרה לתשלום")
+    next_due_date = models.DateField(null=True, blank=True, editable=False, verbose_name="מועד התשלום הבא")
+    payments_remaining = models.IntegerField(default=0, editable=False, verbose_name="תשלומים שנותרו")
+
+    BALANCE_FIELDS = ("paid_amount", "outstanding_amount", "next_due_date", "payments_remaining")
+
+    def save(self, *args, **kwargs):
+        # Saving a loaded loan never writes the balance columns, so a stale
+        # instance cannot overwrite values refreshed in SQL
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.BALANCE_FIELDS
+            ]
+        super().save(*args, **kwargs)
 
     class Meta:
         abstract = True
@@ -103,6 +133,61 @@ class LoanStandingOrder(Loan):
         verbose_name = "הלוואה (הוראת קבע)"
         verbose_name_plural = "הלוואות (הוראת קבע)"
 
+# --- 6.1 Loan Registry ---
+class LoanRegistry(models.Model):
+    """
+    One row per loan of any type (same loan_id as the LoanChecks /
+    LoanStandingOrder row), kept in sync by core.signals / core.loan_registry.
+    Lets a loan_id be resolved, and the unified list be queried, from one table.
+    """
+    LOAN_TYPE_CHECKS = "checks"
+    LOAN_TYPE_STANDING_ORDER = "standing_order"
+
+    LOAN_TYPE_CHOICES = [
+        (LOAN_TYPE_CHECKS, "צ'קים"),
+        (LOAN_TYPE_STANDING_ORDER, "הוראת קבע"),
+    ]
+
+    loan_id = models.UUIDField(primary_key=True, editable=False)
+    loan_type = models.CharField(max_length=20, choices=LOAN_TYPE_CHOICES, verbose_name="סוג הלוואה")
+    status = models.CharField(max_length=20, choices=Loan.STATUS_CHOICES, verbose_name="סטטוס")
+    amount = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="סכום ההלוואה")
+    start_date = models.DateField(verbose_name="תאריך התחלה")
+    borrower = models.ForeignKey(Borrower, on_delete=models.CASCADE, related_name='registry_loans', verbose_name="לווה")
+    trustee = models.ForeignKey(Trustee, on_delete=models.SET_NULL, null=True, related_name='registry_loans', verbose_name="נאמן מפקח")
+    # Due date of the oldest PENDING payment past the grace period (ACTIVE
+    # loans only); null when the loan is not overdue. See core.overdue.
+    overdue_since = models.DateField(null=True, blank=True, verbose_name="באיחור מאז")
+    # Copy of the loan's balance columns (see core.loan_balances)
+    paid_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0, editable=False, verbose_name="סכום ששולם")
+    outstanding_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0, editable=False, verbose_name="יתרה לתשלום")
+    next_due_date = models.DateField(null=True, blank=True, editable=False, verbose_name="מועד התשלום הבא")
+    payments_remaining = models.IntegerField(default=0, editable=False, verbose_name="תשלומים שנותרו")
+    # Bumped by every write to the loan, its balance or its overdue flag:
+    # the version of the loan in list / detail responses
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="עודכן לאחרונה")
+
+    def __str__(self):
+        return f"{self.loan_type}: {self.loan_id}"
+
+    class Meta:
+        verbose_name = "רשומת הלוואה"
+        verbose_name_plural = "מרשם הלוואות"
+        indexes = [
+            # Keyset pagination of the unified loan list
+            models.Index(fields=["status", "start_date", "loan_id"], name="loanregistry_keyset_idx"),
+            # ?ordering=amount / ?min_amount= / ?max_amount=
+            models.Index(fields=["status", "amount", "loan_id"], name="loanregistry_amount_idx"),
+            # ?trustee= (and ?community=, resolved to trustee ids)
+            models.Index(fields=["trustee", "status", "start_date", "loan_id"], name="loanregistry_trustee_idx"),
+            # ?overdue=true and the overdue dashboard count (overdue loans only)
+            models.Index(
+                fields=["status", "start_date", "loan_id"],
+                condition=models.Q(overdue_since__isnull=False),
+                name="loanregistry_overdue_idx",
+            ),
+        ]
+
 
 # --- 7. Payment Model ---
 import uuid
@@ -115,12 +200,19 @@ from django.contrib.contenttypes.models import ContentType
 class Payment(models.Model):
     STATUS_PENDING = "PENDING"
     STATUS_PAID = "PAID"
+    # Collection failed (check returned, standing-order charge refused):
+    # still owed, never auto-settled, makes the loan overdue
+    STATUS_BOUNCED = "BOUNCED"
 
     STATUS_CHOICES = [
         (STATUS_PENDING, "Pending"),
         (STATUS_PAID, "Paid"),
+        (STATUS_BOUNCED, "Bounced"),
     ]
 
+    # Payments still owed
+    UNPAID_STATUSES = [STATUS_PENDING, STATUS_BOUNCED]
+
     id = models.UUIDField(
         primary_key=True,
         default=uuid.uuid4,
@@ -167,8 +259,65 @@ class Payment(models.Model):
         blank=True,
     )
 
+    # Set explicitly by bulk UPDATEs, which skip auto_now
+    updated_at = models.DateTimeField(auto_now=True)
+
     class Meta:
         ordering = ["due_date"]
+        indexes = [
+            # Payments of one loan, in schedule order (LoanPaymentsView)
+            models.Index(
+                fields=["content_type", "object_id", "due_date"],
+                name="payment_loan_due_idx",
+            ),
+            # Due PENDING payments (settle_due_payments)
+            models.Index(
+                fields=["due_date"],
+                name="payment_pending_due_idx",
+                condition=models.Q(status="PENDING"),
+            ),
+        ]
 
     def __str__(self):
         return f"Payment {self.id} | Loan {self.object_id} | {self.status}"
+
+
+# --- 8. Portfolio Statistics (summary table) ---
+class PortfolioStatistic(models.Model):
+    """
+    Pre-aggregated portfolio figures for ACTIVE loans, one row per
+    (dimension, key). Rebuilt by `manage.py refresh_portfolio_stats`.
+    """
+    DIMENSION_TOTAL = "total"
+    DIMENSION_LOAN_TYPE = "loan_type"
+    DIMENSION_TRUSTEE = "trustee"
+    DIMENSION_COMMUNITY = "community"
+
+    DIMENSION_CHOICES = [
+        (DIMENSION_TOTAL, "Total"),
+        (DIMENSION_LOAN_TYPE, "Loan type"),
+        (DIMENSION_TRUSTEE, "Trustee"),
+        (DIMENSION_COMMUNITY, "Community"),
+    ]
+
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES)
+    key = models.CharField(max_length=100, blank=True)
+    label = models.CharField(max_length=255, blank=True)
+
+    loans_count = models.IntegerField(default=0)
+    principal_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    collected_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    outstanding_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    due_next_30_days_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    overdue_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    overdue_payments_count = models.IntegerField(default=0)
+
+    refreshed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.dimension}: {self.label or self.key}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["dimension", "key"], name="portfolio_statistic_unique_key"),
+        ]
@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Case, Min, OuterRef, Q, Subquery, When
+from django.utils import timezone
+
+from core.dashboard_cache import invalidate_dashboard_summary
+from core.metrics import time_job
+from core.loan_registry import LOAN_MODELS
+from core.models import LoanRegistry, Payment
+
+
+# ------------------------------------
+#   Overdue detection
+#   A loan is overdue when it is ACTIVE and has a late payment:
+#   - a BOUNCED payment (collection failed), from its due date, or
+#   - a PENDING payment whose due date is more than OVERDUE_GRACE_DAYS in
+#     the past (payments nobody settled, e.g. when settle_due_payments does
+#     not run).
+#   settle_due_payments marks due PENDING payments as PAID on their due
+#   date, so with the daily job running, overdue loans are the ones with a
+#   bounced payment (see payment_settlement.bounce_payments).
+#   The result is stored in LoanRegistry.overdue_since, so overdue lists and
+#   counts are index lookups on the registry instead of payment scans.
+# ------------------------------------
+
+def overdue_cutoff(as_of=None, grace_days=None):
+    """
+    Payments due before this date are overdue.
+    """
+    as_of = as_of or timezone.localdate()
+    if grace_days is None:
+        grace_days = settings.OVERDUE_GRACE_DAYS
+    return as_of - timedelta(days=grace_days)
+
+
+def late_payment_q(as_of=None, grace_days=None):
+    """
+    Q over Payment matching the payments that make a loan overdue: BOUNCED
+    ones, and PENDING ones due before overdue_cutoff().
+    """
+    cutoff = overdue_cutoff(as_of, grace_days)
+    return Q(status=Payment.STATUS_BOUNCED) | Q(status=Payment.STATUS_PENDING, due_date__lt=cutoff)
+
+
+@time_job("refresh_overdue_flags")
+def refresh_overdue_flags(as_of=None, grace_days=None, loan_ids=None):
+    """
+    Recomputes LoanRegistry.overdue_since with one set-based UPDATE.
+
+    Only rows that can change are written: loans currently flagged and loans
+    with a late payment (BOUNCED, or PENDING before the cutoff). `loan_ids` limits the refresh
+    to some loans (e.g. after their payments changed).
+
+    Returns the number of registry rows written.
+    """
+    late = late_payment_q(as_of, grace_days)
+
+    # Payments of each loan type are matched on their own content type
+    late_loans = Q()
+    oldest_late_due_date = []
+    for loan_type, model in LOAN_MODELS.items():
+        late_payments = Payment.objects.filter(late, content_type=ContentType.objects.get_for_model(model))
+        late_loans |= Q(loan_type=loan_type, loan_id__in=late_payments.values("object_id"))
+        oldest_late_due_date.append(When(
+            status="ACTIVE",
+            loan_type=loan_type,
+            then=Subquery(
+                late_payments
+                .filter(object_id=OuterRef("loan_id"))
+                .order_by()
+                .values("object_id")
+                .annotate(oldest=Min("due_date"))
+                .values("oldest")
+            ),
+        ))
+
+    candidates = LoanRegistry.objects.filter(Q(overdue_since__isnull=False) | late_loans)
+    if loan_ids is not None:
+        candidates = candidates.filter(loan_id__in=loan_ids)
+
+    updated = candidates.update(
+        overdue_since=Case(*oldest_late_due_date, default=None),
+        updated_at=timezone.now(),
+    )
+    if updated:
+        invalidate_dashboard_summary()
+    return updated
+
+
+def is_overdue(status, overdue_since):
+    return status == "ACTIVE" and overdue_since is not None
+
+
+def days_overdue(overdue_since, today=None):
+    """
+    Days since the oldest late payment was due (0 when not overdue).
+    """
+    if overdue_since is None:
+        return 0
+    return ((today or timezone.localdate()) - overdue_since).days
@@ -0,0 +1,14 @@
+from rest_framework.pagination import PageNumberPagination
+
+
+class StandardPagination(PageNumberPagination):
+    """
+    Default pagination of the CRUD ViewSets.
+
+    ?page=       page number (1-based)
+    ?page_size=  rows per page (PAGE_SIZE by default, capped at max_page_size)
+
+    Response: { "count": n, "next": <url or null>, "previous": <url or null>, "results": [...] }
+    """
+    page_size_query_param = "page_size"
+    max_page_size = 200
@@ -1,26 +1,112 @@
+import calendar
 from datetime import date
-from dateutil.relativedelta import relativedelta
+from decimal import Decimal, ROUND_DOWN
+from functools import lru_cache
 
+CENT = Decimal("0.01")
 
-def calculate_payment_dates(start_date: date, num_payments: int) -> list[date]:
+# Memoized entries: (start_date, num_payments, charge_day) date lists and
+# (amount, num_payments) installment splits
+DATES_CACHE_SIZE = 65536
+AMOUNTS_CACHE_SIZE = 4096
+
+
+def _add_months(start_date: date, months: int, day: int) -> date:
+    """
+    Returns `day` of the month `months` after start_date's month,
+    clamped to the last day of that month (Jan 31 + 1 month -> Feb 28/29).
+    """
+    month_index = start_date.month - 1 + months
+    year = start_date.year + month_index // 12
+    month = month_index % 12 + 1
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+def calculate_payment_dates(start_date: date, num_payments: int, charge_day: int | None = None) -> list[date]:
     """
     Calculate payment due dates based on a start date and number of payments.
 
-    Rules (Sprint 5):
-    - First payment due date is start_date
-    - Each subsequent payment is exactly +1 calendar month
-    - No special handling for end-of-month edge cases
-    - Year transitions are handled naturally by date arithmetic
+    Rules:
+    - Without charge_day: the first payment is due on start_date and each
+      subsequent payment on the same day of the following months
+    - With charge_day (standing orders): payments are due on charge_day of
+      each month, starting with the first charge_day on or after start_date
+    - Days past the end of a month are clamped to its last day; every date is
+      computed from start_date, so a clamped month does not shift later ones
+    - Year transitions are handled by month arithmetic
+    """
+
+    if num_payments <= 0:
+        return []
+
+    day = charge_day or start_date.day
+    first_offset = 1 if charge_day and _add_months(start_date, 0, day) < start_date else 0
+
+    return [_add_months(start_date, first_offset + i, day) for i in range(num_payments)]
+
+
+def split_amount(amount: Decimal, num_payments: int) -> list[Decimal]:
     """
+    Split `amount` into `num_payments` installments of whole cents.
 
+    Every installment is amount / num_payments rounded down to the cent,
+    and the rounding remainder is added to the last installment, so the
+    installments always sum exactly to `amount`.
+    """
     if num_payments <= 0:
         return []
 
-    due_dates = []
-    current_date = start_date
+    amount = Decimal(amount).quantize(CENT)
+    installment = (amount / num_payments).quantize(CENT, rounding=ROUND_DOWN)
+    last = amount - installment * (num_payments - 1)
+
+    return [installment] * (num_payments - 1) + [last]
 
-    for _ in range(num_payments):
-        due_dates.append(current_date)
-        current_date = current_date + relativedelta(months=1)
 
-    return due_dates
+@lru_cache(maxsize=DATES_CACHE_SIZE)
+def _cached_dates(start_date, num_payments, charge_day):
+    return tuple(calculate_payment_dates(start_date, num_payments, charge_day))
+
+
+@lru_cache(maxsize=AMOUNTS_CACHE_SIZE)
+def _cached_amounts(amount, num_payments):
+    return tuple(split_amount(amount, num_payments))
+
+
+def calculate_schedule(
+    start_date: date,
+    num_payments: int,
+    amount: Decimal,
+    charge_day: int | None = None,
+) -> tuple[tuple[date, Decimal], ...]:
+    """
+    Returns the loan's schedule as ((due_date, amount), ...).
+
+    Due dates are memoized by (start_date, num_payments, charge_day) and
+    installment amounts by (amount, num_payments), so loans sharing a start
+    date or a loan size reuse the same computation.
+    """
+    return tuple(zip(
+        _cached_dates(start_date, num_payments, charge_day),
+        _cached_amounts(Decimal(amount), num_payments),
+    ))
+
+
+def calculate_schedules(loans) -> list[tuple[tuple[date, Decimal], ...]]:
+    """
+    Batch form of calculate_schedule() for many loans at once.
+
+    `loans` is an iterable of (start_date, num_payments, amount, charge_day)
+    tuples; loans with the same dates or amounts share the cached parts.
+    """
+    return [
+        calculate_schedule(start_date, num_payments, amount, charge_day)
+        for start_date, num_payments, amount, charge_day in loans
+    ]
+
+
+def installment_amount(amount: Decimal, num_payments: int) -> Decimal:
+    """
+    Regular (non-final) installment of a loan, e.g. a standing order's monthly amount.
+    """
+    return split_amount(amount, num_payments)[0]
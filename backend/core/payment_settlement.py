@@ -0,0 +1,76 @@
+from datetime import date
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import Payment
+from core.loan_balances import refresh_balances_for_payments
+from core.metrics import count_payments_settled, time_job
+from core.overdue import refresh_overdue_flags
+
+
+@time_job("settle_due_payments")
+def settle_due_payments(as_of: date | None = None) -> int:
+    """
+    Mark every PENDING payment due on or before `as_of` (default: the local date) as PAID,
+    across all loans, with a single set-based UPDATE.
+
+    Rules:
+    - amount_paid is set to the payment amount
+    - paid_at is set to the time of settlement
+    - Already PAID payments are never touched, so the job is idempotent
+      and safe to run repeatedly (e.g. from cron)
+    - BOUNCED payments are never settled: a failed collection stays owed
+      (and keeps its loan overdue) until it is handled by hand
+    - The balance columns of the affected loans are refreshed in the same
+      transaction
+
+    Returns the number of payments settled.
+    """
+    if as_of is None:
+        as_of = timezone.localdate()
+
+    paid_at = timezone.now()
+    with transaction.atomic():
+        settled = Payment.objects.filter(
+            status=Payment.STATUS_PENDING,
+            due_date__lte=as_of,
+        ).update(
+            status=Payment.STATUS_PAID,
+            amount_paid=F("amount"),
+            paid_at=paid_at,
+            updated_at=paid_at,
+        )
+        if settled:
+            # Balances of the loans whose payments were just settled
+            refresh_balances_for_payments(
+                Payment.objects.filter(status=Payment.STATUS_PAID, paid_at=paid_at)
+            )
+    count_payments_settled(settled)
+    return settled
+
+
+def bounce_payments(payment_ids) -> int:
+    """
+    Marks payments whose collection failed (returned check, refused
+    standing-order charge) as BOUNCED - including payments already settled
+    by settle_due_payments. Their amount becomes owed again, and their
+    loans are flagged overdue right away (see core.overdue).
+
+    Returns the number of payments bounced.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        payments = Payment.objects.filter(id__in=payment_ids).exclude(status=Payment.STATUS_BOUNCED)
+        loan_ids = list(payments.values_list("object_id", flat=True).distinct())
+        bounced = payments.update(
+            status=Payment.STATUS_BOUNCED,
+            amount_paid=0,
+            paid_at=None,
+            updated_at=now,
+        )
+        if bounced:
+            refresh_balances_for_payments(Payment.objects.filter(id__in=payment_ids))
+            refresh_overdue_flags(loan_ids=loan_ids)
+    return bounced
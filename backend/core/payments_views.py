@@ -1,57 +1,83 @@
-from datetime import date
-
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Q, Sum
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
-from core.models import LoanChecks, LoanStandingOrder, Payment
+from core.models import Payment
+from core.loan_registry import resolve_loan
+from core.conditional_get import conditional_get, loan_payments_validators
 from .serializers import PaymentSerializer
 
 
+def summarize_payments(payments):
+    """
+    Payment summary of a loan computed in a single aggregate query:
+    total / paid amounts and total / paid payment counts.
+    """
+    summary = payments.aggregate(
+        total_amount=Sum("amount"),
+        paid_amount=Sum("amount_paid"),
+        total_payments=Count("id"),
+        paid_payments=Count("id", filter=Q(status=Payment.STATUS_PAID)),
+    )
+
+    # No payments -> SUM() is NULL
+    summary["total_amount"] = summary["total_amount"] or 0
+    summary["paid_amount"] = summary["paid_amount"] or 0
+    return summary
+
+
+def summarize_payment_rows(payments):
+    """
+    Same summary as summarize_payments(), computed from payments that were
+    already fetched (no extra query).
+    """
+    return {
+        "total_amount": sum((payment.amount for payment in payments), 0),
+        "paid_amount": sum((payment.amount_paid for payment in payments), 0),
+        "total_payments": len(payments),
+        "paid_payments": sum(1 for payment in payments if payment.status == Payment.STATUS_PAID),
+    }
+
+
+def loan_payments(loan):
+    """
+    The payment schedule of a loan (either type), ordered by due date.
+    """
+    return Payment.objects.filter(
+        content_type=ContentType.objects.get_for_model(loan),
+        object_id=loan.loan_id,
+    ).order_by("due_date")
+
+
 class LoanPaymentsView(APIView):
+    # ETag / Last-Modified from the payments' updated_at (see core.conditional_get)
+    @conditional_get(loan_payments_validators)
     def get(self, request, loan_id):
 
         # 1. מציאת ההלוואה (צ'קים או הוראת קבע)
-        loan_checks = LoanChecks.objects.filter(loan_id=loan_id).first()
-        loan_standing = LoanStandingOrder.objects.filter(loan_id=loan_id).first()
+        loan = resolve_loan(loan_id)
 
-        if not loan_checks and not loan_standing:
+        if loan is None:
             return Response(
                 {"detail": "Loan not found"},
                 status=404
             )
 
-        loan = loan_checks if loan_checks else loan_standing
-
         # 2. שליפת התשלומים באמצעות GenericForeignKey
-        loan_content_type = ContentType.objects.get_for_model(loan)
-
-        payments = Payment.objects.filter(
-            content_type=loan_content_type,
-            object_id=loan.loan_id
-        ).order_by("due_date")
-
-        # 3. עדכון אוטומטי של סטטוס תשלומים שהיו אמורים להיות משולמים
-        today = date.today()
-        for payment in payments:
-            if payment.status == Payment.STATUS_PENDING and payment.due_date <= today:
-                payment.status = Payment.STATUS_PAID
-                payment.amount_paid = payment.amount
-                payment.save()
-
-        # 4. חישוב סיכום
-        total_payments = payments.count()
-        paid_payments = payments.filter(status=Payment.STATUS_PAID).count()
-
-        total_amount = sum(p.amount for p in payments)
-        paid_amount = sum(p.amount_paid for p in payments)
-
-        summary = {
-            "total_amount": total_amount,
-            "paid_amount": paid_amount,
-            "total_payments": total_payments,
-            "paid_payments": paid_payments,
-        }
+        payments = loan_payments(loan)
+
+        # 3. סטטוס תשלומים שהגיע מועדם מעודכן ע"י settle_due_payments (cron) - קריאה בלבד
+
+        # 4. חישוב סיכום - שאילתת aggregate אחת
+        summary = summarize_payments(payments)
+
+        # ?summary_only=1 - סיכום בלבד, ללא שליפת שורות התשלומים
+        if request.GET.get("summary_only") in ("1", "true"):
+            return Response({
+                "loan_id": loan_id,
+                "summary": summary,
+            })
 
         # 5. Serializer + Response
         serializer = PaymentSerializer(payments, many=True)
@@ -0,0 +1,152 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.loan_registry import LOAN_MODELS
+from core.metrics import time_job
+from core.models import LoanRegistry, Payment, PortfolioStatistic
+from core.overdue import late_payment_q
+
+
+# ------------------------------------
+#   Portfolio statistics (summary table)
+#   Aggregated in the database: one GROUP BY over the ACTIVE registry rows
+#   (per loan type and trustee), rolled up here into the total, loan type,
+#   trustee and community rows. Overdue figures use the same rule as the
+#   registry's overdue flag (core.overdue.late_payment_q).
+# ------------------------------------
+
+DUE_SOON_DAYS = 30
+
+AMOUNT_FIELDS = [
+    "principal_amount",
+    "collected_amount",
+    "outstanding_amount",
+    "due_next_30_days_amount",
+    "overdue_amount",
+]
+
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+
+
+def _loan_payments_total(payments, expression, output_field):
+    """
+    Correlated subquery: `expression` summed over the `payments` of the
+    outer registry row (matched on its loan type's content type).
+    """
+    return Coalesce(
+        Subquery(
+            payments
+            .filter(object_id=OuterRef("loan_id"), content_type_id=OuterRef("payment_content_type"))
+            .order_by()
+            .values("object_id")
+            .annotate(total=expression)
+            .values("total"),
+            output_field=output_field,
+        ),
+        Value(0),
+        output_field=output_field,
+    )
+
+
+def _portfolio_rows(today):
+    """
+    Figures of the ACTIVE loans per (loan type, trustee), in one query.
+    """
+    pending = Payment.objects.filter(status=Payment.STATUS_PENDING)
+    due_soon = pending.filter(due_date__gte=today, due_date__lte=today + timedelta(days=DUE_SOON_DAYS))
+    late = Payment.objects.filter(late_payment_q(today))
+    remaining = Sum(F("amount") - F("amount_paid"))
+
+    return (
+        LoanRegistry.objects
+        .filter(status="ACTIVE")
+        .annotate(payment_content_type=Case(
+            *[
+                When(loan_type=loan_type, then=Value(ContentType.objects.get_for_model(model).id))
+                for loan_type, model in LOAN_MODELS.items()
+            ],
+            output_field=IntegerField(),
+        ))
+        .annotate(
+            due_soon=_loan_payments_total(due_soon, remaining, MONEY),
+            overdue=_loan_payments_total(late, remaining, MONEY),
+            overdue_count=_loan_payments_total(late, Count("id"), IntegerField()),
+        )
+        .values(
+            "loan_type", "trustee_id",
+            "trustee__community", "trustee__user__first_name", "trustee__user__last_name",
+        )
+        .order_by()
+        .annotate(
+            loans_count=Count("loan_id"),
+            principal_amount=Sum("amount"),
+            collected_amount=Sum("paid_amount"),
+            outstanding_amount=Sum("outstanding_amount"),
+            due_next_30_days_amount=Sum("due_soon"),
+            overdue_amount=Sum("overdue"),
+            overdue_payments_count=Sum("overdue_count"),
+        )
+    )
+
+
+def compute_portfolio_statistics(today=None):
+    """
+    Returns unsaved PortfolioStatistic rows for the current ACTIVE portfolio:
+    one total row plus one row per loan type, trustee and community.
+    """
+    if today is None:
+        today = date.today()
+
+    buckets = defaultdict(lambda: {
+        "label": "",
+        "loans_count": 0,
+        "overdue_payments_count": 0,
+        **{field: Decimal("0") for field in AMOUNT_FIELDS},
+    })
+
+    for row in _portfolio_rows(today):
+        trustee_name = " ".join(filter(None, [
+            row["trustee__user__first_name"], row["trustee__user__last_name"],
+        ]))
+        dimensions = [
+            (PortfolioStatistic.DIMENSION_TOTAL, "", ""),
+            (PortfolioStatistic.DIMENSION_LOAN_TYPE, row["loan_type"], row["loan_type"]),
+            (PortfolioStatistic.DIMENSION_TRUSTEE, str(row["trustee_id"] or ""), trustee_name),
+            (PortfolioStatistic.DIMENSION_COMMUNITY, row["trustee__community"] or "", row["trustee__community"] or ""),
+        ]
+
+        for dimension, key, label in dimensions:
+            bucket = buckets[(dimension, key)]
+            bucket["label"] = label
+            bucket["loans_count"] += row["loans_count"]
+            bucket["overdue_payments_count"] += row["overdue_payments_count"] or 0
+            for field in AMOUNT_FIELDS:
+                bucket[field] += row[field] or Decimal("0")
+
+    refreshed_at = timezone.now()
+    return [
+        PortfolioStatistic(dimension=dimension, key=key, refreshed_at=refreshed_at, **bucket)
+        for (dimension, key), bucket in buckets.items()
+    ]
+
+
+@time_job("refresh_portfolio_stats")
+def refresh_portfolio_statistics(today=None):
+    """
+    Replaces the summary table with freshly computed figures in one transaction.
+    Returns the number of rows written.
+    """
+    rows = compute_portfolio_statistics(today)
+
+    with transaction.atomic():
+        PortfolioStatistic.objects.all().delete()
+        PortfolioStatistic.objects.bulk_create(rows)
+
+    return len(rows)
@@ -0,0 +1,295 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+
+from core.metrics import buffer_incr, flush_due, flush_metrics, incr, metrics_cache
+
+
+logger = logging.getLogger("core.requests")
+
+
+# ------------------------------------
+#   Per-request instrumentation
+#   RequestMetricsMiddleware measures every request (SQL query count and
+#   time, response rendering time, wall time), reports them in a
+#   Server-Timing header, logs slow requests and adds them to per-route
+#   histograms kept in the metrics cache (shared by all processes on Redis).
+#   Counters are buffered in the process (see core.metrics.buffer_incr):
+#   a request costs no cache round trip.
+# ------------------------------------
+
+METRICS_PREFIX = "request-metrics"
+# Route index: every route seen so far is stored as (route, view name) in
+# its own slot ROUTES_KEY:<n>, n taken from the atomic ROUTE_COUNT_KEY
+# counter, so routes registered concurrently cannot overwrite each other
+ROUTES_KEY = f"{METRICS_PREFIX}:routes"
+ROUTE_COUNT_KEY = f"{METRICS_PREFIX}:route-count"
+
+# Upper bounds (ms) of the wall-time histogram buckets; the last bucket is +Inf
+DURATION_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+BUCKET_NAMES = [str(bound) for bound in DURATION_BUCKETS_MS] + ["inf"]
+
+# Counters kept per route (durations in microseconds, cache incr() is integer-only)
+COUNTERS = ("requests", "errors", "duration_us", "sql_us", "render_us", "queries")
+
+# Repeated statements reported in the slow-request log
+TOP_STATEMENTS = 5
+STATEMENT_MAX_LENGTH = 500
+
+
+class QueryRecorder:
+    """
+    connection.execute_wrapper() hook counting and timing the SQL statements
+    of one request, grouped by statement text (parameters excluded, so the
+    same query run once per row shows up as one repeated statement).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+        self.statement_durations = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            self.statements[sql] += 1
+            self.statement_durations[sql] += elapsed
+
+    def repeated_statements(self, limit=TOP_STATEMENTS):
+        """
+        The statements run more than once, most repeated first.
+        """
+        return [
+            {
+                "sql": sql[:STATEMENT_MAX_LENGTH],
+                "count": count,
+                "ms": round(self.statement_durations[sql] * 1000, 2),
+            }
+            for sql, count in self.statements.most_common(limit)
+            if count > 1
+        ]
+
+
+def _key(route, name):
+    # Routes contain spaces and "<>": hash them into valid cache keys
+    route_hash = hashlib.sha1(route.encode()).hexdigest()[:16]
+    return f"{METRICS_PREFIX}:{route_hash}:{name}"
+
+
+def _bucket(duration_ms):
+    for bound, name in zip(DURATION_BUCKETS_MS, BUCKET_NAMES):
+        if duration_ms <= bound:
+            return name
+    return BUCKET_NAMES[-1]
+
+
+# Routes recorded by this process since its last flush: {route: view}
+_pending_routes = {}
+_pending_routes_lock = threading.Lock()
+
+
+def record_request(route, view, status_code, duration, sql_duration, render_duration, queries):
+    """
+    Adds one request (durations in seconds) to the histograms of `route`.
+    Only the in-process buffer is written; see flush_request_metrics().
+    """
+    with _pending_routes_lock:
+        _pending_routes[route] = view
+
+    buffer_incr(_key(route, "requests"))
+    if status_code >= 500:
+        buffer_incr(_key(route, "errors"))
+    buffer_incr(_key(route, "duration_us"), int(duration * 1_000_000))
+    buffer_incr(_key(route, "sql_us"), int(sql_duration * 1_000_000))
+    buffer_incr(_key(route, "render_us"), int(render_duration * 1_000_000))
+    buffer_incr(_key(route, "queries"), queries)
+    buffer_incr(_key(route, f"bucket:{_bucket(duration * 1000)}"))
+
+
+def _register_route(route, view):
+    # add() is atomic: only the first process to see the route takes a slot
+    if metrics_cache.add(_key(route, "seen"), True, timeout=None):
+        slot = incr(ROUTE_COUNT_KEY)
+        metrics_cache.set(f"{ROUTES_KEY}:{slot}", (route, view), timeout=None)
+
+
+def flush_request_metrics(force=False):
+    """
+    Writes this process's buffered request counters (and any other buffered
+    counter) to the cache - when METRICS_FLUSH_SECONDS have passed since the
+    last flush, or always with `force`.
+    """
+    if not force and not flush_due():
+        return
+
+    global _pending_routes
+    with _pending_routes_lock:
+        routes, _pending_routes = _pending_routes, {}
+    for route, view in routes.items():
+        _register_route(route, view)
+    flush_metrics()
+
+
+def _indexed_routes():
+    count = metrics_cache.get(ROUTE_COUNT_KEY) or 0
+    slots = metrics_cache.get_many([f"{ROUTES_KEY}:{n}" for n in range(1, count + 1)])
+    return dict(slots.values())
+
+
+def route_counters():
+    """
+    Raw counters of every route seen so far: [{route, view, counters,
+    histogram}], the histogram being cumulative [(upper bound ms or "+Inf",
+    count)] (Prometheus style).
+    """
+    flush_request_metrics(force=True)
+    names = list(COUNTERS) + [f"bucket:{name}" for name in BUCKET_NAMES]
+
+    routes = []
+    for route, view in _indexed_routes().items():
+        values = metrics_cache.get_many([_key(route, name) for name in names])
+        counters = {name: values.get(_key(route, name), 0) for name in COUNTERS}
+        if not counters["requests"]:
+            continue
+
+        histogram = []
+        cumulative = 0
+        for bound, name in zip(list(DURATION_BUCKETS_MS) + ["+Inf"], BUCKET_NAMES):
+            cumulative += values.get(_key(route, f"bucket:{name}"), 0)
+            histogram.append((bound, cumulative))
+
+        routes.append({"route": route, "view": view, "counters": counters, "histogram": histogram})
+    return routes
+
+
+def route_metrics():
+    """
+    Returns the histograms of every route seen so far, slowest total first:
+    request / error counts, average wall, SQL and rendering times, average
+    query count and the wall-time histogram.
+    """
+    routes = []
+    for row in route_counters():
+        counters = row["counters"]
+        requests = counters["requests"]
+        routes.append({
+            "route": row["route"],
+            "view": row["view"],
+            "requests": requests,
+            "errors": counters["errors"],
+            "total_ms": round(counters["duration_us"] / 1000, 1),
+            "avg_ms": round(counters["duration_us"] / requests / 1000, 2),
+            "avg_sql_ms": round(counters["sql_us"] / requests / 1000, 2),
+            "avg_render_ms": round(counters["render_us"] / requests / 1000, 2),
+            "avg_queries": round(counters["queries"] / requests, 2),
+            "histogram": [{"le": bound, "count": count} for bound, count in row["histogram"]],
+        })
+
+    routes.sort(key=lambda row: row["total_ms"], reverse=True)
+    return routes
+
+
+def reset_route_metrics():
+    flush_request_metrics(force=True)
+    count = metrics_cache.get(ROUTE_COUNT_KEY) or 0
+    routes = _indexed_routes()
+    names = ["seen"] + list(COUNTERS) + [f"bucket:{name}" for name in BUCKET_NAMES]
+    metrics_cache.delete_many(
+        [_key(route, name) for route in routes for name in names]
+        + [f"{ROUTES_KEY}:{n}" for n in range(1, count + 1)]
+        + [ROUTE_COUNT_KEY]
+    )
+
+
+def route_of(request):
+    """
+    The URL pattern that served the request (e.g. "api/loans/<uuid:loan_id>/"),
+    so all loans share one histogram.
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None or not match.route:
+        return "<unmatched>"
+    return f"{request.method} {match.route}"
+
+
+def view_of(request):
+    """
+    Class name of the view that served the request (e.g. "LoanListView").
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return ""
+    # APIView.as_view() sets view_class, ViewSet.as_view() sets cls
+    view_class = getattr(match.func, "view_class", None) or getattr(match.func, "cls", None)
+    return view_class.__name__ if view_class else match.func.__name__
+
+
+class RequestMetricsMiddleware:
+    """
+    Should be the first middleware, so the wall time covers the others.
+
+    Server-Timing: db (SQL time + query count), render (response
+    serialization) and total. Requests slower than settings.SLOW_REQUEST_MS
+    are logged to the "core.requests" logger as one JSON record, including
+    the statements repeated within the request (N+1 patterns).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        recorder = QueryRecorder()
+
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+
+        end = time.perf_counter()
+        duration = end - start
+        render_start = getattr(request, "_metrics_render_start", None)
+        render_duration = end - render_start if render_start is not None else 0.0
+
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries"',
+            f'render;dur={render_duration * 1000:.1f};desc="serialization"',
+            f"total;dur={duration * 1000:.1f}",
+        ])
+
+        route = route_of(request)
+        record_request(
+            route, view_of(request), response.status_code,
+            duration, recorder.duration, render_duration, recorder.count,
+        )
+        flush_request_metrics()
+
+        if duration * 1000 >= settings.SLOW_REQUEST_MS:
+            logger.warning("slow request %s", json.dumps({
+                "method": request.method,
+                "path": request.get_full_path(),
+                "route": route,
+                "status": response.status_code,
+                "duration_ms": round(duration * 1000, 1),
+                "sql_ms": round(recorder.duration * 1000, 1),
+                "render_ms": round(render_duration * 1000, 1),
+                "queries": recorder.count,
+                "repeated_statements": recorder.repeated_statements(),
+            }))
+
+        return response
+
+    def process_template_response(self, request, response):
+        # Called after the view, right before DRF renders the response
+        request._metrics_render_start = time.perf_counter()
+        return response
@@ -0,0 +1,198 @@
+from decimal import Decimal
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import Payment
+from core.loan_balances import refresh_loan_balances
+from core.metrics import count_payments_generated
+from core.payment_schedule import calculate_schedule, split_amount
+
+
+# ------------------------------------
+#   Payment schedule service
+# ------------------------------------
+
+def build_payment_schedule(loan, num_payments):
+    """
+    Returns the (unsaved) Payment rows of a loan's schedule: one PENDING
+    payment per installment from calculate_schedule(). Standing orders
+    are due on their charge_day.
+    """
+    schedule = calculate_schedule(
+        loan.start_date,
+        num_payments,
+        loan.amount,
+        getattr(loan, "charge_day", None),
+    )
+    if not schedule:
+        return []
+
+    # Prepare GenericForeignKey data (ContentType lookups are cached)
+    content_type = ContentType.objects.get_for_model(loan)
+
+    return [
+        Payment(
+            content_type=content_type,
+            object_id=loan.loan_id,
+            due_date=due_date,
+            amount=amount,
+            amount_paid=0,
+            status=Payment.STATUS_PENDING,
+        )
+        for due_date, amount in schedule
+    ]
+
+
+def create_payment_schedules(loans_with_num_payments, batch_size=None):
+    """
+    Creates the payment schedules of many loans at once.
+
+    `loans_with_num_payments` is an iterable of (loan, num_payments) pairs.
+    All rows are built in memory and written with a single bulk_create
+    (split into `batch_size` chunks if given), then the loans' balance
+    columns are refreshed. Used by loan creation, imports and data
+    migrations.
+
+    Returns the created Payment instances.
+    """
+    loans = []
+    payments = []
+    for loan, num_payments in loans_with_num_payments:
+        loans.append(loan)
+        payments.extend(build_payment_schedule(loan, num_payments))
+
+    if not payments:
+        return []
+
+    with transaction.atomic():
+        created = Payment.objects.bulk_create(payments, batch_size=batch_size)
+        refresh_loan_balances(loans)
+        transaction.on_commit(lambda: count_payments_generated(len(created)))
+    return created
+
+
+def create_payment_schedule(loan, num_payments):
+    """
+    Creates the payment schedule of a single loan with one INSERT.
+    """
+    return create_payment_schedules([(loan, num_payments)])
+
+
+def _balance_is_stale(loan):
+    """
+    True when the stored outstanding_amount no longer matches the stored
+    loan amount (e.g. after an amount-only edit).
+    """
+    return (
+        type(loan).objects
+        .filter(loan_id=loan.loan_id)
+        .exclude(outstanding_amount=F("amount") - F("paid_amount"))
+        .exists()
+    )
+
+
+def sync_payment_schedule(loan, num_payments):
+    """
+    Brings an existing loan's payments in line with its current amount,
+    start_date and num_payments, writing only what changed.
+
+    The new schedule is compared slot by slot (in due_date order) with the
+    existing payments:
+    - PAID and BOUNCED payments are never touched; the rest of the loan
+      amount is split over the remaining slots. Such a payment beyond
+      num_payments keeps its row and takes the place of the last PENDING slot
+    - PENDING payments whose due date or amount changed are bulk-updated
+    - Missing slots are bulk-inserted
+    - Surplus PENDING payments are bulk-deleted
+
+    num_payments may not be lower than the number of PAID / BOUNCED payments
+    (ValueError; the API validates it first, see LoanUpdateSerializer).
+
+    The loan's balance columns are refreshed in the same transaction.
+
+    Returns {"updated": n, "created": n, "deleted": n}.
+    """
+    content_type = ContentType.objects.get_for_model(loan)
+    existing = list(
+        Payment.objects
+        .filter(content_type=content_type, object_id=loan.loan_id)
+        .order_by("due_date", "id")
+    )
+    target = calculate_schedule(
+        loan.start_date,
+        num_payments,
+        loan.amount,
+        getattr(loan, "charge_day", None),
+    )
+
+    # Paid and bounced payments are history: they keep their row as is
+    settled = [payment for payment in existing if payment.status != Payment.STATUS_PENDING]
+    if len(settled) > num_payments:
+        raise ValueError(
+            f"num_payments ({num_payments}) is lower than the {len(settled)} paid or bounced payments"
+        )
+
+    # Settled slots keep their amount; the remainder is re-split
+    settled_slots = {
+        slot for slot, payment in enumerate(existing[:num_payments])
+        if payment.status != Payment.STATUS_PENDING
+    }
+    pending_slots = [
+        slot for slot in range(num_payments) if slot not in settled_slots
+    ][:num_payments - len(settled)]
+    settled_total = sum((payment.amount for payment in settled), Decimal("0"))
+    remaining = max(Decimal(loan.amount) - settled_total, Decimal("0"))
+    amounts = split_amount(remaining, len(pending_slots))
+
+    to_update = []
+    to_create = []
+    updated_at = timezone.now()
+    for slot, amount in zip(pending_slots, amounts):
+        due_date = target[slot][0]
+
+        if slot < len(existing):
+            payment = existing[slot]
+            if payment.due_date != due_date or payment.amount != amount:
+                payment.due_date = due_date
+                payment.amount = amount
+                payment.updated_at = updated_at
+                to_update.append(payment)
+        else:
+            to_create.append(Payment(
+                content_type=content_type,
+                object_id=loan.loan_id,
+                due_date=due_date,
+                amount=amount,
+                amount_paid=0,
+                status=Payment.STATUS_PENDING,
+            ))
+
+    kept_slots = set(pending_slots)
+    to_delete = [
+        payment.id for slot, payment in enumerate(existing)
+        if payment.status == Payment.STATUS_PENDING and slot not in kept_slots
+    ]
+
+    with transaction.atomic():
+        if to_update:
+            # bulk_update() skips auto_now: updated_at was set above
+            Payment.objects.filter(status=Payment.STATUS_PENDING).bulk_update(
+                to_update, ["due_date", "amount", "updated_at"]
+            )
+        if to_create:
+            Payment.objects.bulk_create(to_create)
+            transaction.on_commit(lambda: count_payments_generated(len(to_create)))
+        if to_delete:
+            Payment.objects.filter(id__in=to_delete, status=Payment.STATUS_PENDING).delete()
+        # The loan amount may have changed even if no payment did
+        if to_update or to_create or to_delete or _balance_is_stale(loan):
+            refresh_loan_balances([loan])
+
+    return {
+        "updated": len(to_update),
+        "created": len(to_create),
+        "deleted": len(to_delete),
+    }
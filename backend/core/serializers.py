@@ -1,20 +1,48 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Trustee, Borrower, LoanChecks, LoanStandingOrder, Role, UserProfile
+from django.contrib.contenttypes.models import ContentType
+from .models import Trustee, Borrower, LoanChecks, LoanStandingOrder, Role, UserProfile, PortfolioStatistic
 from decimal import Decimal, InvalidOperation
+from django.db import transaction
+from .payment_schedule import installment_amount
+from .schedule_service import sync_payment_schedule
+from .overdue import is_overdue
 from .models import Payment
 from rest_framework import serializers
 from .models import Payment
 #from .models import Trustee, LoanChecks, LoanStandingOrder
 
 
+# --- Sparse fieldsets ---
+class SparseFieldsMixin:
+    """
+    Lets GET requests choose the returned fields with ?fields=a,b,c
+    (unknown names are ignored). Writes always use every field.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get("request")
+        if request is None or request.method != "GET":
+            return
+
+        fields_param = request.query_params.get("fields")
+        if not fields_param:
+            return
+
+        requested = {name.strip() for name in fields_param.split(",") if name.strip()}
+        for name in set(self.fields) - requested:
+            self.fields.pop(name)
+
+
 # --- Role & UserProfile ---
-class RoleSerializer(serializers.ModelSerializer):
+class RoleSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Role
         fields = '__all__'
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = UserProfile
         fields = '__all__'
@@ -25,25 +53,25 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'first_name', 'last_name', 'email']
 
-class TrusteeSerializer(serializers.ModelSerializer):
+class TrusteeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user_details = UserSerializer(source='user', read_only=True)
     class Meta:
         model = Trustee
         fields = '__all__'
 
-class BorrowerSerializer(serializers.ModelSerializer):
+class BorrowerSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user_details = UserSerializer(source='user', read_only=True)
     class Meta:
         model = Borrower
         fields = '__all__'
 
 # --- Loans ---
-class LoanChecksSerializer(serializers.ModelSerializer):
+class LoanChecksSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = LoanChecks
         fields = '__all__'
 
-class LoanStandingOrderSerializer(serializers.ModelSerializer):
+class LoanStandingOrderSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = LoanStandingOrder
         fields = '__all__'
@@ -63,12 +91,52 @@ class LoanListSerializer(serializers.Serializer):
     loan_type = serializers.CharField()  # "checks" or "standing_order"
     amount = serializers.DecimalField(max_digits=10, decimal_places=2)  # Loan amount
     start_date = serializers.DateField()  # When the loan starts
-    status = serializers.CharField()  # Current status (e.g., ACTIVE, PAID)
+    status = serializers.CharField()  # Current status (e.g., ACTIVE, CLOSED, OVERDUE)
+    days_overdue = serializers.IntegerField()  # Days since the oldest late payment was due (0 if not overdue)
+    outstanding_amount = serializers.DecimalField(max_digits=10, decimal_places=2)  # Amount still owed
+    next_due_date = serializers.DateField(allow_null=True)  # Due date of the next PENDING payment
 
     # Nested data for related entities (already prepared as dictionaries in the view)
     borrower = serializers.DictField()  # Contains borrower info (name, phone, email, etc.)
     trustee = serializers.DictField()   # Contains trustee info (name, community, etc.)
 
+class LoanListFiltersSerializer(serializers.Serializer):
+    """
+    Validates the query parameters of the unified loan list (GET /api/loans/).
+
+    ?status= accepts one or more comma-separated values (ACTIVE, PENDING,
+    PAID / CLOSED, REJECTED) or "all"; it defaults to ACTIVE.
+    """
+
+    STATUS_VALUES = ["ACTIVE", "PENDING", "PAID", "CLOSED", "REJECTED", "ALL"]
+    ORDERING_CHOICES = ["start_date", "-start_date", "amount", "-amount"]
+
+    status = serializers.CharField(required=False)
+    min_amount = serializers.DecimalField(max_digits=12, decimal_places=2, required=False)
+    max_amount = serializers.DecimalField(max_digits=12, decimal_places=2, required=False)
+    start_date_from = serializers.DateField(required=False)
+    start_date_to = serializers.DateField(required=False)
+    trustee = serializers.UUIDField(required=False)
+    community = serializers.CharField(required=False)
+    overdue = serializers.BooleanField(required=False, default=False)
+    ordering = serializers.ChoiceField(choices=ORDERING_CHOICES, default="start_date")
+
+    def validate_status(self, value):
+        statuses = [part.strip().upper() for part in value.split(",") if part.strip()]
+        invalid = [s for s in statuses if s not in self.STATUS_VALUES]
+        if invalid:
+            raise serializers.ValidationError(f"Invalid status: {', '.join(invalid)}")
+        return statuses
+
+    def validate(self, attrs):
+        if attrs.get("min_amount") is not None and attrs.get("max_amount") is not None:
+            if attrs["min_amount"] > attrs["max_amount"]:
+                raise serializers.ValidationError({"max_amount": ["Must be greater than or equal to min_amount"]})
+        if attrs.get("start_date_from") and attrs.get("start_date_to"):
+            if attrs["start_date_from"] > attrs["start_date_to"]:
+                raise serializers.ValidationError({"start_date_to": ["Must be on or after start_date_from"]})
+        return attrs
+
 class LoanDetailSerializer(serializers.Serializer):
     """
     Full loan details serializer used for the Loan Details panel.
@@ -84,6 +152,12 @@ class LoanDetailSerializer(serializers.Serializer):
     form_file_url = serializers.SerializerMethodField()
     trustee_id = serializers.SerializerMethodField()
 
+    # Balance (denormalized from the payments, see core.loan_balances)
+    paid_amount = serializers.DecimalField(max_digits=10, decimal_places=2)
+    outstanding_amount = serializers.DecimalField(max_digits=10, decimal_places=2)
+    next_due_date = serializers.DateField(allow_null=True)
+    payments_remaining = serializers.IntegerField()
+
 
     # Borrower full details
     borrower = serializers.SerializerMethodField()
@@ -113,11 +187,16 @@ class LoanDetailSerializer(serializers.Serializer):
 
         Model: PENDING, ACTIVE, PAID, REJECTED
         Contract: ACTIVE, CLOSED, OVERDUE
+
+        OVERDUE is not stored: it comes from the registry's overdue flag
+        (core.overdue), attached to the loan by resolve_loan().
         """
         if obj.status == "PAID":
             return "CLOSED"
 
         if obj.status == "ACTIVE":
+            if is_overdue(obj.status, getattr(obj, "overdue_since", None)):
+                return "OVERDUE"
             return "ACTIVE"
 
         if obj.status in ("PENDING", "REJECTED"):
@@ -161,6 +240,8 @@ class LoanDetailSerializer(serializers.Serializer):
     # ----------------------------------------------------
     def get_trustee(self, obj):
         trustee = obj.trustee
+        if trustee is None:
+            return None
         user = trustee.user if trustee.user else None
 
         return {
@@ -238,6 +319,16 @@ class LoanUpdateSerializer(serializers.Serializer):
     def validate_number_of_payments(self, value):
         if value < 1:
             raise serializers.ValidationError("Must be at least 1")
+        # Paid and bounced installments are never removed from the schedule
+        if self.instance is not None:
+            settled = Payment.objects.filter(
+                content_type=ContentType.objects.get_for_model(self.instance),
+                object_id=self.instance.loan_id,
+            ).exclude(status=Payment.STATUS_PENDING).count()
+            if value < settled:
+                raise serializers.ValidationError(
+                    f"Must be at least {settled} (payments already paid or bounced)"
+                )
         return value
 
     def validate_trustee_id(self, value):
@@ -266,7 +357,7 @@ class LoanUpdateSerializer(serializers.Serializer):
         Sprint 3 approach (no DB schema changes):
           ACTIVE  -> ACTIVE
           CLOSED  -> PAID
-          OVERDUE -> ACTIVE  (kept ACTIVE until future status expansion)
+          OVERDUE -> ACTIVE  (overdue is computed from payments, see core.overdue)
         """
         mapping = {
             "ACTIVE": "ACTIVE",
@@ -293,11 +384,16 @@ class LoanUpdateSerializer(serializers.Serializer):
 
         elif isinstance(instance, LoanStandingOrder):
             try:
-                instance.monthly_amount = (Decimal(amount) / Decimal(num_payments))
-            except (InvalidOperation, ZeroDivisionError):
+                instance.monthly_amount = installment_amount(Decimal(amount), num_payments)
+            except InvalidOperation:
                 raise serializers.ValidationError({"number_of_payments": ["Invalid value"]})
+            # Same rule as loan creation: charged on the start date's day
+            instance.charge_day = instance.start_date.day
 
-        instance.save()
+        # Save the loan and apply only the schedule changes, atomically
+        with transaction.atomic():
+            instance.save()
+            sync_payment_schedule(instance, num_payments)
         return instance
     
     def create(self, validated_data):
@@ -369,3 +465,19 @@ class PaymentSerializer(serializers.ModelSerializer):
             "amount_paid",
             "status",
         ]
+
+
+class PortfolioStatisticSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PortfolioStatistic
+        fields = [
+            "key",
+            "label",
+            "loans_count",
+            "principal_amount",
+            "collected_amount",
+            "outstanding_amount",
+            "due_next_30_days_amount",
+            "overdue_amount",
+            "overdue_payments_count",
+        ]
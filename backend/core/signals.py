@@ -0,0 +1,51 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.loan_registry import loan_type_of, register_loan, unregister_loan
+from core.metrics import count_loans_created
+from core.models import Borrower, Trustee, LoanChecks, LoanStandingOrder, UserProfile
+
+
+# ------------------------------------
+#   Keep LoanRegistry in sync with loan saves / deletes
+#   (covers LoanListView, LoanUpdateSerializer, the ViewSets and admin)
+# ------------------------------------
+
+@receiver(post_save, sender=LoanChecks)
+@receiver(post_save, sender=LoanStandingOrder)
+def sync_loan_registry(sender, instance, created, raw=False, **kwargs):
+    # Fixtures (loaddata) carry their own registry rows
+    if raw:
+        return
+    register_loan(instance)
+    if created:
+        loan_type = loan_type_of(instance)
+        transaction.on_commit(lambda: count_loans_created(loan_type))
+
+
+@receiver(post_delete, sender=LoanChecks)
+@receiver(post_delete, sender=LoanStandingOrder)
+def remove_from_loan_registry(sender, instance, **kwargs):
+    unregister_loan(instance.loan_id)
+
+
+# ------------------------------------
+#   Borrower / trustee details shown in loan responses fall back to the
+#   linked user and profile: editing those bumps the borrower's / trustee's
+#   updated_at, so cached list / detail responses are revalidated
+#   (see core.conditional_get)
+# ------------------------------------
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=UserProfile)
+def touch_user_borrower_and_trustee(sender, instance, created, update_fields=None, **kwargs):
+    # A new user has no borrower / trustee yet; logins only write last_login
+    if sender is User and (created or update_fields == frozenset(["last_login"])):
+        return
+    user_id = instance.pk if sender is User else instance.user_id
+    now = timezone.now()
+    Borrower.objects.filter(user_id=user_id).update(updated_at=now)
+    Trustee.objects.filter(user_id=user_id).update(updated_at=now)
@@ -0,0 +1,115 @@
+import uuid
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Trustee, Borrower, LoanChecks, LoanStandingOrder
+from core.overdue import refresh_overdue_flags
+from core.payment_settlement import settle_due_payments
+from core.schedule_service import create_payment_schedule
+
+
+class BorrowerExposureTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        trustee = Trustee.objects.create(user=User.objects.create(username="trustee1"), community="Ramot")
+        self.borrower = Borrower.objects.create(
+            trustee=trustee,
+            id_number="123456781",
+            first_name="Dana",
+            last_name="Levi",
+            address="Jerusalem",
+        )
+        self.url = f"/api/borrowers/{self.borrower.borrower_id}/exposure/"
+
+        self.checks = LoanChecks.objects.create(
+            borrower=self.borrower,
+            trustee=trustee,
+            amount=Decimal("1000.00"),
+            start_date=date(2025, 1, 1),
+            status="ACTIVE",
+            num_payments=10,
+        )
+        create_payment_schedule(self.checks, 10)
+
+        self.standing = LoanStandingOrder.objects.create(
+            borrower=self.borrower,
+            trustee=trustee,
+            amount=Decimal("600.00"),
+            start_date=date(2025, 2, 15),
+            status="ACTIVE",
+            monthly_amount=Decimal("100.00"),
+            charge_day=15,
+        )
+        create_payment_schedule(self.standing, 6)
+
+        LoanStandingOrder.objects.create(
+            borrower=self.borrower,
+            trustee=trustee,
+            amount=Decimal("500.00"),
+            start_date=date(2025, 6, 1),
+            status="PENDING",
+            monthly_amount=Decimal("100.00"),
+            charge_day=1,
+        )
+        LoanChecks.objects.create(
+            borrower=self.borrower,
+            trustee=trustee,
+            amount=Decimal("300.00"),
+            start_date=date(2024, 1, 1),
+            status="PAID",
+            num_payments=3,
+        )
+
+        settle_due_payments(date(2025, 3, 1))
+        # warm the ContentType cache so only the exposure query is counted
+        ContentType.objects.get_for_model(LoanChecks)
+
+    def test_exposure_in_one_query(self):
+        with self.assertNumQueries(1):
+            res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["name"], "Dana Levi")
+        self.assertEqual(
+            [loan["loan_id"] for loan in res.data["loans"]][1:3],
+            [self.checks.loan_id, self.standing.loan_id],
+        )
+        self.assertEqual(len(res.data["loans"]), 4)
+
+        totals = res.data["totals"]
+        self.assertEqual(totals["loans_count"], 4)
+        self.assertEqual(totals["active_loans_count"], 2)
+        self.assertEqual(totals["principal_amount"], Decimal("1600.00"))
+        # checks: 3 x 100 paid, standing order: 1 x 100 paid
+        self.assertEqual(totals["paid_amount"], Decimal("400.00"))
+        self.assertEqual(totals["outstanding_amount"], Decimal("1200.00"))
+        self.assertEqual(totals["pending_amount"], Decimal("500.00"))
+        self.assertEqual(totals["exposure"], Decimal("1700.00"))
+        self.assertEqual(totals["next_due_date"], date(2025, 3, 15))
+
+    def test_overdue_loans(self):
+        refresh_overdue_flags(as_of=date(2025, 4, 20), grace_days=0)
+
+        res = self.client.get(self.url)
+        self.assertEqual(res.data["totals"]["overdue_loans_count"], 2)
+        self.assertEqual(res.data["loans"][1]["status"], "OVERDUE")
+
+    def test_borrower_without_loans(self):
+        other = Borrower.objects.create(id_number="000000018", address="Jerusalem")
+
+        res = self.client.get(f"/api/borrowers/{other.borrower_id}/exposure/")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["loans"], [])
+        self.assertEqual(res.data["totals"]["loans_count"], 0)
+        self.assertEqual(res.data["totals"]["exposure"], Decimal("0"))
+
+    def test_unknown_borrower(self):
+        for borrower_id in (uuid.uuid4(), "not-a-uuid"):
+            res = self.client.get(f"/api/borrowers/{borrower_id}/exposure/")
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,151 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Trustee, Borrower, LoanChecks, Payment, UserProfile
+from core.payment_settlement import settle_due_payments
+from core.schedule_service import create_payment_schedule
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.t_user = User.objects.create(username="trustee1", first_name="Moshe")
+        trustee = Trustee.objects.create(user=self.t_user, community="Ramot")
+        self.borrower = Borrower.objects.create(
+            trustee=trustee,
+            id_number="123456781",
+            first_name="Dana",
+            address="Jerusalem",
+        )
+        self.loan = LoanChecks.objects.create(
+            borrower=self.borrower,
+            trustee=trustee,
+            amount=Decimal("1000.00"),
+            start_date=date(2025, 1, 1),
+            status="ACTIVE",
+            num_payments=4,
+        )
+        create_payment_schedule(self.loan, 4)
+
+        self.urls = [
+            "/api/loans/",
+            f"/api/loans/{self.loan.loan_id}/",
+            f"/api/loans/{self.loan.loan_id}/?include=payments",
+            f"/api/loans/{self.loan.loan_id}/payments",
+        ]
+        # warm the ContentType cache so only loan queries are counted
+        ContentType.objects.get_for_model(LoanChecks)
+
+    def _etags(self):
+        etags = {}
+        for url in self.urls:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertIn("no-cache", res["Cache-Control"])
+            # Collections get no Last-Modified (see core.conditional_get)
+            self.assertEqual(res.has_header("Last-Modified"), url == self.urls[1])
+            etags[url] = res["ETag"]
+        return etags
+
+    def _revalidate(self, etags):
+        return {
+            url: self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code
+            for url, etag in etags.items()
+        }
+
+    def test_unchanged_resources_answer_304(self):
+        etags = self._etags()
+        self.assertEqual(len(set(etags.values())), len(self.urls))
+
+        # The version check only: nothing is loaded or serialized
+        with self.assertNumQueries(1):
+            res = self.client.get(self.urls[1], HTTP_IF_NONE_MATCH=etags[self.urls[1]])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etags[self.urls[1]])
+        self.assertEqual(res.content, b"")
+
+        self.assertEqual(set(self._revalidate(etags).values()), {status.HTTP_304_NOT_MODIFIED})
+
+    def test_payment_writes_change_every_etag(self):
+        etags = self._etags()
+        settle_due_payments(date(2025, 1, 15))
+
+        self.assertEqual(set(self._revalidate(etags).values()), {status.HTTP_200_OK})
+
+    def test_loan_and_borrower_writes_change_the_etag(self):
+        etags = self._etags()
+        self.loan.check_details = "Bank Leumi"
+        self.loan.save()
+        self.assertEqual(self._revalidate(etags)[self.urls[1]], status.HTTP_200_OK)
+
+        etags = self._etags()
+        self.borrower.phone = "0529999999"
+        self.borrower.save()
+        codes = self._revalidate(etags)
+        self.assertEqual(codes[self.urls[0]], status.HTTP_200_OK)
+        self.assertEqual(codes[self.urls[3]], status.HTTP_304_NOT_MODIFIED)
+
+        # The trustee's name comes from its user / profile
+        etags = self._etags()
+        UserProfile.objects.create(user=self.t_user, phone="0501111111")
+        self.assertEqual(self._revalidate(etags)[self.urls[1]], status.HTTP_200_OK)
+
+    def test_errors_have_no_etag(self):
+        res = self.client.get("/api/loans/", {"status": "LOST"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(res.has_header("ETag"))
+
+        res = self.client.get("/api/loans/00000000-0000-0000-0000-000000000000/")
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(res.has_header("ETag"))
+
+    def test_list_version_covers_only_the_page(self):
+        LoanChecks.objects.create(
+            borrower=self.borrower,
+            trustee=self.loan.trustee,
+            amount=Decimal("500.00"),
+            start_date=date(2025, 6, 1),
+            status="ACTIVE",
+            num_payments=1,
+        )
+        first_page = "/api/loans/?page_size=1"
+        etag = self.client.get(first_page)["ETag"]
+
+        # A write to the loan on the next page keeps page 1 current
+        later = LoanChecks.objects.get(start_date=date(2025, 6, 1))
+        later.check_details = "Bank Leumi"
+        later.save()
+        self.assertEqual(self.client.get(first_page, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.loan.check_details = "Bank Leumi"
+        self.loan.save()
+        self.assertEqual(self.client.get(first_page, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_each_renderer_has_its_own_etag(self):
+        json_res = self.client.get(self.urls[0], HTTP_ACCEPT="application/json")
+        html_res = self.client.get(self.urls[0], HTTP_ACCEPT="text/html")
+
+        self.assertNotEqual(json_res["ETag"], html_res["ETag"])
+        self.assertIn("Accept", json_res["Vary"])
+        res = self.client.get(self.urls[0], HTTP_ACCEPT="text/html", HTTP_IF_NONE_MATCH=json_res["ETag"])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_rows_leaving_a_collection_change_its_etag(self):
+        etags = self._etags()
+        list_url = "/api/loans/?status=ACTIVE"
+        list_etag = self.client.get(list_url)["ETag"]
+
+        Payment.objects.filter(object_id=self.loan.loan_id).order_by("-due_date").first().delete()
+        self.assertEqual(self._revalidate(etags)[self.urls[3]], status.HTTP_200_OK)
+
+        self.loan.status = "PAID"
+        self.loan.save()
+        self.assertEqual(self.client.get(list_url, HTTP_IF_NONE_MATCH=list_etag).status_code, status.HTTP_200_OK)
+        res = self.client.get(list_url, HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -0,0 +1,61 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Trustee, Borrower
+
+
+class CrudViewSetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        for i in range(5):
+            user = User.objects.create(username=f"trustee{i}", first_name=f"T{i}")
+            trustee = Trustee.objects.create(user=user, community=f"Community {i}")
+            Borrower.objects.create(
+                user=User.objects.create(username=f"borrower{i}"),
+                trustee=trustee,
+                id_number=f"00000000{i}",
+                address="Jerusalem",
+            )
+
+    def test_lists_are_paginated(self):
+        res = self.client.get("/api/trustees/", {"page_size": 2})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 5)
+        self.assertEqual(len(res.data["results"]), 2)
+        self.assertIsNotNone(res.data["next"])
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual(len(res.data["results"]), 2)
+
+    def test_nested_user_is_joined(self):
+        # count + page, regardless of the number of rows
+        with self.assertNumQueries(2):
+            res = self.client.get("/api/borrowers/")
+        self.assertEqual(len(res.data["results"]), 5)
+        self.assertEqual(res.data["results"][0]["user_details"]["username"], "borrower0")
+
+        with self.assertNumQueries(2):
+            self.client.get("/api/trustees/")
+
+    def test_sparse_fieldset(self):
+        res = self.client.get("/api/trustees/", {"fields": "trustee_id,community"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(res.data["results"][0]), {"trustee_id", "community"})
+
+        trustee_id = res.data["results"][0]["trustee_id"]
+        res = self.client.get(f"/api/trustees/{trustee_id}/", {"fields": "community"})
+        self.assertEqual(res.data, {"community": "Community 0"})
+
+    def test_fields_param_does_not_affect_writes(self):
+        trustee = Trustee.objects.order_by("community").first()
+        res = self.client.patch(
+            f"/api/trustees/{trustee.trustee_id}/?fields=community",
+            {"notes": "Updated"},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["notes"], "Updated")
+        self.assertIn("user_details", res.data)
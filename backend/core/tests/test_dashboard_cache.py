@@ -0,0 +1,102 @@
+from decimal import Decimal
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Trustee, Borrower, LoanChecks, LoanStandingOrder
+from core.dashboard_cache import dashboard_cache_stats
+from core.metrics import flush_metrics, metrics_cache
+
+
+class DashboardSummaryCacheTests(TestCase):
+    def setUp(self):
+        flush_metrics()
+        cache.clear()
+        metrics_cache.clear()
+        self.client = APIClient()
+        self.url = "/api/dashboard/loan-summary/"
+
+        t_user = User.objects.create(username="trustee1")
+        self.trustee = Trustee.objects.create(user=t_user, community="Ramot")
+        self.borrower = Borrower.objects.create(
+            trustee=self.trustee,
+            id_number="123456781",
+            address="Jerusalem",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.loan = LoanChecks.objects.create(
+                borrower=self.borrower,
+                trustee=self.trustee,
+                amount=Decimal("1000.00"),
+                start_date="2025-01-01",
+                status="ACTIVE",
+                num_payments=10,
+            )
+
+    def test_repeated_loads_are_cache_hits(self):
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+        with self.assertNumQueries(0):
+            res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["active_loans_count"], 1)
+        self.assertEqual(dashboard_cache_stats(), {"hits": 1, "misses": 1})
+
+    @override_settings(METRICS_FLUSH_SECONDS=3600)
+    def test_cache_hit_is_a_single_cache_read(self):
+        self.client.get(self.url)
+        flush_metrics()
+
+        with mock.patch.object(metrics_cache, "add") as add, mock.patch.object(metrics_cache, "incr") as incr:
+            self.client.get(self.url)
+        add.assert_not_called()
+        incr.assert_not_called()
+
+        self.assertEqual(dashboard_cache_stats(), {"hits": 1, "misses": 1})
+
+    def test_loan_creation_invalidates_after_commit(self):
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            LoanStandingOrder.objects.create(
+                borrower=self.borrower,
+                trustee=self.trustee,
+                amount=Decimal("1200.00"),
+                start_date="2025-02-01",
+                status="ACTIVE",
+                monthly_amount=Decimal("100.00"),
+                charge_day=1,
+            )
+
+        res = self.client.get(self.url)
+        self.assertEqual(res.data["active_loans_count"], 2)
+        self.assertEqual(res.data["total_active_loans_amount"], Decimal("2200.00"))
+
+    def test_loan_edit_invalidates_after_commit(self):
+        self.client.get(self.url)
+
+        payload = {
+            "amount": 5000,
+            "start_date": "2025-01-01",
+            "number_of_payments": 10,
+            "trustee_id": str(self.trustee.trustee_id),
+            "status": "CLOSED",
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(f"/api/loans/{self.loan.loan_id}/", payload, format="json")
+
+        res = self.client.get(self.url)
+        self.assertEqual(res.data["active_loans_count"], 0)
+
+    def test_viewset_delete_invalidates_after_commit(self):
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/api/loans/checks/{self.loan.loan_id}/")
+
+        res = self.client.get(self.url)
+        self.assertEqual(res.data["active_loans_count"], 0)
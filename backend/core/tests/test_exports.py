@@ -0,0 +1,103 @@
+import csv
+from io import StringIO
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Trustee, Borrower, LoanChecks, LoanStandingOrder
+from core.payment_settlement import settle_due_payments
+from core.schedule_service import create_payment_schedule
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        t_user = User.objects.create(username="trustee1", first_name="Moshe")
+        self.trustee = Trustee.objects.create(user=t_user, community="Ramot")
+        self.borrower = Borrower.objects.create(
+            trustee=self.trustee,
+            id_number="123456781",
+            first_name="יעל",
+            last_name="כהן",
+            address="Jerusalem",
+        )
+        self.checks = LoanChecks.objects.create(
+            borrower=self.borrower,
+            trustee=self.trustee,
+            amount=Decimal("1000.00"),
+            start_date=date(2025, 1, 1),
+            status="ACTIVE",
+            num_payments=4,
+        )
+        self.standing = LoanStandingOrder.objects.create(
+            borrower=self.borrower,
+            trustee=self.trustee,
+            amount=Decimal("300.00"),
+            start_date=date(2025, 2, 5),
+            status="PAID",
+            monthly_amount=Decimal("100.00"),
+            charge_day=5,
+        )
+        create_payment_schedule(self.checks, 4)
+        create_payment_schedule(self.standing, 3)
+        settle_due_payments(date(2025, 2, 1))
+
+    def _read(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn("attachment", response["Content-Disposition"])
+        content = b"".join(response.streaming_content).decode("utf-8-sig")
+        return list(csv.DictReader(StringIO(content)))
+
+    def test_loan_export_streams_both_loan_types(self):
+        rows = self._read(self.client.get("/api/loans/export.csv"))
+
+        self.assertEqual([r["loan_type"] for r in rows], ["checks", "standing_order"])
+        self.assertEqual(rows[0]["borrower_name"], "יעל כהן")
+        self.assertEqual(rows[0]["num_payments"], "4")
+        self.assertEqual(rows[1]["monthly_amount"], "100.00")
+        self.assertEqual(rows[1]["status"], "PAID")
+        self.assertEqual(rows[1]["trustee_name"], "Moshe")
+
+        rows = self._read(self.client.get("/api/loans/export.csv?status=ACTIVE"))
+        self.assertEqual([r["loan_id"] for r in rows], [str(self.checks.loan_id)])
+
+    def test_loan_export_status_matches_the_list(self):
+        for value in ("CLOSED", "paid,closed", "all"):
+            rows = self._read(self.client.get("/api/loans/export.csv", {"status": value}))
+            listed = self.client.get("/api/loans/", {"status": value}).data["results"]
+            self.assertEqual(sorted(r["loan_id"] for r in rows), sorted(str(l["loan_id"]) for l in listed))
+
+        response = self.client.get("/api/loans/export.csv?status=LOST")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("status", response.data)
+
+    def test_exports_accept_text_csv(self):
+        for url in ("/api/loans/export.csv", "/api/payments/export.csv"):
+            response = self.client.get(url, HTTP_ACCEPT="text/csv")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+
+    def test_payment_ledger_export(self):
+        rows = self._read(self.client.get("/api/payments/export.csv"))
+        self.assertEqual(len(rows), 7)
+
+        checks_rows = [r for r in rows if r["loan_id"] == str(self.checks.loan_id)]
+        self.assertEqual([r["due_date"] for r in checks_rows], ["2025-01-01", "2025-02-01", "2025-03-01", "2025-04-01"])
+        self.assertEqual({r["loan_type"] for r in checks_rows}, {"checks"})
+
+        rows = self._read(self.client.get("/api/payments/export.csv?status=PAID"))
+        self.assertEqual(len(rows), 2)
+        self.assertTrue(all(r["paid_at"] for r in rows))
+
+        rows = self._read(self.client.get("/api/payments/export.csv?due_from=2025-03-01&due_to=2025-03-31"))
+        self.assertEqual(sorted(r["due_date"] for r in rows), ["2025-03-01", "2025-03-05"])
+
+    def test_payment_ledger_rejects_bad_dates(self):
+        response = self.client.get("/api/payments/export.csv?due_from=01/03/2025")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("due_from", response.data)
@@ -0,0 +1,112 @@
+import os
+import tempfile
+from io import StringIO
+from decimal import Decimal
+from unittest import mock
+from django.db import DatabaseError
+from django.test import TestCase
+from django.core.management import call_command
+from django.contrib.auth.models import User
+
+from core.loan_intake import create_loans
+from core.models import Trustee, Borrower, LoanChecks, LoanStandingOrder, LoanRegistry, Payment
+
+
+HEADER = "loan_type,id_number,first_name,last_name,phone,email,address,amount,num_payments,start_date,trustee_id\n"
+
+
+class ImportLoansCommandTests(TestCase):
+    def setUp(self):
+        t_user = User.objects.create(username="trustee1")
+        self.trustee = Trustee.objects.create(user=t_user, community="Ramot")
+        Borrower.objects.create(
+            trustee=self.trustee,
+            id_number="111",
+            first_name="Old",
+            address="Old address",
+        )
+
+    def _import(self, body, **options):
+        # Excel writes a BOM at the start of UTF-8 CSV files
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", encoding="utf-8-sig", delete=False) as f:
+            f.write(HEADER + body)
+        self.addCleanup(os.unlink, f.name)
+
+        out, err = StringIO(), StringIO()
+        call_command("import_loans", f.name, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_imports_both_loan_types_with_schedules(self):
+        t = self.trustee.trustee_id
+        out, err = self._import(
+            f"checks,111,Dana,Levi,050,,Jerusalem,1000,4,2025-01-31,{t}\n"
+            f"standing_order,222,Avi,Cohen,,a@example.com,Haifa,100,3,2025-02-10,{t}\n",
+            chunk_size=1,
+        )
+
+        self.assertEqual(err, "")
+        self.assertIn("2 loans created", out)
+
+        # Existing borrower updated in place, new one created
+        self.assertEqual(Borrower.objects.count(), 2)
+        self.assertEqual(Borrower.objects.get(id_number="111").first_name, "Dana")
+
+        check = LoanChecks.objects.get()
+        order = LoanStandingOrder.objects.get()
+        self.assertEqual(order.monthly_amount, Decimal("33.33"))
+        self.assertEqual(order.charge_day, 10)
+        self.assertEqual(LoanRegistry.objects.count(), 2)
+
+        self.assertEqual(Payment.objects.filter(object_id=check.loan_id).count(), 4)
+        amounts = list(
+            Payment.objects.filter(object_id=order.loan_id).order_by("due_date").values_list("amount", flat=True)
+        )
+        self.assertEqual(amounts, [Decimal("33.33"), Decimal("33.33"), Decimal("33.34")])
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        t = self.trustee.trustee_id
+        out, err = self._import(
+            f"checks,333,,,,,Bnei Brak,500,5,2025-03-01,{t}\n"
+            f"checks,444,,,,,Bnei Brak,-5,5,2025-03-01,{t}\n"
+            f"checks,555,,,,,Bnei Brak,500,5,2025-03-01,00000000-0000-0000-0000-000000000000\n"
+        )
+
+        self.assertIn("1 loans created, 2 rows rejected", out)
+        self.assertIn("line 3:", err)
+        self.assertIn("line 4:", err)
+        self.assertIn("Trustee not found", err)
+
+        self.assertEqual(LoanChecks.objects.count(), 1)
+        self.assertFalse(Borrower.objects.filter(id_number__in=["444", "555"]).exists())
+
+    def test_multi_line_fields_keep_line_numbers(self):
+        t = self.trustee.trustee_id
+        out, err = self._import(
+            f'checks,333,,,,,"Rehov Yafo 1\nJerusalem",500,5,2025-03-01,{t}\n'
+            f"checks,444,,,,,Bnei Brak,-5,5,2025-03-01,{t}\n"
+        )
+
+        self.assertIn("1 loans created, 1 rows rejected", out)
+        self.assertIn("line 4:", err)
+
+    def test_database_error_fails_only_the_offending_row(self):
+        t = self.trustee.trustee_id
+
+        def failing_create_loans(items, *args, **kwargs):
+            if any(item["borrower"]["id_number"] == "444" for item in items):
+                raise DatabaseError("value too long")
+            return create_loans(items, *args, **kwargs)
+
+        with mock.patch("core.management.commands.import_loans.create_loans", side_effect=failing_create_loans):
+            out, err = self._import(
+                f"checks,333,,,,,Bnei Brak,500,5,2025-03-01,{t}\n"
+                f"checks,444,,,,,Bnei Brak,500,5,2025-03-01,{t}\n"
+                f"checks,555,,,,,Bnei Brak,500,5,2025-03-01,{t}\n"
+            )
+
+        self.assertIn("2 loans created, 1 rows rejected", out)
+        self.assertEqual(err.strip(), "line 3: {'detail': ['value too long']}")
+        self.assertEqual(
+            sorted(LoanChecks.objects.values_list("borrower__id_number", flat=True)),
+            ["333", "555"],
+        )
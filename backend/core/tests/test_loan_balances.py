@@ -0,0 +1,135 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from django.test import TestCase
+from django.core.management import call_command
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Trustee, Borrower, LoanChecks, LoanStandingOrder, LoanRegistry
+from core.payment_settlement import settle_due_payments
+from core.schedule_service import create_payment_schedule
+
+
+class LoanBalanceTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        t_user = User.objects.create(username="trustee1")
+        self.trustee = Trustee.objects.create(user=t_user, community="Ramot")
+        self.borrower = Borrower.objects.create(
+            trustee=self.trustee,
+            id_number="123456781",
+            address="Jerusalem",
+        )
+        self.loan = LoanChecks.objects.create(
+            borrower=self.borrower,
+            trustee=self.trustee,
+            amount=Decimal("1000.00"),
+            start_date=date(2025, 1, 1),
+            status="ACTIVE",
+            num_payments=10,
+        )
+        create_payment_schedule(self.loan, 10)
+
+    def _balance(self, model=LoanChecks):
+        loan = model.objects.get(loan_id=self.loan.loan_id)
+        entry = LoanRegistry.objects.get(loan_id=self.loan.loan_id)
+        values = (loan.paid_amount, loan.outstanding_amount, loan.next_due_date, loan.payments_remaining)
+        # The registry copy always matches the loan
+        self.assertEqual(values, (entry.paid_amount, entry.outstanding_amount, entry.next_due_date, entry.payments_remaining))
+        return values
+
+    def test_schedule_creation_sets_the_balance(self):
+        self.assertEqual(self._balance(), (Decimal("0.00"), Decimal("1000.00"), date(2025, 1, 1), 10))
+
+    def test_settlement_updates_the_balance(self):
+        settle_due_payments(date(2025, 3, 15))
+        self.assertEqual(self._balance(), (Decimal("300.00"), Decimal("700.00"), date(2025, 4, 1), 7))
+
+        # Stale instances do not overwrite the refreshed columns
+        self.loan.status = "ACTIVE"
+        self.loan.save()
+        self.assertEqual(self._balance()[0], Decimal("300.00"))
+
+    def test_edit_updates_the_balance(self):
+        settle_due_payments(date(2025, 2, 15))
+        res = self.client.put(
+            f"/api/loans/{self.loan.loan_id}/",
+            {
+                "amount": "1200.00",
+                "start_date": "2025-01-01",
+                "number_of_payments": 6,
+                "trustee_id": str(self.trustee.trustee_id),
+                "status": "ACTIVE",
+            },
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["outstanding_amount"], "1000.00")
+        self.assertEqual(res.data["payments_remaining"], 4)
+        self.assertEqual(self._balance(), (Decimal("200.00"), Decimal("1000.00"), date(2025, 3, 1), 4))
+
+    def test_list_and_detail_read_the_columns(self):
+        settle_due_payments(date(2025, 1, 15))
+
+        res = self.client.get("/api/loans/")
+        self.assertEqual(res.data["results"][0]["outstanding_amount"], "900.00")
+        self.assertEqual(res.data["results"][0]["next_due_date"], "2025-02-01")
+
+        res = self.client.get(f"/api/loans/{self.loan.loan_id}/")
+        self.assertEqual(res.data["paid_amount"], "100.00")
+        self.assertEqual(res.data["payments_remaining"], 9)
+
+    def test_reconcile_rebuilds_the_columns(self):
+        LoanChecks.objects.update(paid_amount=0, outstanding_amount=0, next_due_date=None, payments_remaining=0)
+        LoanRegistry.objects.update(paid_amount=0, outstanding_amount=0, next_due_date=None, payments_remaining=0)
+
+        out = StringIO()
+        call_command("reconcile_loan_balances", stdout=out)
+        self.assertIn("1 loan(s)", out.getvalue())
+        self.assertEqual(self._balance(), (Decimal("0.00"), Decimal("1000.00"), date(2025, 1, 1), 10))
+
+    def test_standing_orders(self):
+        standing = LoanStandingOrder.objects.create(
+            borrower=self.borrower,
+            trustee=self.trustee,
+            amount=Decimal("300.00"),
+            start_date=date(2025, 1, 10),
+            status="ACTIVE",
+            monthly_amount=Decimal("100.00"),
+            charge_day=10,
+        )
+        create_payment_schedule(standing, 3)
+        settle_due_payments(date(2025, 1, 10))
+
+        standing.refresh_from_db()
+        self.assertEqual(standing.paid_amount, Decimal("100.00"))
+        self.assertEqual(standing.outstanding_amount, Decimal("200.00"))
+        self.assertEqual(standing.next_due_date, date(2025, 2, 10))
+
+    def test_crud_viewset_writes_refresh_the_balance(self):
+        settle_due_payments(date(2025, 1, 15))
+
+        res = self.client.patch(f"/api/loans/checks/{self.loan.loan_id}/", {"amount": "1500.00"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["outstanding_amount"], "1400.00")
+        self.assertEqual(self._balance()[:2], (Decimal("100.00"), Decimal("1400.00")))
+
+        res = self.client.post(
+            "/api/loans/standing-order/",
+            {
+                "borrower": str(self.borrower.borrower_id),
+                "trustee": str(self.trustee.trustee_id),
+                "amount": "600.00",
+                "start_date": "2025-01-10",
+                "status": "PENDING",
+                "monthly_amount": "100.00",
+                "charge_day": 10,
+            },
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["outstanding_amount"], "600.00")
+        self.assertEqual(LoanRegistry.objects.get(loan_id=res.data["loan_id"]).outstanding_amount, Decimal("600.00"))
@@ -0,0 +1,100 @@
+from decimal import Decimal
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Trustee, Borrower, LoanChecks, LoanStandingOrder, LoanRegistry, Payment
+
+
+class LoanBatchCreateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = "/api/loans/batch/"
+
+        t_user = User.objects.create(username="trustee1")
+        self.trustee = Trustee.objects.create(user=t_user, community="Ramot")
+
+    def _item(self, id_number, loan_type="checks", amount="1200.00", num_payments=12, trustee_id=None):
+        return {
+            "loan_type": loan_type,
+            "borrower": {"id_number": id_number, "first_name": "Dana", "address": "Jerusalem"},
+            "loan": {"amount": amount, "num_payments": num_payments, "start_date": "2025-01-15"},
+            "trustee_id": str(trustee_id or self.trustee.trustee_id),
+        }
+
+    def test_creates_all_loans_with_a_fixed_number_of_queries(self):
+        ContentType.objects.get_for_models(LoanChecks, LoanStandingOrder)
+        items = [
+            self._item(str(i), "checks" if i % 2 else "standing_order", num_payments=6)
+            for i in range(10)
+        ]
+
+        # trustees, borrowers (select + insert), one insert per loan table,
+        # registry loan_id check + upsert, payments insert, balance updates
+        # (loan table + registry per loan type), plus savepoint bookkeeping
+        with self.assertNumQueries(16):
+            response = self.client.post(self.url, {"loans": items}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 10)
+        self.assertEqual(response.data["failed"], 0)
+        self.assertEqual(LoanChecks.objects.count() + LoanStandingOrder.objects.count(), 10)
+        self.assertEqual(LoanRegistry.objects.count(), 10)
+        self.assertEqual(Payment.objects.count(), 10 * 6)
+
+        first = response.data["results"][0]
+        self.assertEqual(first["loan_type"], "standing_order")
+        self.assertEqual(LoanStandingOrder.objects.get(loan_id=first["loan_id"]).monthly_amount, Decimal("200.00"))
+
+    def test_all_or_nothing_creates_nothing_on_error(self):
+        items = [
+            self._item("1"),
+            self._item("2", amount="-1"),
+            self._item("3", trustee_id="00000000-0000-0000-0000-000000000000"),
+        ]
+        response = self.client.post(self.url, {"loans": items}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["created"], 0)
+        self.assertEqual([r["index"] for r in response.data["results"]], [1])
+        self.assertFalse(Borrower.objects.exists())
+        self.assertFalse(Payment.objects.exists())
+
+        # Trustee errors alone also block the batch
+        response = self.client.post(self.url, {"loans": [items[0], items[2]]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["results"][0]["errors"], {"trustee_id": ["Trustee not found"]})
+        self.assertFalse(LoanChecks.objects.exists())
+
+    def test_best_effort_creates_the_valid_items(self):
+        items = [
+            self._item("1"),
+            self._item("2", amount="-1"),
+            self._item("3", trustee_id="00000000-0000-0000-0000-000000000000"),
+        ]
+        response = self.client.post(self.url, {"mode": "best_effort", "loans": items}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["failed"], 2)
+        results = response.data["results"]
+        self.assertIn("loan_id", results[0])
+        self.assertIn("amount", results[1]["errors"]["loan"])
+        self.assertEqual(results[2]["errors"], {"trustee_id": ["Trustee not found"]})
+        self.assertEqual(list(Borrower.objects.values_list("id_number", flat=True)), ["1"])
+
+    def test_rejects_bad_envelopes(self):
+        response = self.client.post(self.url, {"mode": "maybe", "loans": [self._item("1")]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("mode", response.data)
+
+        response = self.client.post(self.url, {"loans": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("loans", response.data)
+
+        for body in ('"abc"', "42", "null"):
+            response = self.client.post(self.url, body, content_type="application/json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, body)
+            self.assertIn("detail", response.data)
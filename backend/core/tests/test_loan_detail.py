@@ -0,0 +1,99 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Trustee, Borrower, LoanChecks, LoanStandingOrder, UserProfile
+from core.payment_settlement import settle_due_payments
+from core.schedule_service import create_payment_schedule
+
+
+class LoanDetailQueryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        t_user = User.objects.create(username="trustee1", first_name="Moshe", last_name="Cohen")
+        UserProfile.objects.create(user=t_user, phone="0501111111")
+        self.trustee = Trustee.objects.create(user=t_user, community="Ramot")
+
+        # Borrower details come from the linked user / profile
+        b_user = User.objects.create(username="borrower1", first_name="Dana", email="dana@example.com")
+        UserProfile.objects.create(user=b_user, phone="0529999999")
+        borrower = Borrower.objects.create(
+            user=b_user,
+            trustee=self.trustee,
+            id_number="123456781",
+            address="Jerusalem",
+        )
+
+        self.loan = LoanChecks.objects.create(
+            borrower=borrower,
+            trustee=self.trustee,
+            amount=Decimal("1000.00"),
+            start_date=date(2025, 1, 1),
+            status="ACTIVE",
+            num_payments=4,
+        )
+        create_payment_schedule(self.loan, 4)
+        settle_due_payments(date(2025, 1, 15))
+
+        self.url = f"/api/loans/{self.loan.loan_id}/"
+        # warm the ContentType cache so only loan queries are counted
+        ContentType.objects.get_for_model(LoanChecks)
+
+    def test_details_in_two_queries(self):
+        # ETag + registry + loan joined to borrower / trustee / users / profiles
+        with self.assertNumQueries(3):
+            res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["borrower"]["name"], "Dana")
+        self.assertEqual(res.data["borrower"]["phone"], "0529999999")
+        self.assertEqual(res.data["trustee"]["name"], "Moshe Cohen")
+        self.assertEqual(res.data["trustee"]["phone"], "0501111111")
+        self.assertNotIn("schedule", res.data)
+
+    def test_include_payments(self):
+        # ETag (2) + loan (2) + payments (1)
+        with self.assertNumQueries(5):
+            res = self.client.get(self.url, {"include": "payments"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        schedule = res.data["schedule"]
+        self.assertEqual(len(schedule["payments"]), 4)
+        self.assertEqual(schedule["payments"][0]["status"], "PAID")
+        self.assertEqual(schedule["summary"], {
+            "total_amount": Decimal("1000.00"),
+            "paid_amount": Decimal("250.00"),
+            "total_payments": 4,
+            "paid_payments": 1,
+        })
+
+        # Same figures as the payments endpoint
+        res = self.client.get(f"/api/loans/{self.loan.loan_id}/payments", {"summary_only": "1"})
+        self.assertEqual(res.data["summary"], schedule["summary"])
+
+    def test_unknown_include(self):
+        res = self.client.get(self.url, {"include": "payments,history"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_loan_without_trustee_or_profiles(self):
+        borrower = Borrower.objects.create(id_number="000000018", first_name="Avi", address="Haifa")
+        loan = LoanStandingOrder.objects.create(
+            borrower=borrower,
+            trustee=None,
+            amount=Decimal("600.00"),
+            start_date=date(2025, 2, 1),
+            status="ACTIVE",
+            monthly_amount=Decimal("100.00"),
+            charge_day=1,
+        )
+
+        with self.assertNumQueries(3):
+            res = self.client.get(f"/api/loans/{loan.loan_id}/")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["borrower"]["name"], "Avi")
+        self.assertIsNone(res.data["trustee"])
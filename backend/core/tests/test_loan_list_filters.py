@@ -0,0 +1,125 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from django.test import TestCase
+from django.utils import timezone
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Trustee, Borrower, LoanChecks, LoanStandingOrder
+from core.schedule_service import create_payment_schedule
+from core.overdue import refresh_overdue_flags
+
+
+class LoanListFilterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = "/api/loans/"
+
+        self.ramot = Trustee.objects.create(user=User.objects.create(username="t1"), community="Ramot")
+        self.gilo = Trustee.objects.create(user=User.objects.create(username="t2"), community="Gilo")
+        borrower = Borrower.objects.create(trustee=self.ramot, id_number="123456781", address="Jerusalem")
+
+        def checks(amount, start_date, loan_status="ACTIVE", trustee=None):
+            return LoanChecks.objects.create(
+                borrower=borrower,
+                trustee=trustee or self.ramot,
+                amount=Decimal(amount),
+                start_date=start_date,
+                status=loan_status,
+                num_payments=10,
+            )
+
+        self.small = checks("500.00", date(2025, 1, 1))
+        self.medium = checks("1500.00", date(2025, 2, 1), trustee=self.gilo)
+        self.large = checks("5000.00", date(2025, 3, 1))
+        self.closed = checks("800.00", date(2024, 6, 1), loan_status="PAID")
+        self.pending = LoanStandingOrder.objects.create(
+            borrower=borrower,
+            trustee=self.gilo,
+            amount=Decimal("1200.00"),
+            start_date=date(2025, 4, 1),
+            status="PENDING",
+            monthly_amount=Decimal("100.00"),
+            charge_day=1,
+        )
+
+    def _ids(self, params):
+        res = self.client.get(self.url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.data)
+        return [item["loan_id"] for item in res.data["results"]]
+
+    def _expected(self, *loans):
+        return [str(loan.loan_id) for loan in loans]
+
+    def test_defaults_to_active_loans(self):
+        self.assertEqual(self._ids({}), self._expected(self.small, self.medium, self.large))
+
+    def test_status_filter(self):
+        self.assertEqual(self._ids({"status": "closed"}), self._expected(self.closed))
+        self.assertEqual(self._ids({"status": "PAID,PENDING"}), self._expected(self.closed, self.pending))
+        self.assertEqual(len(self._ids({"status": "all"})), 5)
+
+        res = self.client.get(self.url, {"status": "CLOSED"})
+        self.assertEqual(res.data["results"][0]["status"], "CLOSED")
+
+    def test_amount_and_date_ranges(self):
+        self.assertEqual(
+            self._ids({"min_amount": "1000", "max_amount": "2000"}),
+            self._expected(self.medium),
+        )
+        self.assertEqual(
+            self._ids({"start_date_from": "2025-02-01", "start_date_to": "2025-03-01"}),
+            self._expected(self.medium, self.large),
+        )
+
+    def test_trustee_and_community(self):
+        self.assertEqual(self._ids({"trustee": str(self.gilo.trustee_id)}), self._expected(self.medium))
+        self.assertEqual(
+            self._ids({"community": "Gilo", "status": "all"}),
+            self._expected(self.medium, self.pending),
+        )
+
+    def test_overdue_only(self):
+        today = timezone.localdate()
+        self.large.start_date = today - timedelta(days=40)
+        self.large.save()
+        create_payment_schedule(self.large, 10)
+        self.small.start_date = today + timedelta(days=5)
+        self.small.save()
+        create_payment_schedule(self.small, 10)
+        refresh_overdue_flags(grace_days=0)
+
+        self.assertEqual(self._ids({"overdue": "true"}), self._expected(self.large))
+
+    def test_ordering_with_cursor(self):
+        ids = []
+        url, params = self.url, {"ordering": "-amount", "status": "all", "page_size": 2}
+        while url:
+            res = self.client.get(url, params)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids += [item["loan_id"] for item in res.data["results"]]
+            url, params = res.data["next"], None
+
+        self.assertEqual(
+            ids,
+            self._expected(self.large, self.medium, self.pending, self.closed, self.small),
+        )
+
+    def test_cursor_must_match_ordering(self):
+        res = self.client.get(self.url, {"ordering": "amount", "page_size": 1})
+        cursor = res.data["next"].split("cursor=")[1]
+
+        res = self.client.get(self.url, {"ordering": "start_date", "cursor": cursor})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_filters(self):
+        for params in (
+            {"status": "LOST"},
+            {"min_amount": "abc"},
+            {"min_amount": "10", "max_amount": "5"},
+            {"start_date_from": "2025-13-01"},
+            {"ordering": "borrower"},
+        ):
+            res = self.client.get(self.url, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST, params)
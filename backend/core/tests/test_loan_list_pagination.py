@@ -0,0 +1,85 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Trustee, Borrower, LoanChecks, LoanStandingOrder
+
+
+class LoanListPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = "/api/loans/"
+
+        t_user = User.objects.create(username="trustee1")
+        self.trustee = Trustee.objects.create(user=t_user, community="Ramot")
+        self.borrower = Borrower.objects.create(
+            trustee=self.trustee,
+            id_number="123456781",
+            address="Jerusalem",
+        )
+
+        # 7 checks + 6 standing orders, interleaved by start_date (with ties)
+        start = date(2025, 1, 1)
+        for i in range(13):
+            common = dict(
+                borrower=self.borrower,
+                trustee=self.trustee,
+                amount=Decimal("1000.00"),
+                start_date=start + timedelta(days=i // 2),
+                status="ACTIVE",
+            )
+            if i % 2 == 0:
+                LoanChecks.objects.create(num_payments=10, **common)
+            else:
+                LoanStandingOrder.objects.create(
+                    monthly_amount=Decimal("100.00"), charge_day=1, **common
+                )
+
+    def _walk_pages(self, page_size):
+        pages = []
+        url = self.url
+        params = {"page_size": page_size}
+        while url:
+            res = self.client.get(url, params)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            pages.append(res.data["results"])
+            url, params = res.data["next"], None
+        return pages
+
+    def test_pages_cover_both_tables_in_keyset_order(self):
+        pages = self._walk_pages(page_size=4)
+
+        self.assertEqual([len(p) for p in pages], [4, 4, 4, 1])
+        items = [item for page in pages for item in page]
+        keys = [(item["start_date"], item["loan_id"]) for item in items]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(set(keys)), 13)
+        self.assertEqual(
+            {item["loan_type"] for item in items},
+            {"checks", "standing_order"},
+        )
+
+    def test_later_pages_cost_the_same_queries_as_first_page(self):
+        with CaptureQueriesContext(connection) as first:
+            res = self.client.get(self.url, {"page_size": 4})
+        next_url = res.data["next"]
+        res = self.client.get(next_url)
+        with CaptureQueriesContext(connection) as later:
+            self.client.get(res.data["next"])
+
+        self.assertEqual(len(later.captured_queries), len(first.captured_queries))
+
+    def test_page_size_is_capped(self):
+        res = self.client.get(self.url, {"page_size": 100000})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 13)
+        self.assertIsNone(res.data["next"])
+
+    def test_invalid_cursor_returns_400(self):
+        res = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,83 @@
+from decimal import Decimal
+from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Trustee, Borrower, LoanChecks, LoanStandingOrder, UserProfile
+
+
+class LoanListQueryCountTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = "/api/loans/"
+
+        # Trustee
+        t_user = User.objects.create_user(username="trustee1", password="x", first_name="Moshe")
+        self.trustee = Trustee.objects.create(
+            user=t_user,
+            community="Ramot",
+        )
+
+    def _create_loans(self, count):
+        """
+        Creates `count` loans of each type, each with its own borrower,
+        borrower user and user profile (the relations read by the list).
+        """
+        start = Borrower.objects.count()
+        for i in range(start, start + count):
+            b_user = User.objects.create(username=f"borrower{i}")
+            UserProfile.objects.create(user=b_user, phone=f"050000{i:04d}")
+            borrower = Borrower.objects.create(
+                user=b_user,
+                trustee=self.trustee,
+                id_number=f"ID{i:07d}",
+                address="Jerusalem",
+            )
+            LoanChecks.objects.create(
+                borrower=borrower,
+                trustee=self.trustee,
+                amount=Decimal("1000.00"),
+                start_date="2025-01-01",
+                status="ACTIVE",
+                num_payments=10,
+            )
+            LoanStandingOrder.objects.create(
+                borrower=borrower,
+                trustee=self.trustee,
+                amount=Decimal("1200.00"),
+                start_date="2025-01-01",
+                status="ACTIVE",
+                monthly_amount=Decimal("100.00"),
+                charge_day=1,
+            )
+
+    def _count_list_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(self.url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries), res
+
+    def test_query_count_does_not_grow_with_row_count(self):
+        self._create_loans(1)
+        small_count, _ = self._count_list_queries()
+
+        self._create_loans(20)
+        large_count, res = self._count_list_queries()
+
+        self.assertEqual(len(res.data["results"]), 42)
+        self.assertEqual(large_count, small_count)
+
+    def test_related_fields_are_resolved_from_joined_rows(self):
+        self._create_loans(1)
+
+        # One LoanRegistry query for both loan types, shared with the ETag
+        with self.assertNumQueries(1):
+            res = self.client.get(self.url)
+
+        item = res.data["results"][0]
+        self.assertEqual(item["borrower"]["phone"], "0500000000")
+        self.assertEqual(item["trustee"]["name"], "Moshe")
+        self.assertEqual(item["trustee"]["community"], "Ramot")
@@ -0,0 +1,100 @@
+from decimal import Decimal
+from django.test import TestCase
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.loan_queries import loan_search_q
+from core.models import Trustee, Borrower, LoanChecks, LoanStandingOrder, LoanRegistry, UserProfile
+
+
+class LoanListSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = "/api/loans/"
+
+        t_user = User.objects.create(username="trustee1", first_name="משה")
+        self.trustee = Trustee.objects.create(user=t_user, community="Ramot")
+
+        # Borrower with own name / phone / email
+        self.yael = Borrower.objects.create(
+            trustee=self.trustee,
+            id_number="111111111",
+            first_name="יעל",
+            last_name="כהן",
+            phone="0501234567",
+            email="Yael@Example.com",
+            address="Jerusalem",
+        )
+
+        # Borrower with empty fields, resolved from the linked user + profile
+        b_user = User.objects.create(
+            username="borrower2", first_name="David", last_name="Levi", email="dl@example.com"
+        )
+        UserProfile.objects.create(user=b_user, phone="0529999999")
+        self.david = Borrower.objects.create(
+            user=b_user,
+            trustee=self.trustee,
+            id_number="222222222",
+            address="Haifa",
+        )
+
+        self.yael_loan = LoanChecks.objects.create(
+            borrower=self.yael,
+            trustee=self.trustee,
+            amount=Decimal("1000.00"),
+            start_date="2025-01-01",
+            status="ACTIVE",
+            num_payments=10,
+        )
+        self.david_loan = LoanStandingOrder.objects.create(
+            borrower=self.david,
+            trustee=None,
+            amount=Decimal("1200.00"),
+            start_date="2025-01-01",
+            status="ACTIVE",
+            monthly_amount=Decimal("100.00"),
+            charge_day=1,
+        )
+
+    def _search(self, term):
+        res = self.client.get(self.url, {"search": term})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return {str(item["loan_id"]) for item in res.data["results"]}
+
+    def test_hebrew_name_substring(self):
+        self.assertEqual(self._search("כה"), {str(self.yael_loan.loan_id)})
+        self.assertEqual(self._search("יעל כהן"), {str(self.yael_loan.loan_id)})
+
+    def test_case_insensitive_email_and_phone(self):
+        self.assertEqual(self._search("yael@example"), {str(self.yael_loan.loan_id)})
+        self.assertEqual(self._search("1234"), {str(self.yael_loan.loan_id)})
+
+    def test_falls_back_to_user_and_profile_fields(self):
+        self.assertEqual(self._search("david levi"), {str(self.david_loan.loan_id)})
+        self.assertEqual(self._search("99999"), {str(self.david_loan.loan_id)})
+        self.assertEqual(self._search("DL@"), {str(self.david_loan.loan_id)})
+
+    def test_trustee_name_and_community(self):
+        self.assertEqual(self._search("משה"), {str(self.yael_loan.loan_id)})
+        self.assertEqual(self._search("ramot"), {str(self.yael_loan.loan_id)})
+
+    def test_no_match_returns_empty_list(self):
+        self.assertEqual(self._search("nobody"), set())
+
+    def test_each_table_is_searched_in_its_own_subquery(self):
+        # An OR across joined tables cannot use the per-table trigram
+        # indexes: every predicate must be a single-table subquery
+        sql = str(LoanRegistry.objects.filter(loan_search_q("david levi")).query).upper()
+
+        self.assertNotIn("JOIN", sql)
+        for table in ("CORE_BORROWER", "AUTH_USER", "CORE_USERPROFILE", "CORE_TRUSTEE"):
+            self.assertIn(f'FROM "{table}"', sql)
+
+    def test_own_name_hides_user_name(self):
+        # The user's name is only a fallback for borrowers without a name
+        b_user = User.objects.create(username="borrower3", first_name="Shadow")
+        self.yael.user = b_user
+        self.yael.save()
+
+        self.assertEqual(self._search("shadow"), set())
@@ -0,0 +1,111 @@
+import uuid
+from decimal import Decimal
+from io import StringIO
+from django.db import transaction
+from django.test import TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Trustee, Borrower, LoanChecks, LoanStandingOrder, LoanRegistry
+from core.loan_registry import LoanIdCollision, resolve_loan
+
+
+class LoanRegistryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        t_user = User.objects.create(username="trustee1")
+        self.trustee = Trustee.objects.create(user=t_user, community="Ramot")
+        self.borrower = Borrower.objects.create(
+            trustee=self.trustee,
+            id_number="123456781",
+            address="Jerusalem",
+        )
+        self.checks = LoanChecks.objects.create(
+            borrower=self.borrower,
+            trustee=self.trustee,
+            amount=Decimal("1000.00"),
+            start_date="2025-01-01",
+            status="ACTIVE",
+            num_payments=10,
+        )
+        self.standing = LoanStandingOrder.objects.create(
+            borrower=self.borrower,
+            trustee=self.trustee,
+            amount=Decimal("1200.00"),
+            start_date="2025-02-01",
+            status="ACTIVE",
+            monthly_amount=Decimal("100.00"),
+            charge_day=1,
+        )
+
+    def test_saves_and_deletes_are_mirrored(self):
+        entry = LoanRegistry.objects.get(loan_id=self.standing.loan_id)
+        self.assertEqual(entry.loan_type, "standing_order")
+        self.assertEqual(entry.amount, Decimal("1200.00"))
+
+        self.standing.status = "PAID"
+        self.standing.save()
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, "PAID")
+
+        self.standing.delete()
+        self.assertFalse(LoanRegistry.objects.filter(loan_id=self.standing.loan_id).exists())
+
+    def test_loan_id_shared_by_both_types_is_rejected(self):
+        with self.assertRaises(LoanIdCollision), transaction.atomic():
+            LoanStandingOrder.objects.create(
+                loan_id=self.checks.loan_id,
+                borrower=self.borrower,
+                trustee=self.trustee,
+                amount=Decimal("500.00"),
+                start_date="2025-03-01",
+                status="ACTIVE",
+                monthly_amount=Decimal("100.00"),
+                charge_day=1,
+            )
+
+        self.assertEqual(LoanRegistry.objects.get(loan_id=self.checks.loan_id).loan_type, "checks")
+        self.assertIsInstance(resolve_loan(self.checks.loan_id), LoanChecks)
+
+    def test_resolve_loan_queries_only_the_right_table(self):
+        with self.assertNumQueries(2):  # registry + loan table
+            loan = resolve_loan(self.standing.loan_id)
+        self.assertIsInstance(loan, LoanStandingOrder)
+
+        with self.assertNumQueries(1):
+            self.assertIsNone(resolve_loan(uuid.uuid4()))
+
+    def test_put_updates_registry(self):
+        payload = {
+            "amount": 3000,
+            "start_date": "2025-03-01",
+            "number_of_payments": 6,
+            "trustee_id": str(self.trustee.trustee_id),
+            "status": "CLOSED",
+        }
+        res = self.client.put(f"/api/loans/{self.checks.loan_id}/", payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        entry = LoanRegistry.objects.get(loan_id=self.checks.loan_id)
+        self.assertEqual(entry.amount, Decimal("3000.00"))
+        self.assertEqual(entry.status, "PAID")
+
+    def test_rebuild_command(self):
+        LoanRegistry.objects.all().delete()
+
+        out = StringIO()
+        call_command("rebuild_loan_registry", stdout=out)
+
+        self.assertIn("Registered 2 loan(s)", out.getvalue())
+        self.assertEqual(LoanRegistry.objects.count(), 2)
+
+    def test_dashboard_summary_reads_registry(self):
+        cache.clear()
+        res = self.client.get("/api/dashboard/loan-summary/")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["active_loans_count"], 2)
+        self.assertEqual(res.data["total_active_loans_amount"], Decimal("2200.00"))
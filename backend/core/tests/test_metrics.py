@@ -0,0 +1,82 @@
+from datetime import date
+from django.test import TestCase
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.metrics import metrics_cache
+from core.models import Trustee
+from core.payment_settlement import settle_due_payments
+
+
+class MetricsEndpointTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics_cache.clear()
+        self.client = APIClient()
+        self.trustee = Trustee.objects.create(user=User.objects.create(username="trustee1"), community="Ramot")
+
+    def _create_loan(self, loan_type, num_payments):
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                "/api/loans/",
+                {
+                    "loan_type": loan_type,
+                    "trustee_id": str(self.trustee.trustee_id),
+                    "borrower": {"id_number": "123456781", "address": "Jerusalem"},
+                    "loan": {"amount": "1200.00", "start_date": "2025-01-01", "num_payments": num_payments},
+                },
+                format="json",
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED, res.data)
+        return res.data
+
+    def _metrics(self):
+        res = self.client.get("/metrics")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res["Content-Type"].startswith("text/plain; version=0.0.4"))
+        return res.content.decode()
+
+    def test_operation_counters(self):
+        self._create_loan("checks", 12)
+        self._create_loan("standing_order", 6)
+        settle_due_payments(date(2025, 2, 15))
+
+        body = self._metrics()
+        self.assertIn('gemach_loans_created_total{loan_type="checks"} 1', body)
+        self.assertIn('gemach_loans_created_total{loan_type="standing_order"} 1', body)
+        self.assertIn("gemach_payments_generated_total 18", body)
+        self.assertIn("gemach_payments_settled_total 4", body)
+        self.assertIn('gemach_job_duration_seconds_count{job="settle_due_payments"} 1', body)
+        self.assertIn('gemach_job_duration_seconds_bucket{le="+Inf",job="settle_due_payments"} 1', body)
+        self.assertIn('gemach_loans{loan_type="checks",status="ACTIVE"} 1', body)
+
+    def test_request_histograms_per_view(self):
+        self.client.get("/api/loans/")
+        self.client.get("/api/loans/")
+        self.client.get("/api/dashboard/loan-summary/")
+        self.client.get("/api/dashboard/loan-summary/")
+
+        body = self._metrics()
+        labels = 'view="LoanListView",method="GET",route="api/loans/"'
+        self.assertIn(f'gemach_http_request_duration_seconds_bucket{{le="+Inf",{labels}}} 2', body)
+        self.assertIn(f"gemach_http_request_duration_seconds_count{{{labels}}} 2", body)
+        self.assertIn(f"gemach_db_queries_total{{{labels}}} 2", body)
+
+        self.assertIn("gemach_dashboard_cache_hits_total 1", body)
+        self.assertIn("gemach_dashboard_cache_misses_total 1", body)
+        self.assertIn("gemach_dashboard_cache_hit_ratio 0.5", body)
+
+    def test_every_family_has_a_type(self):
+        self.client.get("/api/loans/")
+        lines = self._metrics().splitlines()
+
+        types = {line.split()[2] for line in lines if line.startswith("# TYPE")}
+        samples = {line.split("{")[0].split(" ")[0] for line in lines if not line.startswith("#")}
+        for sample in samples:
+            family = sample
+            for suffix in ("_bucket", "_sum", "_count"):
+                if sample.endswith(suffix) and sample[: -len(suffix)] in types:
+                    family = sample[: -len(suffix)]
+            self.assertIn(family, types)
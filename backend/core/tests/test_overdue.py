@@ -0,0 +1,140 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from django.test import TestCase
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.management import call_command
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Trustee, Borrower, LoanChecks, LoanStandingOrder, LoanRegistry, Payment
+from core.overdue import refresh_overdue_flags
+from core.payment_settlement import bounce_payments, settle_due_payments
+from core.schedule_service import create_payment_schedule
+
+
+class OverdueDetectionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+        t_user = User.objects.create(username="trustee1")
+        self.trustee = Trustee.objects.create(user=t_user, community="Ramot")
+        self.borrower = Borrower.objects.create(
+            trustee=self.trustee,
+            id_number="123456781",
+            address="Jerusalem",
+        )
+        # Payments due on the 1st of Jan .. Oct 2025
+        self.late = LoanChecks.objects.create(
+            borrower=self.borrower,
+            trustee=self.trustee,
+            amount=Decimal("1000.00"),
+            start_date=date(2025, 1, 1),
+            status="ACTIVE",
+            num_payments=10,
+        )
+        # Payments due on the 10th of Mar .. May 2025
+        self.recent = LoanStandingOrder.objects.create(
+            borrower=self.borrower,
+            trustee=self.trustee,
+            amount=Decimal("300.00"),
+            start_date=date(2025, 3, 10),
+            status="ACTIVE",
+            monthly_amount=Decimal("100.00"),
+            charge_day=10,
+        )
+        create_payment_schedule(self.late, 10)
+        create_payment_schedule(self.recent, 3)
+
+        # January paid; February onwards still pending
+        Payment.objects.filter(object_id=self.late.loan_id, due_date=date(2025, 1, 1)).update(status=Payment.STATUS_PAID)
+
+    def _overdue_since(self, loan):
+        return LoanRegistry.objects.get(loan_id=loan.loan_id).overdue_since
+
+    def test_grace_period(self):
+        # 2025-03-12: Feb 1 is 39 days late, Mar 10 only 2 (within 7 days of grace)
+        with self.assertNumQueries(1):
+            refresh_overdue_flags(date(2025, 3, 12), grace_days=7)
+
+        self.assertEqual(self._overdue_since(self.late), date(2025, 2, 1))
+        self.assertIsNone(self._overdue_since(self.recent))
+
+        refresh_overdue_flags(date(2025, 3, 20), grace_days=7)
+        self.assertEqual(self._overdue_since(self.recent), date(2025, 3, 10))
+
+    def test_flag_is_cleared_when_paid_or_closed(self):
+        refresh_overdue_flags(date(2025, 3, 20), grace_days=0)
+
+        Payment.objects.filter(object_id=self.late.loan_id, due_date__lt=date(2025, 3, 20)).update(status=Payment.STATUS_PAID)
+        self.recent.status = "PAID"
+        self.recent.save()
+        # A loan save keeps the flag until the next refresh
+        self.assertIsNotNone(self._overdue_since(self.recent))
+
+        refresh_overdue_flags(date(2025, 3, 20), grace_days=0)
+        self.assertIsNone(self._overdue_since(self.late))
+        self.assertIsNone(self._overdue_since(self.recent))
+
+    def test_settled_loans_are_overdue_once_a_payment_bounces(self):
+        # The daily settlement leaves no PENDING payment past its due date
+        settle_due_payments(date(2025, 3, 20))
+        refresh_overdue_flags(date(2025, 3, 20), grace_days=7)
+        self.assertIsNone(self._overdue_since(self.late))
+
+        february = Payment.objects.get(object_id=self.late.loan_id, due_date=date(2025, 2, 1))
+        self.assertEqual(bounce_payments([february.id]), 1)
+
+        february.refresh_from_db()
+        self.assertEqual(february.status, Payment.STATUS_BOUNCED)
+        self.assertEqual(february.amount_paid, 0)
+        self.assertEqual(self._overdue_since(self.late), date(2025, 2, 1))
+        # Only March is still paid (January was marked PAID without an amount)
+        self.assertEqual(
+            LoanRegistry.objects.get(loan_id=self.late.loan_id).outstanding_amount,
+            Decimal("900.00"),
+        )
+
+        # Bounced payments are never settled
+        settle_due_payments(date(2025, 4, 20))
+        february.refresh_from_db()
+        self.assertEqual(february.status, Payment.STATUS_BOUNCED)
+
+    def test_payments_of_another_loan_type_are_ignored(self):
+        # A late payment pointing at the standing order's id, but belonging
+        # to the checks table
+        Payment.objects.create(
+            content_type=ContentType.objects.get_for_model(LoanChecks),
+            object_id=self.recent.loan_id,
+            due_date=date(2025, 1, 1),
+            amount=Decimal("100.00"),
+        )
+
+        refresh_overdue_flags(date(2025, 3, 12), grace_days=7)
+        self.assertIsNone(self._overdue_since(self.recent))
+
+    def test_status_is_exposed_in_list_detail_and_dashboard(self):
+        refresh_overdue_flags(date(2025, 3, 12), grace_days=7)
+
+        res = self.client.get("/api/loans/", {"overdue": "true"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["loan_id"] for item in res.data["results"]], [str(self.late.loan_id)])
+        self.assertEqual(res.data["results"][0]["status"], "OVERDUE")
+        self.assertGreater(res.data["results"][0]["days_overdue"], 0)
+
+        res = self.client.get(f"/api/loans/{self.late.loan_id}/")
+        self.assertEqual(res.data["status"], "OVERDUE")
+        res = self.client.get(f"/api/loans/{self.recent.loan_id}/")
+        self.assertEqual(res.data["status"], "ACTIVE")
+
+        res = self.client.get("/api/dashboard/loan-summary/")
+        self.assertEqual(res.data["overdue_loans_count"], 1)
+
+    def test_command(self):
+        out = StringIO()
+        call_command("refresh_overdue", "--date", "2025-03-12", "--grace-days", "7", stdout=out)
+        self.assertIn("1 overdue loan(s)", out.getvalue())
+        self.assertEqual(self._overdue_since(self.late), date(2025, 2, 1))
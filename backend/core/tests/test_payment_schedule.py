@@ -0,0 +1,53 @@
+from datetime import date
+from decimal import Decimal
+from django.test import SimpleTestCase
+
+from core.payment_schedule import (
+    calculate_payment_dates,
+    calculate_schedule,
+    calculate_schedules,
+    split_amount,
+)
+
+
+class PaymentScheduleEngineTests(SimpleTestCase):
+    def test_remainder_goes_to_last_installment(self):
+        amounts = split_amount(Decimal("1000.00"), 3)
+        self.assertEqual(amounts, [Decimal("333.33"), Decimal("333.33"), Decimal("333.34")])
+        self.assertEqual(sum(amounts), Decimal("1000.00"))
+
+    def test_monthly_dates_cross_year(self):
+        self.assertEqual(
+            calculate_payment_dates(date(2025, 11, 15), 3),
+            [date(2025, 11, 15), date(2025, 12, 15), date(2026, 1, 15)],
+        )
+
+    def test_month_end_is_clamped_without_drift(self):
+        self.assertEqual(
+            calculate_payment_dates(date(2025, 1, 31), 3),
+            [date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 31)],
+        )
+
+    def test_charge_day_for_standing_orders(self):
+        # charge day already passed in the start month -> first charge next month
+        self.assertEqual(
+            calculate_payment_dates(date(2025, 1, 20), 2, charge_day=10),
+            [date(2025, 2, 10), date(2025, 3, 10)],
+        )
+        self.assertEqual(
+            calculate_payment_dates(date(2025, 1, 5), 2, charge_day=10),
+            [date(2025, 1, 10), date(2025, 2, 10)],
+        )
+
+    def test_batch_matches_single(self):
+        loans = [
+            (date(2025, 1, 1), 12, Decimal("1000"), None),
+            (date(2025, 3, 10), 6, Decimal("1200.00"), 10),
+        ]
+        self.assertEqual(
+            calculate_schedules(loans),
+            [calculate_schedule(*loan) for loan in loans],
+        )
+
+    def test_no_payments(self):
+        self.assertEqual(calculate_schedule(date(2025, 1, 1), 0, Decimal("100")), ())
@@ -0,0 +1,79 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Trustee, Borrower, LoanChecks, LoanStandingOrder, Payment
+from core.schedule_service import create_payment_schedules
+
+
+class PaymentScheduleServiceTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        t_user = User.objects.create(username="trustee1")
+        self.trustee = Trustee.objects.create(user=t_user, community="Ramot")
+        self.borrower = Borrower.objects.create(
+            trustee=self.trustee,
+            id_number="123456781",
+            address="Jerusalem",
+        )
+
+    def test_loan_creation_inserts_schedule_in_one_statement(self):
+        payload = {
+            "loan_type": "checks",
+            "borrower": {"id_number": "123456781", "address": "Jerusalem"},
+            "loan": {"amount": "1200.00", "num_payments": 12, "start_date": "2025-01-15"},
+            "trustee_id": str(self.trustee.trustee_id),
+        }
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.post("/api/loans/", payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        payment_inserts = [
+            q for q in ctx.captured_queries
+            if q["sql"].startswith("INSERT") and "core_payment" in q["sql"]
+        ]
+        self.assertEqual(len(payment_inserts), 1)
+
+        payments = Payment.objects.filter(object_id=res.data["loan_id"])
+        self.assertEqual(payments.count(), 12)
+        self.assertEqual(payments.first().due_date, date(2025, 1, 15))
+        self.assertEqual(payments.last().due_date, date(2025, 12, 15))
+
+    def test_batch_api_creates_schedules_for_many_loans(self):
+        checks = LoanChecks.objects.create(
+            borrower=self.borrower,
+            trustee=self.trustee,
+            amount=Decimal("1000.00"),
+            start_date="2025-01-01",
+            status="ACTIVE",
+            num_payments=10,
+        )
+        standing = LoanStandingOrder.objects.create(
+            borrower=self.borrower,
+            trustee=self.trustee,
+            amount=Decimal("600.00"),
+            start_date="2025-03-10",
+            status="ACTIVE",
+            monthly_amount=Decimal("100.00"),
+            charge_day=10,
+        )
+        checks.refresh_from_db()
+        standing.refresh_from_db()
+        ContentType.objects.get_for_models(LoanChecks, LoanStandingOrder)  # warm cache
+
+        # one bulk INSERT, then the balance UPDATEs (loan table + registry per
+        # loan type), in a savepoint
+        with self.assertNumQueries(7):
+            created = create_payment_schedules([(checks, 10), (standing, 6)])
+
+        self.assertEqual(len(created), 16)
+        self.assertEqual(Payment.objects.filter(object_id=checks.loan_id).count(), 10)
+        self.assertEqual(Payment.objects.filter(object_id=standing.loan_id).count(), 6)
@@ -0,0 +1,65 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.core.management import call_command
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Trustee, Borrower, LoanChecks, Payment
+from core.payment_settlement import settle_due_payments
+from core.schedule_service import create_payment_schedule
+
+
+class PaymentSettlementTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        t_user = User.objects.create(username="trustee1")
+        self.trustee = Trustee.objects.create(user=t_user, community="Ramot")
+        self.borrower = Borrower.objects.create(
+            trustee=self.trustee,
+            id_number="123456781",
+            address="Jerusalem",
+        )
+        self.loan = LoanChecks.objects.create(
+            borrower=self.borrower,
+            trustee=self.trustee,
+            amount=Decimal("1000.00"),
+            start_date=date(2025, 1, 1),
+            status="ACTIVE",
+            num_payments=10,
+        )
+        create_payment_schedule(self.loan, 10)  # due 2025-01-01 .. 2025-10-01
+
+    def test_settles_only_due_pending_payments(self):
+        settled = settle_due_payments(date(2025, 3, 15))
+        self.assertEqual(settled, 3)
+
+        paid = Payment.objects.filter(status=Payment.STATUS_PAID)
+        self.assertEqual(paid.count(), 3)
+        for payment in paid:
+            self.assertEqual(payment.amount_paid, payment.amount)
+            self.assertIsNotNone(payment.paid_at)
+
+    def test_is_idempotent(self):
+        settle_due_payments(date(2025, 3, 15))
+        self.assertEqual(settle_due_payments(date(2025, 3, 15)), 0)
+        self.assertEqual(Payment.objects.filter(status=Payment.STATUS_PAID).count(), 3)
+
+    def test_management_command(self):
+        out = StringIO()
+        call_command("settle_due_payments", "--date", "2025-02-01", stdout=out)
+        self.assertIn("Settled 2 payment(s)", out.getvalue())
+
+    def test_payments_get_is_read_only(self):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(f"/api/loans/{self.loan.loan_id}/payments")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        writes = [q for q in ctx.captured_queries if q["sql"].startswith(("UPDATE", "INSERT"))]
+        self.assertEqual(writes, [])
+        self.assertEqual(Payment.objects.filter(status=Payment.STATUS_PAID).count(), 0)
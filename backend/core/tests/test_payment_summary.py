@@ -0,0 +1,59 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Trustee, Borrower, LoanChecks
+from core.payment_settlement import settle_due_payments
+from core.schedule_service import create_payment_schedule
+
+
+class LoanPaymentsSummaryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        t_user = User.objects.create(username="trustee1")
+        self.trustee = Trustee.objects.create(user=t_user, community="Ramot")
+        self.borrower = Borrower.objects.create(
+            trustee=self.trustee,
+            id_number="123456781",
+            address="Jerusalem",
+        )
+        self.loan = LoanChecks.objects.create(
+            borrower=self.borrower,
+            trustee=self.trustee,
+            amount=Decimal("1000.00"),
+            start_date=date(2025, 1, 1),
+            status="ACTIVE",
+            num_payments=10,
+        )
+        create_payment_schedule(self.loan, 10)
+        settle_due_payments(date(2025, 3, 15))
+
+        self.url = f"/api/loans/{self.loan.loan_id}/payments"
+        ContentType.objects.get_for_model(LoanChecks)  # warm cache
+
+    def test_summary_and_rows(self):
+        # ETag (2) + loan lookups (2) + aggregate (1) + rows (1)
+        with self.assertNumQueries(6):
+            res = self.client.get(self.url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(res.data["summary"], {
+            "total_amount": Decimal("1000.00"),
+            "paid_amount": Decimal("300.00"),
+            "total_payments": 10,
+            "paid_payments": 3,
+        })
+        self.assertEqual(len(res.data["payments"]), 10)
+
+    def test_summary_only_skips_rows(self):
+        with self.assertNumQueries(5):
+            res = self.client.get(self.url, {"summary_only": "1"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.assertNotIn("payments", res.data)
+        self.assertEqual(res.data["summary"]["paid_payments"], 3)
@@ -0,0 +1,117 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from django.test import TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Trustee, Borrower, LoanChecks, LoanStandingOrder, Payment
+from core.overdue import refresh_overdue_flags
+from core.payment_settlement import bounce_payments, settle_due_payments
+from core.portfolio_stats import refresh_portfolio_statistics
+from core.schedule_service import create_payment_schedule
+
+
+class PortfolioStatisticsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = "/api/dashboard/portfolio/"
+
+        t_user = User.objects.create(username="trustee1", first_name="Moshe", last_name="Levi")
+        self.trustee = Trustee.objects.create(user=t_user, community="Ramot")
+        self.borrower = Borrower.objects.create(
+            trustee=self.trustee,
+            id_number="123456781",
+            address="Jerusalem",
+        )
+
+        # 10 x 100, due 2025-01-01 .. 2025-10-01
+        self.checks = LoanChecks.objects.create(
+            borrower=self.borrower,
+            trustee=self.trustee,
+            amount=Decimal("1000.00"),
+            start_date=date(2025, 1, 1),
+            status="ACTIVE",
+            num_payments=10,
+        )
+        create_payment_schedule(self.checks, 10)
+
+        # 6 x 200, due 2025-03-10 .. 2025-08-10, no trustee
+        self.standing = LoanStandingOrder.objects.create(
+            borrower=self.borrower,
+            trustee=None,
+            amount=Decimal("1200.00"),
+            start_date=date(2025, 3, 10),
+            status="ACTIVE",
+            monthly_amount=Decimal("200.00"),
+            charge_day=10,
+        )
+        create_payment_schedule(self.standing, 6)
+
+        # Collected: checks Jan-Feb (200), standing none
+        settle_due_payments(date(2025, 2, 28))
+
+    def test_refresh_and_endpoint(self):
+        out = StringIO()
+        call_command("refresh_portfolio_stats", "--date", "2025-04-01", stdout=out)
+        self.assertIn("Wrote", out.getvalue())
+
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        totals = res.data["totals"]
+        self.assertEqual(totals["loans_count"], 2)
+        self.assertEqual(Decimal(totals["principal_amount"]), Decimal("2200.00"))
+        self.assertEqual(Decimal(totals["collected_amount"]), Decimal("200.00"))
+        self.assertEqual(Decimal(totals["outstanding_amount"]), Decimal("2000.00"))
+        # overdue on 2025-04-01: checks Mar (100) + standing Mar (200)
+        self.assertEqual(Decimal(totals["overdue_amount"]), Decimal("300.00"))
+        self.assertEqual(totals["overdue_payments_count"], 2)
+        # due 2025-04-01 .. 2025-05-01: checks Apr + May (200), standing Apr (200)
+        self.assertEqual(Decimal(totals["due_next_30_days_amount"]), Decimal("400.00"))
+
+        by_type = {row["key"]: row for row in res.data["by_loan_type"]}
+        self.assertEqual(Decimal(by_type["standing_order"]["principal_amount"]), Decimal("1200.00"))
+
+        by_trustee = {row["label"]: row for row in res.data["by_trustee"]}
+        self.assertEqual(by_trustee["Moshe Levi"]["loans_count"], 1)
+        self.assertEqual(by_trustee[""]["loans_count"], 1)
+
+        self.assertEqual([row["key"] for row in res.data["by_community"]], ["", "Ramot"])
+
+    def test_overdue_matches_the_registry_flag(self):
+        # 2025-03-15, 7 days of grace: checks Mar 1 is overdue, standing Mar 10 not yet
+        refresh_portfolio_statistics(date(2025, 3, 15))
+        totals = self.client.get(self.url).data["totals"]
+        self.assertEqual(Decimal(totals["overdue_amount"]), Decimal("100.00"))
+        self.assertEqual(totals["overdue_payments_count"], 1)
+
+        # A bounced (settled, then returned) payment is overdue at once
+        settle_due_payments(date(2025, 3, 15))
+        bounce_payments(Payment.objects.filter(object_id=self.standing.loan_id, due_date=date(2025, 3, 10)).values("id"))
+        refresh_overdue_flags(date(2025, 3, 15))
+        refresh_portfolio_statistics(date(2025, 3, 15))
+
+        totals = self.client.get(self.url).data["totals"]
+        self.assertEqual(Decimal(totals["overdue_amount"]), Decimal("200.00"))
+        self.assertEqual(Decimal(totals["collected_amount"]), Decimal("300.00"))
+        self.assertEqual(
+            self.client.get("/api/dashboard/loan-summary/").data["overdue_loans_count"], 1
+        )
+
+    def test_endpoint_reads_summary_table_only(self):
+        refresh_portfolio_statistics(date(2025, 4, 1))
+        Payment.objects.all().delete()
+
+        with self.assertNumQueries(1):
+            res = self.client.get(self.url)
+        self.assertEqual(res.data["totals"]["loans_count"], 2)
+
+    def test_empty_before_first_refresh(self):
+        res = self.client.get(self.url)
+        self.assertIsNone(res.data["totals"])
+        self.assertIsNone(res.data["refreshed_at"])
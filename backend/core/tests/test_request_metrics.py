@@ -0,0 +1,117 @@
+import json
+from decimal import Decimal
+from django.test import TestCase, override_settings
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Trustee, Borrower, LoanChecks
+from core.metrics import metrics_cache
+from core.request_metrics import ROUTE_COUNT_KEY, _key, flush_request_metrics, record_request, route_counters
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        flush_request_metrics(force=True)
+        cache.clear()
+        metrics_cache.clear()
+        self.client = APIClient()
+
+        trustee = Trustee.objects.create(user=User.objects.create(username="trustee1"), community="Ramot")
+        borrower = Borrower.objects.create(trustee=trustee, id_number="123456781", address="Jerusalem")
+        self.loan = LoanChecks.objects.create(
+            borrower=borrower,
+            trustee=trustee,
+            amount=Decimal("1000.00"),
+            start_date="2025-01-01",
+            status="ACTIVE",
+            num_payments=10,
+        )
+
+        self.admin = User.objects.create(username="admin", is_staff=True)
+
+    def test_server_timing_header(self):
+        res = self.client.get("/api/loans/")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        timing = res["Server-Timing"]
+        self.assertIn('desc="1 queries"', timing)
+        self.assertIn("render;dur=", timing)
+        self.assertIn("total;dur=", timing)
+
+    def test_histograms_per_route(self):
+        for _ in range(3):
+            self.client.get(f"/api/loans/{self.loan.loan_id}/")
+        self.client.get("/api/loans/")
+
+        self.client.force_authenticate(self.admin)
+        res = self.client.get("/api/admin/request-metrics/")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        routes = {row["route"]: row for row in res.data["routes"]}
+        detail = routes["GET api/loans/<uuid:loan_id>/"]
+        self.assertEqual(detail["requests"], 3)
+        self.assertEqual(detail["avg_queries"], 3)
+        self.assertEqual(detail["histogram"][-1], {"le": "+Inf", "count": 3})
+        self.assertEqual(routes["GET api/loans/"]["requests"], 1)
+
+        res = self.client.delete("/api/admin/request-metrics/")
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        res = self.client.get("/api/admin/request-metrics/")
+        # Only the DELETE itself, recorded after the reset
+        self.assertEqual([row["route"] for row in res.data["routes"]], ["DELETE api/admin/request-metrics/"])
+
+    @override_settings(METRICS_FLUSH_SECONDS=3600)
+    def test_counters_are_buffered_until_flushed(self):
+        flush_request_metrics(force=True)
+        route = "GET api/loans/"
+
+        self.client.get("/api/loans/")
+        self.client.get("/api/loans/")
+        # No cache write per request
+        self.assertIsNone(metrics_cache.get(_key(route, "requests")))
+
+        rows = {row["route"]: row for row in route_counters()}
+        self.assertEqual(rows[route]["counters"]["requests"], 2)
+        self.assertEqual(metrics_cache.get(_key(route, "requests")), 2)
+
+    def test_each_route_gets_its_own_index_slot(self):
+        self.client.get("/api/loans/")
+        self.client.get(f"/api/loans/{self.loan.loan_id}/")
+        flush_request_metrics(force=True)
+
+        self.assertEqual(metrics_cache.get(ROUTE_COUNT_KEY), 2)
+        self.assertEqual(
+            {row["route"] for row in route_counters()},
+            {"GET api/loans/", "GET api/loans/<uuid:loan_id>/"},
+        )
+
+    def test_many_routes_are_not_culled(self):
+        # Well past the 300 entries of a default local-memory cache
+        for n in range(100):
+            record_request(f"GET api/route-{n}/", "View", 200, 0.01, 0.001, 0.001, 1)
+        flush_request_metrics(force=True)
+
+        rows = route_counters()
+        self.assertEqual(len(rows), 100)
+        self.assertTrue(all(row["counters"]["requests"] == 1 for row in rows))
+
+    def test_metrics_are_staff_only(self):
+        res = self.client.get("/api/admin/request-metrics/")
+        self.assertIn(res.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+        self.client.force_authenticate(User.objects.create(username="user1"))
+        res = self.client.get("/api/admin/request-metrics/")
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged(self):
+        with self.assertLogs("core.requests", level="WARNING") as logs:
+            self.client.get("/api/loans/checks/")
+
+        record = json.loads(logs.records[0].getMessage().split(" ", 2)[2])
+        self.assertEqual(record["route"], "GET api/loans/checks/$")
+        self.assertEqual(record["status"], 200)
+        self.assertGreaterEqual(record["queries"], 1)
+        self.assertIn("repeated_statements", record)
@@ -0,0 +1,154 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Trustee, Borrower, LoanChecks, Payment
+from core.payment_settlement import bounce_payments, settle_due_payments
+from core.schedule_service import create_payment_schedule, sync_payment_schedule
+
+
+class PaymentScheduleSyncTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        t_user = User.objects.create(username="trustee1")
+        self.trustee = Trustee.objects.create(user=t_user, community="Ramot")
+        self.borrower = Borrower.objects.create(
+            trustee=self.trustee,
+            id_number="123456781",
+            address="Jerusalem",
+        )
+        # 10 x 100, due 2025-01-01 .. 2025-10-01; Jan + Feb paid
+        self.loan = LoanChecks.objects.create(
+            borrower=self.borrower,
+            trustee=self.trustee,
+            amount=Decimal("1000.00"),
+            start_date=date(2025, 1, 1),
+            status="ACTIVE",
+            num_payments=10,
+        )
+        create_payment_schedule(self.loan, 10)
+        settle_due_payments(date(2025, 2, 1))
+        self.paid_before = list(
+            Payment.objects.filter(status=Payment.STATUS_PAID).values_list("id", "due_date", "amount", "paid_at")
+        )
+
+    def _payments(self):
+        return list(Payment.objects.filter(object_id=self.loan.loan_id).order_by("due_date"))
+
+    def _assert_paid_untouched(self):
+        self.assertEqual(
+            list(Payment.objects.filter(status=Payment.STATUS_PAID).values_list("id", "due_date", "amount", "paid_at")),
+            self.paid_before,
+        )
+
+    def test_unchanged_loan_writes_nothing(self):
+        with CaptureQueriesContext(connection) as ctx:
+            result = sync_payment_schedule(self.loan, 10)
+
+        self.assertEqual(result, {"updated": 0, "created": 0, "deleted": 0})
+        self.assertFalse([q for q in ctx.captured_queries if q["sql"].startswith(("UPDATE", "INSERT", "DELETE"))])
+
+    def test_more_payments_inserts_and_rebalances_pending(self):
+        self.loan.amount = Decimal("1400.00")
+        result = sync_payment_schedule(self.loan, 12)
+
+        self.assertEqual(result, {"updated": 8, "created": 2, "deleted": 0})
+        payments = self._payments()
+        self.assertEqual(len(payments), 12)
+        self.assertEqual(sum(p.amount for p in payments), Decimal("1400.00"))
+        self.assertEqual(payments[-1].due_date, date(2025, 12, 1))
+        self._assert_paid_untouched()
+
+    def test_fewer_payments_deletes_surplus_pending_only(self):
+        result = sync_payment_schedule(self.loan, 5)
+
+        self.assertEqual(result["deleted"], 5)
+        payments = self._payments()
+        self.assertEqual(len(payments), 5)
+        self.assertEqual(sum(p.amount for p in payments), Decimal("1000.00"))
+        self._assert_paid_untouched()
+
+    def test_put_syncs_schedule(self):
+        payload = {
+            "amount": 1200,
+            "start_date": "2025-01-01",
+            "number_of_payments": 12,
+            "trustee_id": str(self.trustee.trustee_id),
+            "status": "ACTIVE",
+        }
+        res = self.client.put(f"/api/loans/{self.loan.loan_id}/", payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        payments = self._payments()
+        self.assertEqual(len(payments), 12)
+        self.assertEqual(sum(p.amount for p in payments), Decimal("1200.00"))
+        self._assert_paid_untouched()
+
+    def test_paid_payment_beyond_the_cut_is_kept_and_counted(self):
+        # The July installment was paid early
+        july = self._payments()[6]
+        Payment.objects.filter(id=july.id).update(status=Payment.STATUS_PAID, amount_paid=july.amount)
+        self.paid_before = list(
+            Payment.objects.filter(status=Payment.STATUS_PAID).values_list("id", "due_date", "amount", "paid_at")
+        )
+
+        sync_payment_schedule(self.loan, 5)
+
+        payments = self._payments()
+        self.assertEqual(len(payments), 5)
+        self.assertIn(july.id, [p.id for p in payments])
+        self.assertEqual(sum(p.amount for p in payments), Decimal("1000.00"))
+        self._assert_paid_untouched()
+
+    def test_fewer_payments_than_paid_is_rejected(self):
+        with self.assertRaises(ValueError):
+            sync_payment_schedule(self.loan, 1)
+
+        payload = {
+            "amount": 1000,
+            "start_date": "2025-01-01",
+            "number_of_payments": 1,
+            "trustee_id": str(self.trustee.trustee_id),
+            "status": "ACTIVE",
+        }
+        res = self.client.put(f"/api/loans/{self.loan.loan_id}/", payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("number_of_payments", res.data)
+        self.assertEqual(len(self._payments()), 10)
+
+    def test_bounced_payments_are_kept_like_paid_ones(self):
+        # The paid Feb payment and the Aug one (beyond the new cut) bounce
+        payments = self._payments()
+        bounce_payments([payments[1].id, payments[7].id])
+        bounced_before = list(
+            Payment.objects.filter(status=Payment.STATUS_BOUNCED).values_list("id", "due_date", "amount")
+        )
+
+        self.loan.amount = Decimal("1500.00")
+        sync_payment_schedule(self.loan, 4)
+
+        self.assertEqual(
+            list(Payment.objects.filter(status=Payment.STATUS_BOUNCED).values_list("id", "due_date", "amount")),
+            bounced_before,
+        )
+        payments = self._payments()
+        self.assertEqual(len(payments), 4)
+        self.assertEqual(sum(p.amount for p in payments), Decimal("1500.00"))
+
+        # Jan paid + 2 bounced: 3 payments can no longer be dropped
+        payload = {
+            "amount": 1500,
+            "start_date": "2025-01-01",
+            "number_of_payments": 2,
+            "trustee_id": str(self.trustee.trustee_id),
+            "status": "ACTIVE",
+        }
+        res = self.client.put(f"/api/loans/{self.loan.loan_id}/", payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("number_of_payments", res.data)
@@ -0,0 +1,114 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from core.loan_balances import reconcile_loan_balances
+from core.management.commands.bench_api import ENDPOINTS, percentile
+from core.models import Borrower, LoanChecks, LoanRegistry, LoanStandingOrder, Payment, Trustee
+
+
+class SeedLoansCommandTests(TestCase):
+    def test_creates_borrowers_loans_and_schedules(self):
+        out = StringIO()
+        call_command("seed_loans", borrowers=20, loans=60, seed=1, batch_size=25, stdout=out)
+
+        self.assertEqual(Trustee.objects.count(), 1)
+        self.assertEqual(Borrower.objects.count(), 20)
+        self.assertEqual(LoanChecks.objects.count() + LoanStandingOrder.objects.count(), 60)
+        self.assertEqual(LoanRegistry.objects.count(), 60)
+        self.assertTrue(LoanChecks.objects.exists())
+        self.assertTrue(LoanStandingOrder.objects.exists())
+
+        # Every loan has its schedule, PAID loans are fully paid
+        self.assertEqual(
+            Payment.objects.values("object_id").distinct().count(), 60
+        )
+        for entry in LoanRegistry.objects.filter(status="PAID"):
+            self.assertEqual(entry.outstanding_amount, 0)
+
+        # Balance columns were maintained by the seeding
+        balances = list(LoanRegistry.objects.order_by("loan_id").values_list("paid_amount", "outstanding_amount"))
+        reconcile_loan_balances()
+        self.assertEqual(
+            list(LoanRegistry.objects.order_by("loan_id").values_list("paid_amount", "outstanding_amount")),
+            balances,
+        )
+
+    def _seeded_data(self):
+        return (
+            sorted(LoanRegistry.objects.values_list("loan_id", "amount", "start_date", "status", "borrower_id")),
+            sorted(Payment.objects.values_list("id", "object_id", "due_date", "status")),
+            sorted(Trustee.objects.values_list("trustee_id", "user__username", "community")),
+        )
+
+    def test_same_seed_same_data(self):
+        call_command("seed_loans", borrowers=5, loans=10, seed=7, stdout=StringIO())
+        first = self._seeded_data()
+
+        LoanChecks.objects.all().delete()
+        LoanStandingOrder.objects.all().delete()
+        Payment.objects.all().delete()
+        Borrower.objects.all().delete()
+        Trustee.objects.all().delete()
+        User.objects.all().delete()
+        call_command("seed_loans", borrowers=5, loans=10, seed=7, stdout=StringIO())
+
+        self.assertEqual(self._seeded_data(), first)
+
+    def test_loans_without_borrowers_is_an_error(self):
+        with self.assertRaises(CommandError):
+            call_command("seed_loans", borrowers=0, loans=10, stdout=StringIO())
+
+
+class BenchApiCommandTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _bench(self, **options):
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+            path = f.name
+        self.addCleanup(os.unlink, path)
+
+        call_command(
+            "bench_api", sizes=[40, 80], requests=2, heavy_requests=1,
+            output=path, stdout=StringIO(), stderr=StringIO(), **options
+        )
+        with open(path, encoding="utf-8") as f:
+            return path, json.load(f)
+
+    def test_report_covers_every_endpoint_and_size(self):
+        _, report = self._bench()
+
+        self.assertEqual(set(report["sizes"]), {"40", "80"})
+        for results in report["sizes"].values():
+            self.assertEqual(set(results), {endpoint[0] for endpoint in ENDPOINTS})
+            self.assertEqual(results["loans.list.not_modified"]["status"], 304)
+            self.assertEqual(results["loans.detail"]["path"], "/api/loans/{loan_id}/")
+            for result in results.values():
+                self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+                self.assertGreater(result["queries"], 0)
+
+        # Seeded rows are rolled back
+        self.assertEqual(LoanRegistry.objects.count(), 0)
+
+    def test_baseline_query_regression_fails(self):
+        path, report = self._bench(endpoints=["dashboard."])
+        report["sizes"]["40"]["dashboard.portfolio"]["queries"] = 0
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f)
+
+        with self.assertRaisesMessage(CommandError, "dashboard.portfolio"):
+            self._bench(endpoints=["dashboard."], baseline=path, tolerance=10_000)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([5], 95), 5)
@@ -0,0 +1,34 @@
+import uuid
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.loan_balances import reconcile_loan_balances
+from core.models import Trustee, Borrower, LoanChecks, LoanStandingOrder, LoanRegistry
+
+
+class SeedFixtureTests(TestCase):
+    def test_seed_data_loads(self):
+        call_command("loaddata", "seed_data", verbosity=0)
+
+        self.assertEqual(Trustee.objects.count(), 3)
+        self.assertEqual(Borrower.objects.count(), 3)
+        self.assertEqual(LoanChecks.objects.count(), 3)
+        self.assertEqual(LoanStandingOrder.objects.count(), 3)
+        self.assertFalse(Trustee.objects.filter(updated_at__isnull=True).exists())
+
+        # Every loan has its own registry row, with reconciled balances
+        self.assertEqual(LoanRegistry.objects.filter(loan_type="checks").count(), 3)
+        self.assertEqual(LoanRegistry.objects.filter(loan_type="standing_order").count(), 3)
+        balances = list(LoanRegistry.objects.order_by("loan_id").values_list("paid_amount", "outstanding_amount"))
+        reconcile_loan_balances()
+        self.assertEqual(
+            list(LoanRegistry.objects.order_by("loan_id").values_list("paid_amount", "outstanding_amount")),
+            balances,
+        )
+
+        client = APIClient()
+        self.assertEqual(len(client.get("/api/loans/", {"status": "all"}).data["results"]), 6)
+        res = client.get(f"/api/loans/{uuid.UUID(int=1)}/")
+        self.assertEqual(res.data["loan_type"], "checks")
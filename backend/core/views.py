@@ -1,7 +1,10 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.conf import settings
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from django.db.models import Sum
 
 from .models import (
     Borrower,
@@ -9,7 +12,8 @@ from .models import (
     LoanChecks,
     LoanStandingOrder,
     Role,
-    UserProfile
+    UserProfile,
+    PortfolioStatistic,
 )
 from .serializers import (
     BorrowerSerializer,
@@ -17,61 +21,150 @@ from .serializers import (
     LoanChecksSerializer,
     LoanStandingOrderSerializer,
     RoleSerializer,
-    UserProfileSerializer
+    UserProfileSerializer,
+    PortfolioStatisticSerializer,
 )
+from .dashboard_cache import get_dashboard_summary
+from .loan_balances import refresh_loan_balances
+from .borrower_exposure import borrower_exposure
+from .request_metrics import DURATION_BUCKETS_MS, reset_route_metrics, route_metrics
 
 
+# CRUD ViewSets: list responses are paginated (see core.pagination) and
+# accept ?fields= to return only some columns (see SparseFieldsMixin).
+
 class RoleViewSet(viewsets.ModelViewSet):
-    queryset = Role.objects.all()
+    queryset = Role.objects.order_by("name")
     serializer_class = RoleSerializer
 
 
 class UserProfileViewSet(viewsets.ModelViewSet):
-    queryset = UserProfile.objects.all()
+    queryset = UserProfile.objects.order_by("id")
     serializer_class = UserProfileSerializer
 
 
 class BorrowerViewSet(viewsets.ModelViewSet):
-    queryset = Borrower.objects.all()
+    # user_details is nested: join the user instead of one query per row
+    queryset = Borrower.objects.select_related("user").order_by("created_at", "borrower_id")
     serializer_class = BorrowerSerializer
 
+    @action(detail=True, methods=["get"])
+    def exposure(self, request, pk=None):
+        """
+        GET /api/borrowers/{id}/exposure/
+        All the borrower's loans with their balances, and the borrower's
+        totals, in one query (see core.borrower_exposure).
+        """
+        try:
+            exposure = borrower_exposure(pk)
+        except DjangoValidationError:
+            exposure = None  # not a UUID
+
+        if exposure is None:
+            return Response({"detail": "Borrower not found"}, status=404)
+        return Response(exposure)
+
 
 class TrusteeViewSet(viewsets.ModelViewSet):
-    queryset = Trustee.objects.all()
+    queryset = Trustee.objects.select_related("user").order_by("community", "trustee_id")
     serializer_class = TrusteeSerializer
 
 
-class LoanChecksViewSet(viewsets.ModelViewSet):
-    queryset = LoanChecks.objects.all()
+class LoanBalancesMixin:
+    """
+    Loans written here (no schedule sync) still need their balance columns
+    recomputed, e.g. when the amount changed. The response shows the new values.
+    """
+
+    def _refresh_balances(self, loan):
+        refresh_loan_balances([loan])
+        loan.refresh_from_db(fields=loan.BALANCE_FIELDS)
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        self._refresh_balances(serializer.instance)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self._refresh_balances(serializer.instance)
+
+
+class LoanChecksViewSet(LoanBalancesMixin, viewsets.ModelViewSet):
+    queryset = LoanChecks.objects.order_by("start_date", "loan_id")
     serializer_class = LoanChecksSerializer
 
 
-class LoanStandingOrderViewSet(viewsets.ModelViewSet):
-    queryset = LoanStandingOrder.objects.all()
+class LoanStandingOrderViewSet(LoanBalancesMixin, viewsets.ModelViewSet):
+    queryset = LoanStandingOrder.objects.order_by("start_date", "loan_id")
     serializer_class = LoanStandingOrderSerializer
 
 
 class DashboardLoanSummaryView(APIView):
     """
     GET /api/dashboard/loan-summary/
-    Returns aggregated data for the Home dashboard.
+    Returns aggregated data for the Home dashboard (cached, see core.dashboard_cache).
+    """
+
+    def get(self, request):
+        # Served from the cache; invalidated whenever a loan is written
+        summary = get_dashboard_summary()
+
+        return Response({
+            "active_loans_count": summary["active_loans_count"],
+            "total_active_loans_amount": summary["total_active_loans_amount"],
+            "overdue_loans_count": summary["overdue_loans_count"],
+        })
+
+
+class PortfolioStatisticsView(APIView):
+    """
+    GET /api/dashboard/portfolio/
+    Returns the portfolio statistics of ACTIVE loans (outstanding principal,
+    collected, due in the next 30 days, overdue), in total and broken down
+    by loan type, trustee and community.
+
+    Figures are read from the PortfolioStatistic summary table, recomputed
+    by `manage.py refresh_portfolio_stats` - not aggregated per request.
     """
 
     def get(self, request):
-        active_checks = LoanChecks.objects.filter(status="ACTIVE")
-        active_standing_orders = LoanStandingOrder.objects.filter(status="ACTIVE")
+        rows = list(PortfolioStatistic.objects.order_by("dimension", "label", "key"))
 
-        active_loans_count = (
-            active_checks.count() +
-            active_standing_orders.count()
-        )
+        def section(dimension):
+            return PortfolioStatisticSerializer(
+                [row for row in rows if row.dimension == dimension], many=True
+            ).data
 
-        total_active_loans_amount = (
-            (active_checks.aggregate(total=Sum("amount"))["total"] or 0) +
-            (active_standing_orders.aggregate(total=Sum("amount"))["total"] or 0)
-        )
+        totals = section(PortfolioStatistic.DIMENSION_TOTAL)
 
         return Response({
-            "active_loans_count": active_loans_count,
-            "total_active_loans_amount": total_active_loans_amount
+            "refreshed_at": rows[0].refreshed_at if rows else None,
+            "totals": totals[0] if totals else None,
+            "by_loan_type": section(PortfolioStatistic.DIMENSION_LOAN_TYPE),
+            "by_trustee": section(PortfolioStatistic.DIMENSION_TRUSTEE),
+            "by_community": section(PortfolioStatistic.DIMENSION_COMMUNITY),
         })
+
+
+class RequestMetricsView(APIView):
+    """
+    GET    /api/admin/request-metrics/
+    Per-route request histograms recorded by RequestMetricsMiddleware
+    (request / error counts, average wall / SQL / rendering time, average
+    query count, wall-time buckets), slowest total first.
+
+    DELETE /api/admin/request-metrics/ resets them.
+    Staff users only.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            "buckets_ms": list(DURATION_BUCKETS_MS),
+            "slow_request_ms": settings.SLOW_REQUEST_MS,
+            "routes": route_metrics(),
+        })
+
+    def delete(self, request):
+        reset_route_metrics()
+        return Response(status=204)
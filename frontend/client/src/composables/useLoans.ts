@@ -26,20 +26,25 @@ export function useLoans() {
   // Tracks if initial fetch has been done
   const initialFetchDone = ref(false);
 
+  // Cursor pagination: URL of the next page (null when on the last page)
+  const nextPageUrl: Ref<string | null> = ref(null);
+  const loadingMore = ref(false);
+
   /**
-   * Fetch loans from API with current filters.
+   * Fetch the first page of loans from API with current filters.
    */
   const fetchLoans = async (): Promise<void> => {
     loading.value = true;
     error.value = null;
 
     try {
-      const data = await loanService.getActiveLoans(filters.value);
-      loans.value = data;
+      const page = await loanService.getActiveLoans(filters.value);
+      loans.value = page.items;
+      nextPageUrl.value = page.next;
       initialFetchDone.value = true;
 
       if (import.meta.env.DEV) {
-        console.log("[useLoans] Fetched", data.length, "loans", filters.value);
+        console.log("[useLoans] Fetched", page.items.length, "loans", filters.value);
       }
     } catch (e: any) {
       console.error("[useLoans] Failed to fetch loans:", e);
@@ -59,11 +64,40 @@ export function useLoans() {
       }
 
       loans.value = [];
+      nextPageUrl.value = null;
     } finally {
       loading.value = false;
     }
   };
 
+  /**
+   * Fetch the next page (following the server cursor) and append it.
+   */
+  const loadMore = async (): Promise<void> => {
+    if (!nextPageUrl.value || loadingMore.value) return;
+
+    loadingMore.value = true;
+    error.value = null;
+
+    try {
+      const page = await loanService.getNextLoansPage(nextPageUrl.value);
+      loans.value = [...loans.value, ...page.items];
+      nextPageUrl.value = page.next;
+
+      if (import.meta.env.DEV) {
+        console.log("[useLoans] Loaded", page.items.length, "more loans");
+      }
+    } catch (e: any) {
+      console.error("[useLoans] Failed to load more loans:", e);
+      error.value =
+        e?.response?.data?.detail ||
+        e?.message ||
+        "Failed to load loans";
+    } finally {
+      loadingMore.value = false;
+    }
+  };
+
   /**
    * Update a specific filter and refetch loans.
    */
@@ -141,6 +175,8 @@ export function useLoans() {
   // Computed properties
   const hasLoans = computed(() => loans.value.length > 0);
 
+  const hasMore = computed(() => nextPageUrl.value !== null);
+
   const hasActiveFilters: ComputedRef<boolean> = computed(() => {
     return (
       filters.value.type !== "all" ||
@@ -209,9 +245,12 @@ export function useLoans() {
     error,
     filters,
     initialFetchDone,
+    nextPageUrl,
+    loadingMore,
 
     // Computed
     hasLoans,
+    hasMore,
     hasActiveFilters,
     totalAmount,
     loansByType,
@@ -222,6 +261,7 @@ export function useLoans() {
 
     // Methods
     fetchLoans,
+    loadMore,
     setFilter,
     setFilters,
     resetFilters,
@@ -6,7 +6,7 @@ export async function fetchLoans(type: string = "all") {
     params: { type }
   });
 
-  return response.data.map((item: any) => adaptLoanListItem(item));
+  return response.data.results.map((item: any) => adaptLoanListItem(item));
 }
 
 export async function fetchLoanDetails(loanId: string) {
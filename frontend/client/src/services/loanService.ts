@@ -3,12 +3,17 @@ import api from "./api";
 import {
   LoanType,
   type LoanListItem,
+  type LoanListPage,
   type Loan,
   type LoanFilters,
   type LoanStatus,
   type LoanDetailsUnion,
 } from "../types/loan";
-import type { ApiLoanListItem, ApiLoanDetails } from "../types/api-loan";
+import type {
+  ApiLoanListItem,
+  ApiLoanListPage,
+  ApiLoanDetails,
+} from "../types/api-loan";
 
 function mapLoanListItem(apiLoan: ApiLoanListItem): LoanListItem {
   return {
@@ -41,6 +46,13 @@ function mapLoanListItem(apiLoan: ApiLoanListItem): LoanListItem {
   };
 }
 
+function mapLoanListPage(apiPage: ApiLoanListPage): LoanListPage {
+  return {
+    items: apiPage.results.map(mapLoanListItem),
+    next: apiPage.next,
+  };
+}
+
 function mapLoanDetails(apiLoan: ApiLoanDetails): Loan {
   let details: LoanDetailsUnion = {};
 
@@ -89,10 +101,11 @@ function mapLoanDetails(apiLoan: ApiLoanDetails): Loan {
       : null,
 
     details,
+    paymentSchedule: apiLoan.schedule,
   };
 }
 
-async function getActiveLoans(filters: LoanFilters): Promise<LoanListItem[]> {
+async function getActiveLoans(filters: LoanFilters): Promise<LoanListPage> {
   const params: Record<string, string> = {};
 
   if (filters.status && filters.status !== "all") {
@@ -109,16 +122,50 @@ async function getActiveLoans(filters: LoanFilters): Promise<LoanListItem[]> {
     params.search = filters.search;
   }
 
-  const res = await api.get<ApiLoanListItem[]>("/loans/", { params });
-  return res.data.map(mapLoanListItem);
+  // Server-side filters (applied in SQL by /loans/)
+  if (filters.minAmount != null) params.min_amount = String(filters.minAmount);
+  if (filters.maxAmount != null) params.max_amount = String(filters.maxAmount);
+  if (filters.startDateFrom) params.start_date_from = filters.startDateFrom;
+  if (filters.startDateTo) params.start_date_to = filters.startDateTo;
+  if (filters.trusteeId) params.trustee = filters.trusteeId;
+  if (filters.community) params.community = filters.community;
+  if (filters.overdueOnly) params.overdue = "true";
+  if (filters.ordering) params.ordering = filters.ordering;
+
+  const res = await api.get<ApiLoanListPage>("/loans/", { params });
+  return mapLoanListPage(res.data);
 }
 
+/**
+ * Follow the `next` link returned by a previous page of /loans/.
+ */
+async function getNextLoansPage(nextUrl: string): Promise<LoanListPage> {
+  const res = await api.get<ApiLoanListPage>(nextUrl);
+  return mapLoanListPage(res.data);
+}
+
+/**
+ * Loan details with the payment schedule embedded (?include=payments),
+ * so the details panel needs a single request.
+ */
 async function getLoanDetails(id: string): Promise<Loan> {
-  const res = await api.get<ApiLoanDetails>(`/loans/${id}/`);
+  const res = await api.get<ApiLoanDetails>(`/loans/${id}/`, {
+    params: { include: "payments" },
+  });
   return mapLoanDetails(res.data);
 }
 
+/**
+ * Download URL of the full loan portfolio CSV (streamed by the server).
+ */
+function getLoansExportUrl(type?: string): string {
+  const query = type && type !== "all" ? `?type=${encodeURIComponent(type)}` : "";
+  return `${api.defaults.baseURL}/loans/export.csv${query}`;
+}
+
 export default {
   getActiveLoans,
+  getNextLoansPage,
   getLoanDetails,
+  getLoansExportUrl,
 };
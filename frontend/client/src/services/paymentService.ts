@@ -1,7 +1,21 @@
 import api from "./api";
-import type { PaymentScheduleResponse } from "../types/payments";
+import type {
+  PaymentScheduleResponse,
+  PaymentSummary,
+  PaymentSummaryResponse,
+} from "../types/payments";
 
 export async function getLoanPayments(loanId: string): Promise<PaymentScheduleResponse> {
   const res = await api.get(`/loans/${loanId}/payments`);
   return res.data as PaymentScheduleResponse;
 }
+
+/**
+ * Totals only (?summary_only=1) - no payment rows are fetched.
+ */
+export async function getLoanPaymentSummary(loanId: string): Promise<PaymentSummary> {
+  const res = await api.get(`/loans/${loanId}/payments`, {
+    params: { summary_only: 1 },
+  });
+  return (res.data as PaymentSummaryResponse).summary;
+}
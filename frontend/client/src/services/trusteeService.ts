@@ -0,0 +1,30 @@
+import api from "./api";
+
+// Columns used by the trustee pickers (?fields= sparse fieldset)
+const TRUSTEE_PICKER_FIELDS = "trustee_id,community,user_details";
+
+interface PaginatedResponse<T> {
+  count: number;
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
+/**
+ * All trustees, following the paginated /trustees/ list page by page.
+ */
+export async function getAllTrustees(): Promise<any[]> {
+  const trustees: any[] = [];
+
+  let res = await api.get<PaginatedResponse<any>>("/trustees/", {
+    params: { fields: TRUSTEE_PICKER_FIELDS, page_size: 200 },
+  });
+  trustees.push(...res.data.results);
+
+  while (res.data.next) {
+    res = await api.get<PaginatedResponse<any>>(res.data.next);
+    trustees.push(...res.data.results);
+  }
+
+  return trustees;
+}
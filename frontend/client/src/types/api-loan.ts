@@ -1,4 +1,5 @@
 // src/types/api-loan.ts
+import type { PaymentRow, PaymentSummary } from "./payments";
 
 export interface ApiBorrower {
   name: string;
@@ -27,6 +28,11 @@ export interface ApiLoanListItem {
   trustee: ApiTrustee | null;
 }
 
+export interface ApiLoanListPage {
+  results: ApiLoanListItem[];
+  next: string | null;    // URL of the next page (cursor), null on last page
+}
+
 export interface ApiLoanDetails extends ApiLoanListItem {
   created_at: string;          // obj.created_at
   form_file_url: string | null;
@@ -44,4 +50,10 @@ export interface ApiLoanDetails extends ApiLoanListItem {
         charge_day: number;
         stop_date: string | null;
       };
+
+  // Only with ?include=payments
+  schedule?: {
+    summary: PaymentSummary;
+    payments: PaymentRow[];
+  };
 }
@@ -1,3 +1,5 @@
+import type { PaymentRow, PaymentSummary } from "./payments";
+
 export type LoanStatus = "PENDING" | "ACTIVE" | "PAID" | "REJECTED";
 
 export enum LoanType {
@@ -34,6 +36,11 @@ export interface LoanListItem {
   trustee: Trustee | null;
 }
 
+export interface LoanListPage {
+  items: LoanListItem[];
+  next: string | null;
+}
+
 /* -------- DETAILS -------- */
 
 export interface LoanChecksDetails {
@@ -66,10 +73,26 @@ export interface Loan {
   trustee: Trustee | null;
 
   details: LoanDetailsUnion;
+
+  // Payment schedule embedded in the details response (?include=payments)
+  paymentSchedule?: {
+    summary: PaymentSummary;
+    payments: PaymentRow[];
+  };
 }
 
+export type LoanOrdering = "start_date" | "-start_date" | "amount" | "-amount";
+
 export interface LoanFilters {
   type?: "all" | LoanType;
-  status?: LoanStatus | "all" | string;
+  status?: LoanStatus | "CLOSED" | "all" | string;
   search?: string;
+  minAmount?: number;
+  maxAmount?: number;
+  startDateFrom?: string;
+  startDateTo?: string;
+  trusteeId?: string;
+  community?: string;
+  overdueOnly?: boolean;
+  ordering?: LoanOrdering;
 }
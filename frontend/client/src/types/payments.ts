@@ -1,4 +1,4 @@
-export type PaymentStatus = "PAID" | "PENDING";
+export type PaymentStatus = "PAID" | "PENDING" | "BOUNCED";
 
 export interface PaymentRow {
   payment_id: string;
@@ -21,3 +21,8 @@ export interface PaymentScheduleResponse {
   payments: PaymentRow[];
 }
 
+
+export interface PaymentSummaryResponse {
+  loan_id: string;
+  summary: PaymentSummary;
+}
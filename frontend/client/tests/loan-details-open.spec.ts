@@ -10,7 +10,8 @@ async function ensureLoanExists(request: any) {
   const trusteesRes = await request.get('http://127.0.0.1:8000/api/trustees/');
   expect(trusteesRes.ok()).toBeTruthy();
 
-  const trustees = await trusteesRes.json();
+  // The list is paginated: { count, next, previous, results }
+  const { results: trustees } = await trusteesRes.json();
 
   // The seed data should include at least one trustee
   expect(Array.isArray(trustees) && trustees.length > 0).toBeTruthy();